@@ -0,0 +1,23 @@
+"""
+Бенчмарки property_mapper.
+
+Запуск:
+    python -m benchmarks
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json
+"""
+import importlib
+import pkgutil
+
+from .runner import registry
+
+
+def load_benchmarks():
+    """
+    Импортирует все модули bench_*, регистрируя бенчмарки
+    """
+    for module_info in pkgutil.iter_modules(__path__):
+        if module_info.name.startswith('bench_'):
+            importlib.import_module(f'{__name__}.{module_info.name}')
+
+    return registry
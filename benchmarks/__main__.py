@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from benchmarks import load_benchmarks
+from benchmarks.runner import compare_results, load_results, run_benchmarks, save_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='property_mapper benchmarks')
+    parser.add_argument('-k', '--filter', dest='pattern', help='run only benchmarks containing the substring')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimal duration of one measurement, s')
+    parser.add_argument('--repeat', type=int, default=3, help='number of measurements (best is taken)')
+    parser.add_argument('--no-memory', action='store_true', help='skip allocation measurements')
+    parser.add_argument('--save', metavar='FILE', help='save results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='compare with saved results')
+    parser.add_argument('--list', action='store_true', help='list benchmarks and exit')
+
+    args = parser.parse_args(argv)
+
+    registry = load_benchmarks()
+
+    if args.list:
+        for name in sorted(registry):
+            print(name)
+        return
+
+    baseline = load_results(args.compare) if args.compare else None
+
+    results = run_benchmarks(
+        pattern=args.pattern,
+        min_time=args.min_time,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        output=None if baseline else print,
+    )
+
+    if baseline is not None:
+        compare_results(results, baseline, pattern=args.pattern)
+
+    if args.save:
+        save_results(results, args.save)
+
+
+if __name__ == '__main__':
+    main()
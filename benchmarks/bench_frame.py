@@ -0,0 +1,34 @@
+from property_mapper.frame import MapperFrame
+
+from .payloads import (
+    FlatMapper,
+    flat_payload,
+    make_random,
+)
+from .runner import benchmark
+
+
+def _records(count: int) -> list[dict]:
+    rnd = make_random()
+    return [flat_payload(rnd, key=key) for key in range(count)]
+
+
+@benchmark('frame.mappers_1000')
+def frame_mappers():
+    """
+    Для сравнения: те же записи в виде отдельных мапперов
+    """
+    records = _records(1000)
+    return lambda: [FlatMapper(record) for record in records]
+
+
+@benchmark('frame.from_records_1000')
+def frame_from_records():
+    records = _records(1000)
+    return lambda: MapperFrame.from_records(FlatMapper, records)
+
+
+@benchmark('frame.to_records_1000')
+def frame_to_records():
+    frame = MapperFrame.from_records(FlatMapper, _records(1000))
+    return frame.to_records
@@ -0,0 +1,51 @@
+import gc
+
+from .payloads import (
+    Catalog,
+    Node,
+    catalog_payload,
+    deep_payload,
+    make_random,
+)
+from .runner import benchmark
+
+
+@benchmark('gc.collect_alive_catalog')
+def gc_collect_alive_catalog():
+    """
+    Полная сборка мусора при живом большом дереве
+    """
+    catalog = Catalog(catalog_payload(make_random(), items=5000))
+
+    def run():
+        return catalog, gc.collect()
+
+    return run
+
+
+@benchmark('gc.drop_catalog')
+def gc_drop_catalog():
+    """
+    Создание и удаление дерева с последующей полной сборкой мусора.
+    Деревья без циклических ссылок освобождаются ещё до сборки
+    """
+    payload = catalog_payload(make_random(), items=1000)
+
+    def run():
+        catalog = Catalog(payload)
+        del catalog
+        return gc.collect()
+
+    return run
+
+
+@benchmark('gc.drop_deep')
+def gc_drop_deep():
+    payload = deep_payload(make_random(), depth=50)
+
+    def run():
+        node = Node(payload)
+        del node
+        return gc.collect()
+
+    return run
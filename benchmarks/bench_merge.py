@@ -0,0 +1,66 @@
+from .payloads import (
+    Catalog,
+    FingerprintCatalog,
+    IntMagicMapper,
+    Node,
+    catalog_payload,
+    changed_catalog_payload,
+    deep_payload,
+    magic_payload,
+    make_random,
+)
+from .runner import benchmark
+
+
+@benchmark('merge.list_keyed')
+def merge_list_keyed():
+    rnd = make_random()
+    payload = catalog_payload(rnd, items=100)
+    changed = changed_catalog_payload(rnd, payload, changes=10)
+
+    catalog = Catalog(payload)
+    payloads = (changed, payload)
+    state = {'index': 0}
+
+    def run():
+        state['index'] ^= 1
+        return catalog.merge_data(payloads[state['index']])
+
+    return run
+
+
+@benchmark('merge.catalog_same')
+def merge_catalog_same():
+    payload = catalog_payload(make_random(), items=100)
+    catalog = Catalog(payload)
+
+    return lambda: catalog.merge_data(payload)
+
+
+@benchmark('merge.catalog_same_fingerprint')
+def merge_catalog_same_fingerprint():
+    payload = catalog_payload(make_random(), items=100)
+    catalog = FingerprintCatalog(payload)
+
+    return lambda: catalog.merge_data(payload)
+
+
+@benchmark('merge.deep_same')
+def merge_deep_same():
+    payload = deep_payload(make_random(), depth=20)
+    node = Node(payload)
+
+    return lambda: node.merge_data(payload)
+
+
+@benchmark('merge.magic_growth')
+def merge_magic_growth():
+    rnd = make_random()
+    base = magic_payload(rnd, keys=50)
+    grown = dict(base, **magic_payload(rnd, keys=5, prefix='new'))
+
+    def run():
+        mapper = IntMagicMapper(base)
+        return mapper.apply_data(grown)
+
+    return run
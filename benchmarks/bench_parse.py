@@ -0,0 +1,77 @@
+from .payloads import (
+    Catalog,
+    CompactFlatMapper,
+    FlatMapper,
+    Node,
+    UnionMapper,
+    ValuesMapper,
+    WideMapper,
+    catalog_payload,
+    deep_payload,
+    flat_payload,
+    make_random,
+    union_payload,
+    values_payload,
+    wide_payload,
+)
+from .runner import benchmark
+
+
+@benchmark('parse.flat')
+def parse_flat():
+    payload = flat_payload(make_random())
+    return lambda: FlatMapper(payload)
+
+
+@benchmark('parse.flat_compact')
+def parse_flat_compact():
+    payload = flat_payload(make_random())
+    return lambda: CompactFlatMapper(payload)
+
+
+@benchmark('parse.deep')
+def parse_deep():
+    payload = deep_payload(make_random(), depth=20)
+    return lambda: Node(payload)
+
+
+@benchmark('parse.wide')
+def parse_wide():
+    payload = wide_payload(make_random())
+    return lambda: WideMapper(payload)
+
+
+@benchmark('parse.catalog')
+def parse_catalog():
+    payload = catalog_payload(make_random(), items=100)
+    return lambda: Catalog(payload)
+
+
+@benchmark('parse.values_1000')
+def parse_values():
+    payload = values_payload(make_random(), items=1000)
+    return lambda: ValuesMapper(payload)
+
+
+@benchmark('parse.catalog_trusted')
+def parse_catalog_trusted():
+    payload = catalog_payload(make_random(), items=100)
+    return lambda: Catalog(payload, trusted=True)
+
+
+@benchmark('parse.union_trusted')
+def parse_union_trusted():
+    payload = union_payload(make_random())
+    return lambda: UnionMapper(payload, trusted=True)
+
+
+@benchmark('parse.catalog_rebuild')
+def parse_catalog_rebuild():
+    items = Catalog(catalog_payload(make_random(), items=100)).items
+    return lambda: Catalog({'items': [item.as_dict() for item in items]})
+
+
+@benchmark('parse.catalog_from_values')
+def parse_catalog_from_values():
+    items = Catalog(catalog_payload(make_random(), items=100)).items
+    return lambda: Catalog.from_values({'items': items})
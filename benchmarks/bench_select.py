@@ -0,0 +1,19 @@
+from .payloads import UnionMapper, make_random, union_payload
+from .runner import benchmark
+
+
+@benchmark('select.union')
+def select_union():
+    rnd = make_random()
+    payloads = [union_payload(rnd, items=0) for _ in range(100)]
+
+    def run():
+        return [UnionMapper(payload) for payload in payloads]
+
+    return run
+
+
+@benchmark('select.heterogeneous_list')
+def select_heterogeneous_list():
+    payload = union_payload(make_random(), items=200)
+    return lambda: UnionMapper(payload)
@@ -0,0 +1,99 @@
+import json
+import pickle
+
+from .payloads import (
+    CachedCatalog,
+    Catalog,
+    FlatMapper,
+    Node,
+    WideMapper,
+    catalog_payload,
+    changed_catalog_payload,
+    deep_payload,
+    flat_payload,
+    make_random,
+    wide_payload,
+)
+from .runner import benchmark
+
+
+@benchmark('serialize.flat')
+def serialize_flat():
+    mapper = FlatMapper(flat_payload(make_random()))
+    return mapper.as_dict
+
+
+@benchmark('serialize.deep')
+def serialize_deep():
+    mapper = Node(deep_payload(make_random(), depth=20))
+    return mapper.as_dict
+
+
+@benchmark('serialize.wide')
+def serialize_wide():
+    mapper = WideMapper(wide_payload(make_random()))
+    return mapper.as_dict
+
+
+@benchmark('serialize.catalog_round_trip')
+def serialize_catalog_round_trip():
+    mapper = Catalog(catalog_payload(make_random(), items=100))
+    return lambda: Catalog(mapper.as_dict())
+
+
+@benchmark('serialize.catalog_round_trip_json')
+def serialize_catalog_round_trip_json():
+    mapper = Catalog(catalog_payload(make_random(), items=100))
+    return lambda: Catalog(json.loads(json.dumps(mapper.as_dict())))
+
+
+@benchmark('serialize.catalog_round_trip_bytes')
+def serialize_catalog_round_trip_bytes():
+    mapper = Catalog(catalog_payload(make_random(), items=100))
+    return lambda: Catalog.from_bytes(mapper.to_bytes())
+
+
+@benchmark('serialize.catalog_round_trip_pickle')
+def serialize_catalog_round_trip_pickle():
+    mapper = Catalog(catalog_payload(make_random(), items=100))
+    return lambda: pickle.loads(pickle.dumps(mapper))
+
+
+@benchmark('serialize.catalog_to_bytes')
+def serialize_catalog_to_bytes():
+    mapper = Catalog(catalog_payload(make_random(), items=100))
+    return mapper.to_bytes
+
+
+@benchmark('serialize.catalog_from_bytes')
+def serialize_catalog_from_bytes():
+    buf = Catalog(catalog_payload(make_random(), items=100)).to_bytes()
+    return lambda: Catalog.from_bytes(buf)
+
+
+def _merge_and_serialize(cls):
+    rnd = make_random()
+    payload = catalog_payload(rnd, items=100)
+    changed = changed_catalog_payload(rnd, payload, changes=1)
+    changed['items'].sort(key=lambda item: item['id'])
+
+    catalog = cls(payload)
+    payloads = (changed, payload)
+    state = {'index': 0}
+
+    def run():
+        state['index'] ^= 1
+        catalog.merge_data(payloads[state['index']])
+        return catalog.as_dict()
+
+    return run
+
+
+@benchmark('serialize.catalog_after_merge')
+def serialize_catalog_after_merge():
+    return _merge_and_serialize(Catalog)
+
+
+@benchmark('serialize.catalog_after_merge_cached')
+def serialize_catalog_after_merge_cached():
+    return _merge_and_serialize(CachedCatalog)
@@ -0,0 +1,238 @@
+"""
+Схемы и генераторы синтетических данных для бенчмарков
+"""
+import random
+import uuid
+
+from datetime import datetime, timedelta, timezone
+
+from property_mapper import MagicMapper, MapperInterface, PropertyMapper
+from property_mapper.types import Any, Datetime, Float, Int, Str, Timestamp, UUID
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_random(seed: int = 0) -> random.Random:
+    return random.Random(seed)
+
+
+# Плоская схема
+
+class FlatInterface(MapperInterface):
+    id: Int
+    name: Str
+    price: Float
+    active: bool
+    created: Timestamp
+    updated: Datetime
+    uid: UUID
+    extra: Any
+
+
+class FlatMapper(PropertyMapper, FlatInterface):
+    pm_key_field = 'id'
+
+
+class CompactFlatMapper(FlatMapper):
+    pm_raw_scalars = True
+    pm_compact_datetimes = True
+
+
+def flat_payload(rnd: random.Random, key: int = 0) -> dict:
+    return {
+        'id': key,
+        'name': f'name-{rnd.randint(0, 10 ** 6)}',
+        'price': rnd.random() * 1000,
+        'active': rnd.random() > 0.5,
+        'created': (BASE_TIME + timedelta(seconds=rnd.randint(0, 10 ** 7))).timestamp(),
+        'updated': (BASE_TIME + timedelta(seconds=rnd.randint(0, 10 ** 7))).isoformat(),
+        'uid': str(uuid.UUID(int=rnd.getrandbits(128))),
+        'extra': {'tag': rnd.choice(['a', 'b', 'c'])},
+    }
+
+
+# Глубокая вложенность (аналог TopMapper из тестов)
+
+class NodeInterface(MapperInterface):
+    value: Int
+    label: Str
+    child: 'Node'
+
+
+class Node(PropertyMapper, NodeInterface):
+    pass
+
+
+def deep_payload(rnd: random.Random, depth: int = 20) -> dict:
+    payload = None
+    for level in range(depth):
+        payload = {
+            'value': rnd.randint(0, 1000),
+            'label': f'level-{level}',
+            'child': payload,
+        }
+
+    return payload
+
+
+# Широкая схема
+
+WIDE_FIELDS = 200
+
+WideInterface = type(
+    'WideInterface',
+    (MapperInterface,),
+    {'__annotations__': {f'field_{i}': (Int, Str, Float)[i % 3] for i in range(WIDE_FIELDS)}},
+)
+
+WideMapper = type('WideMapper', (PropertyMapper, WideInterface), {})
+
+
+def wide_payload(rnd: random.Random) -> dict:
+    payload = {}
+    for i in range(WIDE_FIELDS):
+        kind = i % 3
+        if kind == 0:
+            payload[f'field_{i}'] = rnd.randint(0, 10 ** 6)
+        elif kind == 1:
+            payload[f'field_{i}'] = f'value-{rnd.randint(0, 10 ** 6)}'
+        else:
+            payload[f'field_{i}'] = rnd.random()
+
+    return payload
+
+
+# Выбор типа из Union и разнородные списки
+
+class CircleInterface(MapperInterface):
+    kind: Str
+    radius: Float
+
+
+class Circle(PropertyMapper, CircleInterface):
+    pm_identify_path = 'kind:circle'
+
+
+class RectInterface(MapperInterface):
+    kind: Str
+    width: Float
+    height: Float
+
+
+class Rect(PropertyMapper, RectInterface):
+    pm_identify_path = 'kind:rect'
+
+
+class UnionInterface(MapperInterface):
+    value: Int | Float | UUID | Str
+    shape: Circle | Rect
+    items: list[Int | Str | Circle | Rect]
+
+
+class UnionMapper(PropertyMapper, UnionInterface):
+    pass
+
+
+def shape_payload(rnd: random.Random) -> dict:
+    if rnd.random() > 0.5:
+        return {'kind': 'circle', 'radius': rnd.random()}
+
+    return {'kind': 'rect', 'width': rnd.random(), 'height': rnd.random()}
+
+
+def union_payload(rnd: random.Random, items: int = 50) -> dict:
+    values = [
+        rnd.randint(0, 100),
+        rnd.random(),
+        str(uuid.UUID(int=rnd.getrandbits(128))),
+        f'text-{rnd.randint(0, 100)}',
+    ]
+
+    list_items = []
+    for _ in range(items):
+        kind = rnd.randint(0, 2)
+        if kind == 0:
+            list_items.append(rnd.randint(0, 100))
+        elif kind == 1:
+            list_items.append(f'item-{rnd.randint(0, 100)}')
+        else:
+            list_items.append(shape_payload(rnd))
+
+    return {
+        'value': rnd.choice(values),
+        'shape': shape_payload(rnd),
+        'items': list_items,
+    }
+
+
+# Списки объектов с ключевым полем
+
+class CatalogInterface(MapperInterface):
+    items: list[FlatMapper]
+
+
+class Catalog(PropertyMapper, CatalogInterface):
+    pass
+
+
+class CachedFlatMapper(FlatMapper):
+    pm_cache_dict = True
+
+
+class CachedCatalogInterface(MapperInterface):
+    items: list[CachedFlatMapper]
+
+
+class CachedCatalog(PropertyMapper, CachedCatalogInterface):
+    pm_cache_dict = True
+
+
+class FingerprintCatalog(Catalog):
+    pm_fingerprint = True
+
+
+def catalog_payload(rnd: random.Random, items: int = 100) -> dict:
+    return {
+        'items': [flat_payload(rnd, key=key) for key in range(items)],
+    }
+
+
+def changed_catalog_payload(rnd: random.Random, payload: dict, changes: int = 10) -> dict:
+    """
+    Копия каталога с перемешанными элементами и несколькими изменёнными ценами
+    """
+    items = [dict(item) for item in payload['items']]
+    rnd.shuffle(items)
+
+    for item in rnd.sample(items, min(changes, len(items))):
+        item['price'] = rnd.random() * 1000
+
+    return {'items': items}
+
+
+# Списки значений одного типа
+
+class ValuesInterface(MapperInterface):
+    numbers: list[Int]
+    uids: list[UUID]
+
+
+class ValuesMapper(PropertyMapper, ValuesInterface):
+    pass
+
+
+def values_payload(rnd: random.Random, items: int = 1000) -> dict:
+    return {
+        'numbers': [rnd.randint(0, 10 ** 6) for _ in range(items)],
+        'uids': [str(uuid.UUID(int=rnd.getrandbits(128))) for _ in range(items)],
+    }
+
+
+# Динамические атрибуты
+
+class IntMagicMapper(MagicMapper):
+    pm_magic_type = Int
+
+
+def magic_payload(rnd: random.Random, keys: int = 50, prefix: str = 'key') -> dict:
+    return {f'{prefix}_{i}': rnd.randint(0, 1000) for i in range(keys)}
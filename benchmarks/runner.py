@@ -0,0 +1,199 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+from typing import Callable, Optional
+
+__all__ = [
+    'Benchmark',
+    'benchmark',
+    'compare_results',
+    'load_results',
+    'registry',
+    'run_benchmarks',
+    'save_results',
+]
+
+registry: dict[str, 'Benchmark'] = {}
+
+
+class Benchmark:
+    """
+    Описание одного бенчмарка.
+
+    setup вызывается один раз и возвращает функцию без аргументов,
+    выполняющую одну операцию (например, создание одного маппера).
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Callable], group: str = None):
+        self.name = name
+        self.setup = setup
+        self.group = group or name.split('.', 1)[0]
+
+    def measure_time(self, min_time: float, repeat: int) -> float:
+        """
+        Возвращает лучшее время одной операции в секундах
+        """
+        func = self.setup()
+
+        # Подбираем число повторов, чтобы замер длился не меньше min_time
+        loops = 1
+        while True:
+            elapsed = self._timeit(func, loops)
+            if elapsed >= min_time / 10 or loops >= 10 ** 7:
+                break
+            loops *= 10
+
+        loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+
+        best = min(self._timeit(func, loops) for _ in range(repeat))
+
+        return best / loops
+
+    def measure_memory(self) -> tuple[int, int]:
+        """
+        Возвращает (пиковое выделение памяти за операцию, размер удерживаемого результата) в байтах
+        """
+        func = self.setup()
+
+        # Прогрев: кэши классов, интернированные строки и т.п.
+        func()
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            result = func()
+
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del result
+
+        return peak - before, current - before
+
+    @staticmethod
+    def _timeit(func: Callable, loops: int) -> float:
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            return time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+
+def benchmark(name: str, group: str = None):
+    """
+    Регистрирует функцию подготовки бенчмарка
+    """
+
+    def decorator(setup: Callable[[], Callable]) -> Callable[[], Callable]:
+        if name in registry:
+            raise KeyError(f'Benchmark "{name}" already registered!')
+
+        registry[name] = Benchmark(name=name, setup=setup, group=group)
+        return setup
+
+    return decorator
+
+
+def run_benchmarks(pattern: str = None,
+                   min_time: float = 0.2,
+                   repeat: int = 3,
+                   memory: bool = True,
+                   output: Optional[Callable[[str], None]] = print) -> dict:
+    """
+    Запускает зарегистрированные бенчмарки
+
+    :param pattern: запускать только бенчмарки, имя которых содержит подстроку
+    :param min_time: минимальная длительность одного замера, с
+    :param repeat: количество замеров (берётся лучший)
+    :param memory: измерять выделение памяти
+    :param output: функция вывода прогресса
+    :return: словарь результатов
+    """
+    from property_mapper import __version__
+
+    results = {}
+
+    for name, bench in sorted(registry.items()):
+        if pattern and pattern not in name:
+            continue
+
+        op_time = bench.measure_time(min_time=min_time, repeat=repeat)
+        result = {
+            'ops': 1 / op_time,
+            'time': op_time,
+        }
+
+        if memory:
+            result['alloc'], result['retained'] = bench.measure_memory()
+
+        results[name] = result
+
+        if output is not None:
+            output(format_result(name, result))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'property_mapper': __version__,
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+
+def format_result(name: str, result: dict, baseline: dict = None) -> str:
+    line = f'{name:<40} {result["ops"]:>14,.1f} ops/s {result["time"] * 1e6:>12.2f} us'
+
+    if 'alloc' in result:
+        line += f' {result["alloc"]:>12,} B alloc {result["retained"]:>12,} B retained'
+
+    if baseline is not None:
+        line += f' {(result["ops"] / baseline["ops"] - 1) * 100:>+8.1f}% ops'
+
+        if 'retained' in result and baseline.get('retained'):
+            line += f' {(result["retained"] / baseline["retained"] - 1) * 100:>+8.1f}% mem'
+
+    return line
+
+
+def save_results(results: dict, path: str):
+    with open(path, 'w') as wf:
+        json.dump(results, wf, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as rf:
+        return json.load(rf)
+
+
+def compare_results(results: dict,
+                    baseline: dict,
+                    pattern: str = None,
+                    output: Callable[[str], None] = print):
+    """
+    Выводит результаты в сравнении с сохранённым базовым прогоном
+    """
+    base_results = baseline.get('results', {})
+
+    for name, result in sorted(results['results'].items()):
+        output(format_result(name, result, base_results.get(name)))
+
+    missing = set(base_results) - set(results['results'])
+    for name in sorted(missing):
+        if pattern and pattern not in name:
+            continue
+
+        output(f'{name:<40} missing in current run')
@@ -0,0 +1,583 @@
+"""
+Двоичный формат дерева мапперов.
+
+    buf = mapper.to_bytes()
+    mapper = Mapper.from_bytes(buf)
+
+Формат описывается схемой класса, имена полей в него не записываются:
+
+    b'PM' версия_формата:u8 значение_маппера
+
+Каждое значение начинается с байта-тега:
+
+    NONE, FALSE, TRUE
+    INT       <q
+    BIGINT    длина:uvarint байты (целое со знаком, не помещающееся в 8 байт)
+    FLOAT     <d
+    STR       длина:uvarint utf-8
+    BYTES     длина:uvarint байты
+    LIST      количество:uvarint значения
+    DICT      количество:uvarint (ключ значение)...
+    MAPPER    длина:<I версия_схемы:uvarint
+              количество:uvarint (позиция_поля:uvarint значение)...
+              количество:uvarint (имя значение)...  - динамические поля
+              количество:uvarint (имя значение)...  - unknown_params
+    DATETIME  микросекунды:<q (время без таймзоны от 1970-01-01)
+              0 | 1 смещение_в_секундах:<i
+    UUID      16 байт
+
+Поле маппера обозначается позицией в _attrs_dict, поля со значением None
+не записываются. Значения полей встроенных типов записываются в форме
+reverse() (Datetime с фиксированным смещением и UUID - компактно)
+и восстанавливаются через from_trusted. Вложенные мапперы, списки
+и словари мапперов и встроенных типов записываются по схеме,
+остальные поля (объединения, мапперы с pm_read_only и pm_identity_map)
+- в форме as_dict() и разбираются при чтении как обычно.
+
+Изменение схемы отмечается версией pm_schema_version класса, а прежний
+порядок полей - в pm_schema_history: {версия: (имя поля, ...)}.
+Поля, которых больше нет в схеме, при чтении отбрасываются.
+
+Динамические поля (add_properties) записываются по имени в форме
+reverse() и при чтении добавляются MagicMapper как обычно,
+у остальных мапперов попадают в unknown_params.
+"""
+import inspect
+import struct
+import weakref
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from dateutil.tz import tzoffset, tzutc
+
+from .exceptions import PropertyMapperException
+from .mapper_base import PropertyMapperBase
+from .mapper_type import PropertyMapperType
+from .types.arrays import from_microseconds, wall_microseconds
+from .utils import get_types, is_dict, is_list
+
+__all__ = [
+    'FORMAT_VERSION',
+    'from_bytes',
+    'to_bytes',
+]
+
+FORMAT_VERSION = 1
+
+_MAGIC = b'PM'
+
+(
+    _NONE,
+    _FALSE,
+    _TRUE,
+    _INT,
+    _BIGINT,
+    _FLOAT,
+    _STR,
+    _BYTES,
+    _LIST,
+    _DICT,
+    _MAPPER,
+    _DATETIME,
+    _UUID,
+) = range(13)
+
+_int = struct.Struct('<q')
+_float = struct.Struct('<d')
+_length = struct.Struct('<I')
+_offset = struct.Struct('<i')
+
+_int_min = -2 ** 63
+_int_max = 2 ** 63 - 1
+
+# Таймзоны с фиксированным смещением, которые можно записать числом
+_fixed_timezones = (timezone, tzutc, tzoffset)
+
+# Способы записи полей
+_K_PARSE = 0  # в форме as_dict(), при чтении разбирается как обычно
+_K_TYPE = 1  # встроенный тип
+_K_MAPPER = 2  # вложенный маппер
+_K_LIST = 3
+_K_DICT = 4
+
+_generic = (_K_PARSE, None)
+
+
+def _accepts(value_type: type, data_type: type) -> bool:
+    allow_types = value_type.allow_types
+    return bool(allow_types) and issubclass(data_type, allow_types)
+
+
+def _field_kind(field_type: Any) -> tuple:
+    if inspect.isclass(field_type):
+        if issubclass(field_type, PropertyMapperType):
+            return _K_TYPE, (field_type, _accepts(field_type, datetime), _accepts(field_type, UUID))
+
+        if issubclass(field_type, PropertyMapperBase):
+            if not field_type.pm_read_only and not field_type.pm_identity_map:
+                return _K_MAPPER, field_type
+
+    elif is_list(field_type):
+        item_kind = _field_kind(get_types(field_type)[0])
+        if item_kind[0] != _K_PARSE:
+            return _K_LIST, item_kind
+
+    elif is_dict(field_type):
+        value_kind = _field_kind(get_types(field_type)[1])
+        if value_kind[0] != _K_PARSE:
+            return _K_DICT, value_kind
+
+    return _generic
+
+
+class _Plan:
+    """
+    Поля класса в порядке _attrs_dict с готовыми способами записи
+    """
+    __slots__ = ('fields', 'extras', 'history', '__weakref__')
+
+    def __init__(self, mapper_class: type[PropertyMapperBase]):
+        static_class = mapper_class._pm_dynamic_base or mapper_class
+
+        self.fields = [
+            (prop_name, _field_kind(prop_type))
+            for prop_name, prop_type in static_class._attrs_dict.items()
+        ]
+        self.extras = [
+            prop_name
+            for prop_name in mapper_class._attrs_dict.keys()
+            if prop_name not in static_class._attrs_dict
+        ]
+        self.history = {}
+
+    def version_fields(self, mapper_class: type[PropertyMapperBase], version: int) -> list:
+        if version == mapper_class.pm_schema_version:
+            return self.fields
+
+        fields = self.history.get(version)
+        if fields is None:
+            names = mapper_class.pm_schema_history.get(version)
+            if names is None:
+                raise ValueError(f'{mapper_class} Unknown schema version {version}')
+
+            kinds = dict(self.fields)
+            fields = self.history[version] = [(prop_name, kinds.get(prop_name)) for prop_name in names]
+
+        return fields
+
+
+_plans = weakref.WeakKeyDictionary()
+
+
+def _get_plan(mapper_class: type[PropertyMapperBase]) -> _Plan:
+    plan = _plans.get(mapper_class)
+    if plan is None:
+        plan = _plans[mapper_class] = _Plan(mapper_class)
+
+    return plan
+
+
+class _Writer:
+
+    def __init__(self):
+        self.out = bytearray()
+
+    def write_uvarint(self, value: int):
+        out = self.out
+        while value > 0x7f:
+            out.append(value & 0x7f | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def write_str(self, value: str):
+        data = value.encode()
+        self.write_uvarint(len(data))
+        self.out += data
+
+    def write_generic(self, value: Any):
+        """
+        Значение в форме as_dict()
+        """
+        out = self.out
+
+        if isinstance(value, PropertyMapperType):
+            value = value.reverse()
+        elif isinstance(value, PropertyMapperBase):
+            value = value.as_dict()
+
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            out.append(_STR)
+            self.write_str(value)
+        elif isinstance(value, int):
+            if _int_min <= value <= _int_max:
+                out.append(_INT)
+                out += _int.pack(value)
+            else:
+                data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+                out.append(_BIGINT)
+                self.write_uvarint(len(data))
+                out += data
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _float.pack(value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            self.write_uvarint(len(value))
+            for item in value:
+                self.write_generic(item)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self.write_uvarint(len(value))
+            for key, item in value.items():
+                self.write_generic(key)
+                self.write_generic(item)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            out.append(_BYTES)
+            self.write_uvarint(len(value))
+            out += value
+        else:
+            raise TypeError(f'Can not write value of type {type(value)}: {value!r}')
+
+    def write_value(self, kind: tuple, value: Any):
+        kind_type, arg = kind
+        out = self.out
+
+        if value is None:
+            out.append(_NONE)
+
+        elif kind_type == _K_MAPPER and isinstance(value, PropertyMapperBase):
+            self.write_mapper(value)
+
+        elif kind_type == _K_TYPE:
+            _, datetime_allowed, uuid_allowed = arg
+
+            if datetime_allowed and isinstance(value, datetime) and self.write_datetime(value):
+                return
+
+            if uuid_allowed and isinstance(value, UUID):
+                out.append(_UUID)
+                out += value.bytes
+                return
+
+            self.write_generic(value)
+
+        elif kind_type == _K_LIST and isinstance(value, list):
+            out.append(_LIST)
+            self.write_uvarint(len(value))
+            for item in value:
+                self.write_value(arg, item)
+
+        elif kind_type == _K_DICT and isinstance(value, dict):
+            out.append(_DICT)
+            self.write_uvarint(len(value))
+            for key, item in value.items():
+                self.write_generic(key)
+                self.write_value(arg, item)
+
+        else:
+            self.write_generic(value)
+
+    def write_datetime(self, value: datetime) -> bool:
+        """
+        Записывает дату без таймзоны или с фиксированным смещением.
+        Возвращает False, если таймзону нельзя записать смещением
+        """
+        tzinfo = value.tzinfo
+        offset = None
+
+        if tzinfo is not None:
+            if not isinstance(tzinfo, _fixed_timezones):
+                return False
+
+            delta = value.utcoffset()
+            if delta.microseconds:
+                return False
+
+            offset = delta.days * 86400 + delta.seconds
+
+        out = self.out
+        out.append(_DATETIME)
+        out += _int.pack(wall_microseconds(value))
+
+        if offset is None:
+            out.append(0)
+        else:
+            out.append(1)
+            out += _offset.pack(offset)
+
+        return True
+
+    def write_mapper(self, mapper: PropertyMapperBase):
+        out = self.out
+        plan = _get_plan(mapper.__class__)
+
+        out.append(_MAPPER)
+        start = len(out)
+        out += b'\0\0\0\0'
+
+        self.write_uvarint(mapper.pm_schema_version)
+
+        fields = []
+        for index, (prop_name, kind) in enumerate(plan.fields):
+            value = mapper._stored_value(prop_name)
+            if value is not None:
+                fields.append((index, kind, value))
+
+        self.write_uvarint(len(fields))
+        for index, kind, value in fields:
+            self.write_uvarint(index)
+            self.write_value(kind, value)
+
+        self.write_uvarint(len(plan.extras))
+        for prop_name in plan.extras:
+            self.write_str(prop_name)
+            self.write_generic(mapper._stored_value(prop_name))
+
+        unknown_params = mapper.unknown_params
+        self.write_uvarint(len(unknown_params))
+        for key, value in unknown_params.items():
+            self.write_str(key)
+            self.write_generic(value)
+
+        _length.pack_into(out, start, len(out) - start - _length.size)
+
+
+class _Reader:
+
+    def __init__(self, buf: memoryview):
+        self.buf = buf
+        self.pos = 0
+
+    def read_uvarint(self) -> int:
+        buf = self.buf
+        pos = self.pos
+
+        result = buf[pos]
+        pos += 1
+        if result > 0x7f:
+            result &= 0x7f
+            shift = 7
+            while True:
+                byte = buf[pos]
+                pos += 1
+                result |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+
+        self.pos = pos
+        return result
+
+    def read_bytes(self, size: int) -> memoryview:
+        pos = self.pos
+        end = pos + size
+        if end > len(self.buf):
+            raise ValueError(f'Unexpected end of data at position {pos}')
+
+        self.pos = end
+        return self.buf[pos:end]
+
+    def read_str(self) -> str:
+        return str(self.read_bytes(self.read_uvarint()), 'utf-8')
+
+    def read_value(self, kind: tuple, parent: Optional[PropertyMapperBase], prop_name: Optional[str]) -> Any:
+        """
+        Читает значение. Для полей, записанных по схеме, возвращает
+        значения в типах полей, для остальных - в форме as_dict()
+        """
+        buf = self.buf
+        tag = buf[self.pos]
+        self.pos += 1
+
+        kind_type, arg = kind
+
+        if tag == _NONE:
+            return None
+
+        if tag == _MAPPER:
+            if kind_type == _K_MAPPER:
+                return self.read_mapper(arg, parent, prop_name)
+
+            # Маппер больше не соответствует схеме поля
+            size, = _length.unpack_from(buf, self.pos)
+            self.pos += _length.size + size
+            return None
+
+        if tag == _LIST:
+            item_kind = arg if kind_type == _K_LIST else _generic
+            return [self.read_value(item_kind, parent, prop_name) for _ in range(self.read_uvarint())]
+
+        if tag == _DICT:
+            value_kind = arg if kind_type == _K_DICT else _generic
+            result = {}
+            for _ in range(self.read_uvarint()):
+                key = self.read_value(_generic, None, None)
+                result[key] = self.read_value(value_kind, parent, prop_name)
+
+            return result
+
+        if tag == _STR:
+            value = self.read_str()
+        elif tag == _INT:
+            value, = _int.unpack_from(buf, self.pos)
+            self.pos += _int.size
+        elif tag == _FLOAT:
+            value, = _float.unpack_from(buf, self.pos)
+            self.pos += _float.size
+        elif tag == _TRUE:
+            value = True
+        elif tag == _FALSE:
+            value = False
+        elif tag == _DATETIME:
+            value = self.read_datetime()
+        elif tag == _UUID:
+            value = UUID(bytes=bytes(self.read_bytes(16)))
+        elif tag == _BIGINT:
+            value = int.from_bytes(self.read_bytes(self.read_uvarint()), 'little', signed=True)
+        elif tag == _BYTES:
+            value = bytes(self.read_bytes(self.read_uvarint()))
+        else:
+            raise ValueError(f'Unknown value tag {tag} at position {self.pos - 1}')
+
+        if kind_type == _K_TYPE:
+            return arg[0].from_trusted(value)
+
+        return value
+
+    def read_datetime(self) -> datetime:
+        buf = self.buf
+
+        microseconds, = _int.unpack_from(buf, self.pos)
+        self.pos += _int.size
+
+        tzinfo = None
+
+        has_offset = buf[self.pos]
+        self.pos += 1
+
+        if has_offset:
+            offset, = _offset.unpack_from(buf, self.pos)
+            self.pos += _offset.size
+
+            tzinfo = timezone.utc if not offset else timezone(timedelta(seconds=offset))
+
+        return from_microseconds(datetime, microseconds, tzinfo=tzinfo)
+
+    def read_mapper(self,
+                    mapper_class: type[PropertyMapperBase],
+                    parent: Optional[PropertyMapperBase],
+                    attr_name: Optional[str]) -> PropertyMapperBase:
+        size, = _length.unpack_from(self.buf, self.pos)
+        self.pos += _length.size
+        end = self.pos + size
+        if end > len(self.buf):
+            raise ValueError(f'Unexpected end of data: mapper at position {self.pos} needs {size} bytes')
+
+        mapper_class = mapper_class._pm_dynamic_base or mapper_class
+        fields = _get_plan(mapper_class).version_fields(mapper_class, self.read_uvarint())
+
+        mapper = mapper_class._create_empty(parent=parent, attr_name=attr_name)
+
+        for _ in range(self.read_uvarint()):
+            index = self.read_uvarint()
+
+            if index < len(fields):
+                prop_name, kind = fields[index]
+            else:
+                prop_name = kind = None
+
+            if kind is None:
+                # Поля больше нет в схеме
+                self.read_value(_generic, None, None)
+                continue
+
+            value = self.read_value(kind, mapper, prop_name)
+
+            if kind[0] == _K_PARSE:
+                mapper._parse_property(prop_name=prop_name, prop_value=value)
+            else:
+                mapper._set_value(prop_name, value)
+
+        extras = {}
+        for _ in range(self.read_uvarint()):
+            prop_name = self.read_str()
+            extras[prop_name] = self.read_value(_generic, None, None)
+
+        for _ in range(self.read_uvarint()):
+            key = self.read_str()
+            mapper.unknown_params[key] = self.read_value(_generic, None, None)
+
+        if extras:
+            magic_type = getattr(mapper_class, 'pm_magic_type', None)
+            if magic_type is not None:
+                mapper.add_properties(
+                    prop_data={prop_name: (magic_type, value) for prop_name, value in extras.items()},
+                    initial=True,
+                )
+            else:
+                mapper.unknown_params.update(extras)
+
+        # Записи более новых версий формата могут содержать дополнительные данные
+        self.pos = end
+
+        if mapper_class.pm_read_only:
+            mapper = mapper._share()
+
+        return mapper
+
+
+def to_bytes(mapper: PropertyMapperBase) -> bytes:
+    """
+    Записывает дерево с корнем mapper в двоичном формате
+    """
+    writer = _Writer()
+    writer.out += _MAGIC
+    writer.out.append(FORMAT_VERSION)
+    writer.write_mapper(mapper)
+
+    return bytes(writer.out)
+
+
+def from_bytes(mapper_class: type[PropertyMapperBase], buf: bytes | bytearray | memoryview) -> PropertyMapperBase:
+    """
+    Восстанавливает объект mapper_class из результата to_bytes().
+    Данные читаются из буфера напрямую, без промежуточных копий.
+    Для повреждённых, обрезанных и чужих данных вызывает ValueError
+
+    :param mapper_class:
+    :param buf:
+    :return:
+    """
+    try:
+        return _read(mapper_class, memoryview(buf))
+    except ValueError:
+        raise
+    except (struct.error, IndexError, OverflowError, OSError, TypeError, PropertyMapperException) as e:
+        # Значение не разобралось или данные обрезаны: поля прочитаны не там
+        raise ValueError(f'Malformed binary data: {e}') from e
+
+
+def _read(mapper_class: type[PropertyMapperBase], buf: memoryview) -> PropertyMapperBase:
+    if buf[:len(_MAGIC)] != _MAGIC:
+        raise ValueError('Data is not in property_mapper binary format')
+
+    version = buf[len(_MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported binary format version {version}')
+
+    reader = _Reader(buf)
+    reader.pos = len(_MAGIC) + 1
+
+    if buf[reader.pos] != _MAPPER:
+        raise ValueError('Data does not contain a mapper')
+    reader.pos += 1
+
+    return reader.read_mapper(mapper_class, None, None)
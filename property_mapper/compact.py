@@ -0,0 +1,199 @@
+"""
+Компактное хранение значений полей.
+
+Поля Datetime и Timestamp (pm_compact_datetimes).
+
+Вместо объекта даты в объекте маппера хранится одно целое число:
+микросекунды от 1970-01-01 по часам таймзоны значения и номер
+этой таймзоны среди уже встречавшихся. Объект даты создаётся
+при каждом обращении к свойству.
+
+Поля Int, Float и Str (pm_raw_scalars) хранятся встроенными
+int, float и str. Для слияния значение временно оборачивается
+в исходный тип, поэтому изменения отслеживаются как обычно.
+"""
+import functools
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from dateutil.tz import tzoffset, tzutc
+
+from .types import Datetime, Float, Int, Str, Timestamp
+from .types.arrays import from_microseconds, wall_microseconds
+
+__all__ = [
+    'compact_field_type',
+    'decode_datetime',
+    'dump_datetime',
+    'encode_datetime',
+    'install_field_codecs',
+    'load_datetime',
+    'make_compact_property',
+    'raw_field_type',
+]
+
+_raw_types = {
+    Int: int,
+    Float: float,
+    Str: str,
+}
+
+# Уже встречавшиеся таймзоны. Значение хранится одним числом:
+# микросекунды * _tz_slots + номер таймзоны в этом списке.
+# Таймзоны dateutil не хешируются, поэтому список
+_tzinfos: list = [timezone.utc, None]
+_tz_slots = 256
+
+# Таймзоны с фиксированным смещением, которые сериализуются числом
+_fixed_timezones = (timezone, tzutc, tzoffset)
+
+
+def _tzinfo_index(tzinfo) -> Optional[int]:
+    for index, known in enumerate(_tzinfos):
+        if known is tzinfo or known == tzinfo:
+            return index
+
+    if len(_tzinfos) >= _tz_slots:
+        return None
+
+    _tzinfos.append(tzinfo)
+    return len(_tzinfos) - 1
+
+
+def compact_field_type(prop_type: Any) -> Optional[type]:
+    """
+    Тип поля, если его можно хранить компактно
+    """
+    if isinstance(prop_type, type) and issubclass(prop_type, (Timestamp, Datetime)):
+        return prop_type
+
+    return None
+
+
+def raw_field_type(prop_type: Any) -> Optional[type]:
+    """
+    Встроенный тип для хранения поля, если поле скалярное
+    """
+    return _raw_types.get(prop_type)
+
+
+def encode_datetime(value: Optional[datetime]) -> Any:
+    """
+    Дата -> int (или (int, tzinfo), если таймзон слишком много)
+    """
+    if value is None:
+        return None
+
+    microseconds = wall_microseconds(value)
+
+    index = _tzinfo_index(value.tzinfo)
+    if index is None:
+        return microseconds, value.tzinfo
+
+    return microseconds * _tz_slots + index
+
+
+def decode_datetime(value_type: type, value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+
+    if type(value) is int:
+        microseconds, index = divmod(value, _tz_slots)
+        tzinfo = _tzinfos[index]
+    else:
+        microseconds, tzinfo = value
+
+    return from_microseconds(value_type, microseconds, tzinfo=tzinfo)
+
+
+def dump_datetime(value: Any) -> Any:
+    """
+    Хранимое значение -> вид, не зависящий от процесса (для pickle):
+    микросекунды, (микросекунды, смещение в секундах)
+    или (микросекунды, tzinfo) для таймзон без фиксированного смещения
+    """
+    if type(value) is int:
+        microseconds, index = divmod(value, _tz_slots)
+        tzinfo = _tzinfos[index]
+    else:
+        microseconds, tzinfo = value
+
+    if tzinfo is None:
+        return microseconds
+
+    if isinstance(tzinfo, _fixed_timezones):
+        delta = tzinfo.utcoffset(None)
+        if not delta.microseconds:
+            return microseconds, delta.days * 86400 + delta.seconds
+
+    return microseconds, tzinfo
+
+
+def load_datetime(value: Any) -> Any:
+    """
+    Результат dump_datetime -> хранимое значение
+    """
+    if type(value) is int:
+        microseconds, tzinfo = value, None
+    else:
+        microseconds, tzinfo = value
+        if type(tzinfo) is int:
+            tzinfo = _offset_timezone(tzinfo)
+
+    index = _tzinfo_index(tzinfo)
+    if index is None:
+        return microseconds, tzinfo
+
+    return microseconds * _tz_slots + index
+
+
+@functools.lru_cache(maxsize=None)
+def _offset_timezone(offset: int) -> timezone:
+    return timezone.utc if not offset else timezone(timedelta(seconds=offset))
+
+
+def make_compact_property(key: str, value_type: type):
+    key = f'_{key}'
+
+    def get_property(self):
+        return decode_datetime(value_type, getattr(self, key, None))
+
+    return get_property
+
+
+def install_field_codecs(mapper_class: type):
+    """
+    Заполняет _pm_field_codecs класса маппера по его _attrs_dict
+    (и заменяет свойства компактных полей).
+    Вызывается для новых классов, в том числе динамических (add_properties)
+    """
+    compact_datetimes = getattr(mapper_class, 'pm_compact_datetimes', False)
+    raw_scalars = getattr(mapper_class, 'pm_raw_scalars', False)
+
+    if not compact_datetimes and not raw_scalars:
+        return
+
+    codecs = {}
+
+    for attr_name, attr_type in mapper_class._attrs_dict.items():
+        # Поля с собственной функцией вычисления получают значение как есть
+        if hasattr(mapper_class, f'_get_{attr_name}'):
+            continue
+
+        if compact_datetimes and (value_type := compact_field_type(attr_type)) is not None:
+            codecs[attr_name] = (
+                encode_datetime,
+                functools.partial(decode_datetime, value_type),
+                dump_datetime,
+                load_datetime,
+            )
+            setattr(mapper_class, attr_name, property(make_compact_property(attr_name, value_type)))
+
+        elif raw_scalars and (raw_type := raw_field_type(attr_type)) is not None:
+            # Свойство возвращает хранимое значение как есть,
+            # внутри маппера значение оборачивается в тип поля.
+            # Встроенные значения сериализуются как есть
+            codecs[attr_name] = (raw_type, attr_type, None, None)
+
+    mapper_class._pm_field_codecs = codecs
@@ -0,0 +1,73 @@
+import weakref
+
+from operator import itemgetter
+from typing import Any
+
+from .compact import install_field_codecs
+from .utils import make_property
+
+__all__ = [
+    'dynamic_classes_count',
+    'get_dynamic_class',
+]
+
+# (статический базовый класс, frozenset((имя, тип), ...)) -> динамический класс
+# Классы хранятся по слабым ссылкам, неиспользуемые формы собираются GC
+_classes_cache = weakref.WeakValueDictionary()
+
+
+def get_dynamic_class(base: type, props: dict[str, Any]) -> type:
+    """
+    Возвращает наследника base, дополненного свойствами props.
+
+    Динамический класс всегда наследуется от исходного (статического)
+    класса и описывается полным набором добавленных свойств, поэтому
+    объекты с одинаковым набором полей получают один и тот же класс
+    независимо от порядка, в котором поля добавлялись.
+
+    :param base: класс объекта, которому добавляются свойства
+    :param props: словарь {имя свойства: тип}
+    :return:
+    """
+    static_base = base._pm_dynamic_base or base
+    added_props = base._pm_dynamic_props | frozenset(props.items())
+
+    key = (static_base, added_props)
+
+    new_class = _classes_cache.get(key)
+    if new_class is None:
+        new_class = type(
+            static_base.__name__,
+            (static_base,),
+            {
+                '__module__': static_base.__module__,
+                '__qualname__': static_base.__qualname__,
+            },
+        )
+
+        attrs_dict = static_base._attrs_dict.copy()
+        for prop_name, prop_type in sorted(added_props, key=itemgetter(0)):
+            attrs_dict[prop_name] = prop_type
+            setattr(new_class, prop_name, property(make_property(prop_name)))
+
+        new_class._attrs_dict = attrs_dict
+        new_class._pm_dynamic_base = static_base
+        new_class._pm_dynamic_props = added_props
+
+        # Добавленные поля хранятся так же, как поля базового класса
+        install_field_codecs(new_class)
+
+        static_base._subclass_counter += 1
+        _classes_cache[key] = new_class
+
+    return new_class
+
+
+def dynamic_classes_count() -> int:
+    """
+    Количество существующих динамических классов.
+
+    Классы образуют циклические ссылки, поэтому
+    освобождаются только после сборки мусора.
+    """
+    return len(_classes_cache)
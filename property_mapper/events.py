@@ -0,0 +1,16 @@
+from typing import Any, NamedTuple
+
+__all__ = ['ChangeEvent']
+
+
+class ChangeEvent(NamedTuple):
+    """
+    Изменение значения поля.
+
+    path - путь к полю через точку относительно объекта,
+    на котором зарегистрирован слушатель. Элементы списков
+    и словарей адресуются индексом или ключом
+    """
+    path: str
+    old: Any
+    new: Any
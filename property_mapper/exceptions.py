@@ -14,6 +14,10 @@ class OverrideForbidden(PropertyMapperException):
     pass
 
 
+class ReadOnlyMapper(PropertyMapperException):
+    pass
+
+
 class ValidationError(Exception):
     """
     Ошибка при заполнении данных маппера.
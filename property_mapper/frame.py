@@ -0,0 +1,319 @@
+"""
+Колоночное хранение большого количества записей одной плоской схемы.
+
+    frame = MapperFrame.from_records(Mapper, records)
+
+    frame[0].price  # значение поля, как у маппера
+    frame.to_records()  # [{...}, ...] - как Mapper(record).as_dict()
+    frame.to_columns()  # {'price': array('d', [...]), ...}
+
+Поля Int, Float, Timestamp и bool хранятся в array.array,
+строки Str - в списках интернированных строк. Остальные
+типы значений (Datetime, UUID и т.п.) - в списках объектов.
+Вложенные мапперы, списки и словари не поддерживаются.
+"""
+import inspect
+import sys
+
+from array import array
+from typing import Any, Iterator, Optional
+
+from .mapper_base import PropertyMapperBase
+from .mapper_type import PropertyMapperType
+from .types import Float, Int, Str, Timestamp
+from .types.arrays import from_microseconds, to_microseconds
+
+__all__ = [
+    'FrameRow',
+    'MapperFrame',
+]
+
+
+class _Column:
+    """
+    Значения одного поля всех записей
+    """
+
+    def __init__(self, field_type: type, values: list):
+        self.field_type = field_type
+        self.values = [self.convert(value) for value in values]
+
+    def convert(self, value: Any) -> Any:
+        if value is None:
+            return None
+
+        return self.field_type.from_data(value)
+
+    def get(self, index: int) -> Any:
+        return self.values[index]
+
+    def reverse(self, index: int) -> Any:
+        value = self.values[index]
+        if isinstance(value, PropertyMapperType):
+            return value.reverse()
+
+        return value
+
+    def export(self) -> list:
+        return [self.reverse(index) for index in range(len(self.values))]
+
+
+class _StrColumn(_Column):
+
+    def convert(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+
+        return sys.intern(str(self.field_type.from_data(value)))
+
+    def get(self, index: int) -> Optional[Str]:
+        value = self.values[index]
+        if value is None:
+            return None
+
+        return self.field_type(value)
+
+    def reverse(self, index: int) -> Optional[str]:
+        return self.values[index]
+
+    def export(self) -> list:
+        return list(self.values)
+
+
+class _ArrayColumn(_Column):
+    """
+    Числовые значения в array.array.
+    Пропущенные (None) значения отмечаются в отдельной маске,
+    которая создаётся только при их наличии
+    """
+    typecode: str = None
+    # Тип значения в массиве
+    raw_type: type = None
+
+    def __init__(self, field_type: type, values: list):
+        self.field_type = field_type
+        self.nulls = None
+
+        try:
+            # Быстрый путь: значения уже нужного типа
+            if all(type(value) is self.raw_type for value in values):
+                self.values = array(self.typecode, values)
+                return
+        except TypeError:
+            pass
+
+        self.values = array(self.typecode)
+        for index, value in enumerate(values):
+            if value is None:
+                if self.nulls is None:
+                    self.nulls = bytearray(len(values))
+
+                self.nulls[index] = 1
+                self.values.append(0)
+            else:
+                self.values.append(self.to_raw(value))
+
+    def to_raw(self, value: Any) -> Any:
+        return self.raw_type(self.field_type.from_data(value))
+
+    def from_raw(self, raw: Any) -> Any:
+        return self.field_type(raw)
+
+    def is_null(self, index: int) -> bool:
+        return self.nulls is not None and self.nulls[index]
+
+    def get(self, index: int) -> Any:
+        if self.is_null(index):
+            return None
+
+        return self.from_raw(self.values[index])
+
+    def reverse(self, index: int) -> Any:
+        if self.is_null(index):
+            return None
+
+        return self.values[index]
+
+    def export(self) -> array | list:
+        if self.nulls is None:
+            return array(self.typecode, self.values)
+
+        return [self.reverse(index) for index in range(len(self.values))]
+
+
+class _IntColumn(_ArrayColumn):
+    typecode = 'q'
+    raw_type = int
+
+
+class _FloatColumn(_ArrayColumn):
+    typecode = 'd'
+    raw_type = float
+
+
+class _BoolColumn(_ArrayColumn):
+    typecode = 'b'
+    raw_type = bool
+
+    def to_raw(self, value: Any) -> bool:
+        return bool(value)
+
+    def from_raw(self, raw: int) -> bool:
+        return bool(raw)
+
+    def reverse(self, index: int) -> Optional[bool]:
+        if self.is_null(index):
+            return None
+
+        return bool(self.values[index])
+
+    def export(self) -> list:
+        return [self.reverse(index) for index in range(len(self.values))]
+
+
+class _TimestampColumn(_ArrayColumn):
+    """
+    Метки времени в микросекундах
+    """
+    typecode = 'q'
+    raw_type = int
+
+    def __init__(self, field_type: type, values: list):
+        super().__init__(field_type, [None if value is None else to_microseconds(value) for value in values])
+
+    def to_raw(self, value: int) -> int:
+        return value
+
+    def from_raw(self, raw: int) -> Timestamp:
+        return from_microseconds(self.field_type, raw)
+
+    def reverse(self, index: int) -> Optional[float]:
+        if self.is_null(index):
+            return None
+
+        return self.values[index] / 1_000_000
+
+    def export(self) -> array | list:
+        if self.nulls is None:
+            return array('d', (value / 1_000_000 for value in self.values))
+
+        return [self.reverse(index) for index in range(len(self.values))]
+
+
+def _column_class(field_type: Any) -> type[_Column]:
+    if field_type is bool:
+        return _BoolColumn
+
+    if not inspect.isclass(field_type) or not issubclass(field_type, PropertyMapperType):
+        raise TypeError(f'MapperFrame supports only flat schemas. Unsupported field type {field_type}')
+
+    if issubclass(field_type, Timestamp):
+        return _TimestampColumn
+    elif issubclass(field_type, Int):
+        return _IntColumn
+    elif issubclass(field_type, Float):
+        return _FloatColumn
+    elif issubclass(field_type, Str):
+        return _StrColumn
+
+    return _Column
+
+
+class FrameRow:
+    """
+    Лёгкое представление одной записи MapperFrame.
+    Поля доступны как свойства маппера
+    """
+    __slots__ = ('_frame', '_index')
+
+    def __init__(self, frame: 'MapperFrame', index: int):
+        self._frame = frame
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        column = self._frame.columns.get(name)
+        if column is None:
+            raise AttributeError(f'{self._frame.mapper_class} has no property "{name}"')
+
+        return column.get(self._index)
+
+    def as_dict(self) -> dict:
+        result = {}
+        for name, column in self._frame.columns.items():
+            value = column.reverse(self._index)
+            if value is not None:
+                result[name] = value
+
+        return result
+
+    def to_mapper(self) -> PropertyMapperBase:
+        return self._frame.mapper_class(self.as_dict())
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self._frame.mapper_class.__name__}[{self._index}] {self.as_dict()}>'
+
+
+class MapperFrame:
+    """
+    Набор записей одной плоской схемы, хранящийся по колонкам
+    """
+
+    def __init__(self, mapper_class: type[PropertyMapperBase], columns: dict[str, _Column], size: int):
+        self.mapper_class = mapper_class
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_records(cls, mapper_class: type[PropertyMapperBase], records: list[dict]) -> 'MapperFrame':
+        """
+        Преобразует записи (словари исходных данных) в колонки.
+        Значения преобразуются так же, как при создании маппера.
+        Неизвестные поля записей отбрасываются
+
+        :param mapper_class: класс маппера с плоской схемой
+        :param records:
+        :return:
+        """
+        if not isinstance(records, list):
+            records = list(records)
+
+        columns = {}
+        for prop_name, prop_type in mapper_class._attrs_dict.items():
+            column_class = _column_class(prop_type)
+
+            columns[prop_name] = column_class(
+                prop_type,
+                [record.get(prop_name) for record in records],
+            )
+
+        return cls(mapper_class=mapper_class, columns=columns, size=len(records))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> FrameRow:
+        if index < 0:
+            index += self.size
+
+        if not 0 <= index < self.size:
+            raise IndexError('MapperFrame index out of range')
+
+        return FrameRow(self, index)
+
+    def __iter__(self) -> Iterator[FrameRow]:
+        for index in range(self.size):
+            yield FrameRow(self, index)
+
+    def to_records(self) -> list[dict]:
+        """
+        Записи в том виде, который вернул бы as_dict() маппера
+        """
+        return [row.as_dict() for row in self]
+
+    def to_columns(self) -> dict[str, array | list]:
+        """
+        Исходные значения по колонкам.
+        Числовые колонки без пропусков возвращаются в array.array
+        (метки времени - в секундах, 'd'), остальные - списками
+        """
+        return {name: column.export() for name, column in self.columns.items()}
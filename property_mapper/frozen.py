@@ -0,0 +1,84 @@
+"""
+Неизменяемые словарь и список.
+
+Используются для кэшированных результатов as_dict: результат
+разделяется между вызовами, поэтому изменять его нельзя.
+Остаются наследниками dict и list, так что сериализуются
+в json и сравниваются так же, как обычные контейнеры.
+Копии (copy, deepcopy) и результат pickle - обычные изменяемые dict и list.
+"""
+import copy
+
+__all__ = [
+    'FrozenDict',
+    'FrozenList',
+    'thaw',
+]
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f'{self.__class__.__name__} is read-only, make a copy to modify it')
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self) -> tuple:
+        return dict, (dict(self), )
+
+
+class FrozenList(list):
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def copy(self) -> list:
+        return list(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self) -> tuple:
+        return list, (list(self), )
+
+
+def thaw(value):
+    """
+    Изменяемая копия неизменяемых контейнеров (рекурсивно)
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [thaw(item) for item in value]
+
+    return value
@@ -2,11 +2,12 @@ import inspect
 import sys
 
 from types import GenericAlias, UnionType
-from typing import Any, ForwardRef, List, Union
+from typing import Any, Dict, ForwardRef, List, Union
 
 from .mapper_base import PropertyMapperBase
 from .mapper_type import PropertyMapperType
 from .utils import (
+    is_dict,
     is_list,
     is_union,
     ListAlias,
@@ -20,8 +21,8 @@ own_types = (
 )
 
 own_aliases = (
-    GenericAlias,  # list[int], list[Union[int, str]]
-    ListAlias,  # List[int], List[Union[int, str]]
+    GenericAlias,  # list[int], list[Union[int, str]], dict[str, int]
+    ListAlias,  # List[int], List[Union[int, str]], Dict[str, int]
     UnionAlias,  # Union[int, str]
     UnionType,  # int | str
 )
@@ -36,6 +37,8 @@ def check_union_hint(class_name, hint_name, hint_type: Union[UnionAlias, UnionTy
     for t in types:
         if is_list(t):
             raise RecursionError(f'Union type hint can not contain List type hint!')
+        if is_dict(t):
+            raise RecursionError('Union type hint can not contain Dict type hint!')
         if is_union(t):
             raise RecursionError(f'Union type hint can not contain another Union type hint!')
 
@@ -67,6 +70,8 @@ def check_list_hint(class_name, hint_name, hint_type: Union[GenericAlias, ListAl
 
     if is_list(type_inside_list):
         raise RecursionError(f'List type hint can not contain another List type hint!')
+    if is_dict(type_inside_list):
+        raise RecursionError('List type hint can not contain Dict type hint!')
 
     if is_union(type_inside_list):
         new_type = check_union_hint(
@@ -87,6 +92,44 @@ def check_list_hint(class_name, hint_name, hint_type: Union[GenericAlias, ListAl
         return list[(new_type,)]
 
 
+def check_dict_hint(class_name, hint_name, hint_type: Union[GenericAlias, ListAlias]):
+    # Dict должен содержать тип ключа и тип значения
+    if len(hint_type.__args__) != 2:
+        raise TypeError(
+            f'Property {hint_name} of {class_name}. Dict must contain key and value types!'
+        )
+
+    key_type, value_type = hint_type.__args__
+
+    if key_type is not str:
+        raise TypeError(
+            f'Property {hint_name} of {class_name}. Only str keys are supported in Dict!'
+        )
+
+    if is_list(value_type):
+        raise RecursionError('Dict type hint can not contain List type hint!')
+    if is_dict(value_type):
+        raise RecursionError('Dict type hint can not contain another Dict type hint!')
+
+    if is_union(value_type):
+        new_type = check_union_hint(
+            class_name=class_name,
+            hint_name=hint_name,
+            hint_type=value_type,
+        )
+
+    else:
+        # Рекурсивно проверяем тип значений
+        new_type = check_hint_type(
+            class_name=class_name,
+            hint_name=hint_name,
+            hint_type=value_type,
+        )
+
+    if new_type is not None:
+        return dict[str, new_type]
+
+
 def check_hint_type(class_name, hint_name, hint_type):
     """
     Проверяет наличие в описании типа только допустимых типов
@@ -103,6 +146,13 @@ def check_hint_type(class_name, hint_name, hint_type):
         """
         raise TypeError(f'Property {hint_name} of {class_name} can not be None.')
 
+    elif hint_type is Dict or hint_type is dict:
+        """
+        Нельзя задать словарь, не указав тип содержащихся в нём значений
+        """
+        raise TypeError(f'Property {hint_name} of {class_name}.'
+                        f' Specify the type of values contained in the dict: dict[str, T]!')
+
     elif inspect.isclass(hint_type):
         """
         Допустимы только классы, с которыми умеет работать Маппер
@@ -124,7 +174,7 @@ def check_hint_type(class_name, hint_name, hint_type):
         Нельзя указывать dict напрямую.
         """
         raise TypeError(f'Property {hint_name} of {class_name}. Dictionary type is not supported.'
-                        f'Please subclass the ApiInterfaceBase class.')
+                        f'Please use dict[str, T] or subclass the ApiInterfaceBase class.')
 
     elif hint_type is List or hint_type is list:
         """
@@ -150,6 +200,23 @@ def check_hint_type(class_name, hint_name, hint_type):
             hint_type=hint_type,
         )
 
+    elif is_dict(hint_type):
+        """
+        Варианты:
+
+        GenericAlias:
+        dict[str, int], dict[str, Union[int, str]], dict[str, int | str]
+
+        ListType:
+        Dict[str, int], Dict[str, Union[int, str]], Dict[str, int | str]
+
+        """
+        return check_dict_hint(
+            class_name=class_name,
+            hint_name=hint_name,
+            hint_type=hint_type,
+        )
+
     elif is_union(hint_type):
         """
         Варианты
@@ -204,7 +271,7 @@ def expand_forward_refs(new_class: type, hint_name: str, hint_type: Any):
         #     recursive_guard=frozenset(),
         # )
 
-    elif is_list(hint_type) or is_union(hint_type):
+    elif is_list(hint_type) or is_dict(hint_type) or is_union(hint_type):
         result_args = []
         has_new = False
         for item in hint_type.__args__:
@@ -222,6 +289,9 @@ def expand_forward_refs(new_class: type, hint_name: str, hint_type: Any):
             elif is_list(hint_type):
                 return list[tuple(result_args)]
 
+            elif is_dict(hint_type):
+                return dict[tuple(result_args)]
+
             else:
                 raise TypeError(f'Unexpected error')
 
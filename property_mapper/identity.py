@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Any
+
+__all__ = ['IdentityMap']
+
+
+class IdentityMap:
+    """
+    Объекты класса по значению ключевого поля (pm_key_field)
+    с вытеснением давно не использовавшихся (LRU)
+    """
+    __slots__ = ('maxsize', '_items')
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+
+        return item
+
+    def put(self, key: Any, item: Any):
+        self._items[key] = item
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: Any) -> Any:
+        return self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items
@@ -0,0 +1,282 @@
+"""
+Сбор статистики работы мапперов.
+
+По умолчанию выключен и ничего не стоит: при включении методы
+PropertyMapperBase подменяются обёртками, при выключении
+возвращаются исходные.
+
+    from property_mapper import instrumentation
+
+    instrumentation.enable()
+    ...
+    stats = instrumentation.snapshot()
+    instrumentation.disable()
+
+Время указывается суммарное, с учётом вложенных вызовов (как cumtime в cProfile).
+"""
+import functools
+
+from time import perf_counter
+from typing import Callable
+
+from .mapper_base import PropertyMapperBase
+
+__all__ = [
+    'add_exporter',
+    'disable',
+    'enable',
+    'export',
+    'is_enabled',
+    'remove_exporter',
+    'reset',
+    'snapshot',
+]
+
+_stats: dict = {}
+_originals: dict = {}
+_exporters: list = []
+
+
+def _class_stats(cls: type) -> dict:
+    key = str(cls)
+
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats[key] = {
+            'init': {'calls': 0, 'time': 0.0},
+            'merge': {'calls': 0, 'time': 0.0},
+            'propagations': 0,
+            'fields': {},
+        }
+
+    return stats
+
+
+def _field_stats(cls: type, prop_name: str) -> dict:
+    fields = _class_stats(cls)['fields']
+
+    stats = fields.get(prop_name)
+    if stats is None:
+        stats = fields[prop_name] = {
+            'parse': {'calls': 0, 'time': 0.0},
+            'merge': {'calls': 0, 'time': 0.0},
+            'probes': 0,
+            'misses': 0,
+            'lists': 0,
+            'list_items': 0,
+            'list_max': 0,
+        }
+
+    return stats
+
+
+def _add_call(counter: dict, elapsed: float):
+    counter['calls'] += 1
+    counter['time'] += elapsed
+
+
+def _add_list(stats: dict, items: list):
+    size = len(items) if isinstance(items, (list, tuple)) else 0
+
+    stats['lists'] += 1
+    stats['list_items'] += size
+    if size > stats['list_max']:
+        stats['list_max'] = size
+
+
+def _wrap_init(func):
+    @functools.wraps(func)
+    def __init__(self, *args, **kwargs):
+        cls = self.__class__
+        start = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _add_call(_class_stats(cls)['init'], perf_counter() - start)
+
+    return __init__
+
+
+def _wrap_merge_data(func):
+    @functools.wraps(func)
+    def merge_data(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _add_call(_class_stats(self.__class__)['merge'], perf_counter() - start)
+
+    return merge_data
+
+
+def _wrap_parse_property(func):
+    @functools.wraps(func)
+    def _parse_property(self, prop_name, prop_value):
+        start = perf_counter()
+        try:
+            return func(self, prop_name=prop_name, prop_value=prop_value)
+        finally:
+            _add_call(_field_stats(self.__class__, prop_name)['parse'], perf_counter() - start)
+
+    return _parse_property
+
+
+def _wrap_merge_property(func):
+    @functools.wraps(func)
+    def merge_property(self, prop_name, prop_value):
+        start = perf_counter()
+        try:
+            return func(self, prop_name=prop_name, prop_value=prop_value)
+        finally:
+            _add_call(_field_stats(self.__class__, prop_name)['merge'], perf_counter() - start)
+
+    return merge_property
+
+
+def _wrap_probe(func):
+    @functools.wraps(func)
+    def probe(self, prop_name, prop_type, prop_value):
+        result = func(self, prop_name=prop_name, prop_type=prop_type, prop_value=prop_value)
+
+        stats = _field_stats(self.__class__, prop_name)
+        stats['probes'] += 1
+        if result is None:
+            stats['misses'] += 1
+
+        return result
+
+    return probe
+
+
+def _wrap_list(func):
+    @functools.wraps(func)
+    def list_method(self, prop_name, prop_value_list, list_type):
+        _add_list(_field_stats(self.__class__, prop_name), prop_value_list)
+
+        return func(self, prop_name=prop_name, prop_value_list=prop_value_list, list_type=list_type)
+
+    return list_method
+
+
+def _wrap_mark_changed(func):
+    @functools.wraps(func)
+    def mark_changed(self, *args, **kwargs):
+        if kwargs.get('propagate', args[0] if args else False):
+            _class_stats(self.__class__)['propagations'] += 1
+
+        return func(self, *args, **kwargs)
+
+    return mark_changed
+
+
+_wrappers: dict[str, Callable] = {
+    '__init__': _wrap_init,
+    'merge_data': _wrap_merge_data,
+    'merge_property': _wrap_merge_property,
+    '_parse_property': _wrap_parse_property,
+    '_try_create_object': _wrap_probe,
+    '_try_merge_object': _wrap_probe,
+    '_parse_list': _wrap_list,
+    '_merge_list': _wrap_list,
+    'mark_changed': _wrap_mark_changed,
+}
+
+
+def enable():
+    """
+    Включает сбор статистики
+    """
+    if _originals:
+        return
+
+    for name, wrapper in _wrappers.items():
+        original = PropertyMapperBase.__dict__[name]
+        _originals[name] = original
+        setattr(PropertyMapperBase, name, wrapper(original))
+
+
+def disable():
+    """
+    Выключает сбор статистики, восстанавливая исходные методы.
+    Собранные данные сохраняются до вызова reset()
+    """
+    while _originals:
+        name, original = _originals.popitem()
+        setattr(PropertyMapperBase, name, original)
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def reset():
+    """
+    Очищает собранную статистику
+    """
+    _stats.clear()
+
+
+def snapshot() -> dict:
+    """
+    Возвращает копию собранной статистики:
+
+    {
+        'module.Class': {
+            'init': {'calls': int, 'time': float},
+            'merge': {'calls': int, 'time': float},
+            'propagations': int,
+            'fields': {
+                'field': {
+                    'parse': {'calls': int, 'time': float},
+                    'merge': {'calls': int, 'time': float},
+                    'probes': int,  # попытки подобрать тип (Union, списки)
+                    'misses': int,  # неудачные попытки
+                    'lists': int,  # количество обработанных списков
+                    'list_items': int,  # суммарное количество элементов
+                    'list_max': int,  # максимальный размер списка
+                },
+            },
+        },
+    }
+    """
+    result = {}
+    for class_name, class_stats in _stats.items():
+        result[class_name] = {
+            'init': dict(class_stats['init']),
+            'merge': dict(class_stats['merge']),
+            'propagations': class_stats['propagations'],
+            'fields': {
+                prop_name: {
+                    key: dict(value) if isinstance(value, dict) else value
+                    for key, value in field_stats.items()
+                }
+                for prop_name, field_stats in class_stats['fields'].items()
+            },
+        }
+
+    return result
+
+
+def add_exporter(exporter: Callable[[dict], None]):
+    """
+    Регистрирует функцию, получающую снимок статистики при вызове export()
+    """
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def remove_exporter(exporter: Callable[[dict], None]):
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def export() -> dict:
+    """
+    Передаёт снимок статистики всем зарегистрированным экспортёрам
+    """
+    data = snapshot()
+
+    for exporter in _exporters:
+        exporter(data)
+
+    return data
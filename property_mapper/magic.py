@@ -11,24 +11,33 @@ class MagicMapper(PropertyMapperBase, MapperInterface):
     """
     pm_magic_type: type[Union[PropertyMapperBase, PropertyMapperType, bool]]
 
-    def __new__(cls, data, parent: 'MagicMapper' = None, attr_name: str = None):
+    def __init__(self, data, parent: 'MagicMapper' = None, attr_name: str = None, trusted: bool = False):
         """
         Если переданы данные с отсутствующими атрибутами,
-        возвращаем инстанс нового класса
-        :param args:
-        :param kwargs:
+        сначала заполняются известные поля, затем объект
+        дополняется новыми свойствами (класс меняется на месте)
+
+        :param data:
+        :param parent:
+        :param attr_name:
+        :param trusted:
         """
+        prop_data = {}
+
+        if hasattr(self, 'pm_magic_type') and isinstance(data, dict) and self.check_has_new_keys(data=data):
+            own_data = {}
+            for key, value in data.items():
+                if key in self._attrs_dict:
+                    own_data[key] = value
+                else:
+                    prop_data[key] = (self.pm_magic_type, value)
+
+            data = own_data
 
-        if hasattr(cls, 'pm_magic_type') and cls.check_has_new_keys(data=data):
-            empty_obj: MagicMapper = cls(
-                data={},
-                parent=parent,
-                attr_name=attr_name,
-            )
-            return empty_obj.apply_data(data=data, initial=True)
+        super().__init__(data=data, parent=parent, attr_name=attr_name, trusted=trusted)
 
-        else:
-            return super().__new__(cls)
+        if prop_data:
+            self.add_properties(prop_data=prop_data, initial=True)
 
     @classmethod
     def check_has_new_keys(cls, data: dict) -> bool:
@@ -54,30 +63,28 @@ class MagicMapper(PropertyMapperBase, MapperInterface):
         """
         Сравнивает список своих полей и полей, переданных в словаре
 
-        Если есть новые поля, возвращает новый инстанс
+        Если есть новые поля, объект дополняется ими на месте,
+        ранее преобразованные значения сохраняются
         Поля, которые есть в классе, но нет в данных, обнуляются (None),
         но не удаляются
 
         :param data:
         :param initial: True только при создании объекта (объект не метится, как изменённый)
         """
-        own_keys = set(self._attrs_dict.keys())
-        received_keys = set(data.keys())
-
-        new_keys = received_keys - own_keys
-        obsolete_keys = own_keys - received_keys
+        own_keys = self._attrs_dict.keys()
 
         prop_data = {}
-        for key in new_keys:
-            prop_data[key] = (self.pm_magic_type, data[key])
-            del data[key]
+        own_data = {}
+        for key, value in data.items():
+            if key in own_keys:
+                own_data[key] = value
+            else:
+                prop_data[key] = (self.pm_magic_type, value)
 
-        for key in obsolete_keys:
-            data[key] = None
+        # Переданный словарь не изменяется
+        for key in own_keys - data.keys():
+            own_data[key] = None
 
-        if prop_data:
-            new_changes = self.add_properties(prop_data=prop_data, initial=initial)
-        else:
-            new_changes = self
+        new_changes = self.add_properties(prop_data=prop_data, initial=initial)
 
-        return new_changes.merge_data(data)
+        return new_changes.merge_data(own_data)
@@ -1,15 +1,109 @@
 import datetime
 import inspect
+import random
+import threading
+import weakref
 
-from typing import Any, List, Optional, Self, Type, Union
+from typing import Any, Callable, Iterator, List, Optional, Self, Type, Union
 
-from .exceptions import WrongType, UnsupportedType, ValidationError
+from .dynamic import get_dynamic_class
+from .events import ChangeEvent
+from .exceptions import ReadOnlyMapper, WrongType, UnsupportedType, ValidationError
+from .frozen import FrozenDict, FrozenList, thaw
+from .identity import IdentityMap
 from .mapper_type import PropertyMapperType
-from .utils import is_list, is_union, get_types, merge_dicts, make_property
+from .utils import is_dict, is_list, is_union, get_types, merge_dicts
 
 __all__ = ['PropertyMapperBase']
 
 
+class _OperationState(threading.local):
+    # Вложенность операций изменения (merge_data, replace_property, add_properties) в текущем потоке
+    level: int = 0
+    # Изменённые за операцию поля для слушателей: (id объекта, поле) -> (объект, поле, старое значение)
+    pending: dict = None
+    # Создание объектов из проверенных данных (без проверок схемы)
+    trusted: bool = False
+    # Доля объектов, проверяемых полностью при создании из проверенных данных
+    trusted_sample: float = None
+
+
+_operations = _OperationState()
+
+
+def _begin_operation():
+    """
+    Начинает операцию изменения дерева.
+    Внешняя операция открывает новую эпоху изменений
+    """
+    level = _operations.level
+    if not level:
+        PropertyMapperBase._pm_epoch += 1
+
+    _operations.level = level + 1
+
+
+def _end_operation():
+    level = _operations.level - 1
+    _operations.level = level
+
+    if not level and _operations.pending:
+        pending = _operations.pending
+        _operations.pending = None
+
+        PropertyMapperBase._dispatch_changes(pending.values())
+
+
+def _release_listeners(listeners: list):
+    PropertyMapperBase._pm_listeners_count -= len(listeners)
+
+
+def _unpickle_mapper(mapper_class: type['PropertyMapperBase'],
+                     dynamic_props: Optional[tuple],
+                     values: tuple,
+                     unknown_params: dict) -> 'PropertyMapperBase':
+    """
+    Восстанавливает объект из результата PropertyMapperBase.__reduce__
+    """
+    if dynamic_props:
+        mapper_class = get_dynamic_class(base=mapper_class, props=dict(dynamic_props))
+
+    obj = mapper_class._create_empty()
+    obj.unknown_params = unknown_params
+
+    codecs = mapper_class._pm_field_codecs
+    instance_dict = obj.__dict__
+    for prop_name, value in zip(mapper_class._attrs_dict.keys(), values):
+        if value is None:
+            continue
+
+        if codecs and prop_name in codecs:
+            load = codecs[prop_name][3]
+            if load is not None:
+                value = load(value)
+
+        instance_dict[f'_{prop_name}'] = value
+
+        # Вложенные объекты восстанавливаются раньше родителя
+        if isinstance(value, PropertyMapperBase):
+            items = (value, )
+        elif isinstance(value, list):
+            items = value
+        elif isinstance(value, dict):
+            items = value.values()
+        else:
+            continue
+
+        for item in items:
+            if isinstance(item, PropertyMapperBase):
+                item._attach(parent=obj, attr_name=prop_name)
+
+    if mapper_class.pm_read_only:
+        obj = obj._share()
+
+    return obj
+
+
 # TODO: magic attrs (динамически создаваемые имена атрибутов)
 
 class PropertyMapperBase:
@@ -17,34 +111,131 @@ class PropertyMapperBase:
     pm_identify_path: str = None
     pm_allow_unknown: bool = False
     pm_strict_check: bool = False
+    # Кэшировать результат as_dict() до следующего изменения объекта или его потомков
+    pm_cache_dict: bool = False
+    # Пропускать слияние, если данные совпадают с данными последнего слияния
+    pm_fingerprint: bool = False
+    # Размер карты объектов по ключевому полю (0 - не используется).
+    # Вложенные объекты с уже известным ключом не создаются заново,
+    # а переиспользуются с новыми данными
+    pm_identity_map: int = 0
+    # Неизменяемый объект. Вложенные объекты такого класса с одинаковыми
+    # данными создаются один раз и разделяются между всеми родителями,
+    # поэтому ссылки на родителя у них нет
+    pm_read_only: bool = False
+    # Хранить поля Datetime и Timestamp компактно (числом микросекунд),
+    # создавая объект даты при обращении к полю
+    pm_compact_datetimes: bool = False
+    # Хранить поля Int, Float и Str встроенными int, float и str
+    pm_raw_scalars: bool = False
+    # Данные объектов класса всегда считаются проверенными (см. trusted в __init__)
+    pm_trusted: bool = False
+    # Доля объектов, которые при этом всё же проверяются полностью
+    pm_trusted_sample: float = 0.0
+    # Версия схемы в двоичном формате (см. to_bytes)
+    pm_schema_version: int = 0
+    # Поля прежних версий схемы по порядку: {версия: (имя поля, ...)}
+    pm_schema_history: dict[int, tuple[str, ...]] = {}
     # pm_magick_unknown: List[type]  # TODO: реализовать
 
     _attrs_dict: dict
 
     unknown_params: dict
 
-    _pm_private_parent: 'PropertyMapperBase'
-    _pm_private_root: 'PropertyMapperBase'
+    # Ссылки на родителя и корень слабые: дерево не образует циклов
+    # и освобождается подсчётом ссылок сразу после удаления корня
+    _pm_private_parent: weakref.ref = None
+    _pm_private_root: weakref.ref = None
     _pm_private_attr_name: str = None
+    # Прочие места размещения общего объекта (pm_identity_map):
+    # [(слабая ссылка на родителя, поле), ...]
+    _pm_private_owners: list = ()
+    # Объект создаётся: изменения потомков в нём не отмечаются
+    _pm_private_building: bool = False
     _pm_status_changed: bool = False
+    # Эпоха, в которой изменения этого объекта были распространены до корня
+    _pm_private_propagated: int = -1
+    # Эпоха последнего изменения объекта или его потомков
+    _pm_version: int = 0
+    # Имена изменённых полей. Множество создаётся при первом изменении
+    _pm_changed_fields: set = frozenset()
+    # Добавленные или заменённые элементы изменённых списков и словарей:
+    # {поле: множество индексов или ключей, None - изменён весь контейнер}
+    _pm_changed_items: dict = {}
+    # Кэш as_dict(): (версия, include_unknown, результат)
+    _pm_dict_cache: tuple = None
+    # Отпечаток данных последнего слияния: (отпечаток, версия после слияния)
+    _pm_fingerprint: tuple = None
+
+    # Текущая эпоха изменений. Монотонно растёт: увеличивается в начале каждой
+    # внешней операции изменения и при сбросе статуса изменённого объекта
+    _pm_epoch: int = 0
+
+    # Слушатели изменений экземпляра: [(callback, path), ...]
+    _pm_listeners: list = ()
+    # Количество зарегистрированных слушателей (всех классов и существующих объектов)
+    _pm_listeners_count: int = 0
 
     _subclass_counter: int = 0
 
-    def __init__(self, data, parent: 'PropertyMapperBase' = None, attr_name: str = None):
+    # Заполняются только у классов, созданных в add_properties
+    _pm_dynamic_base: type['PropertyMapperBase'] = None
+    _pm_dynamic_props: frozenset = frozenset()
+
+    # Поля, значения которых хранятся в другом виде:
+    # {имя: (преобразование при записи, преобразование при чтении,
+    #        в переносимый вид для pickle, из переносимого вида)}.
+    # Последние два - None, если хранимое значение переносимо как есть.
+    # Заполняется метаклассом
+    _pm_field_codecs: dict = {}
+
+    def __init__(self, data, parent: 'PropertyMapperBase' = None, attr_name: str = None, trusted: bool = False):
         """
 
         :param data: словарь с данными
         :param strict:
         :param deep:
         :param parent: добавить ссылки на родительские объекты
+        :param trusted: данные уже были проверены (например, получены из as_dict и сохранены в кэше).
+            Проверки схемы, совместимости вложенных объектов и validate_schema пропускаются,
+            поля преобразуются сразу по объявленным типам. Действует и на вложенные объекты
         """
 
         self.mark_original()
 
-        if parent is not None:
-            self._pm_private_parent = parent
+        if parent is not None and not self.pm_read_only:
+            self._pm_private_parent = weakref.ref(parent)
             self._pm_private_attr_name = attr_name
 
+        self._pm_private_building = True
+        try:
+            self._init_object(data, trusted=trusted)
+        finally:
+            del self._pm_private_building
+
+    def _init_object(self, data, trusted: bool):
+        if trusted or self.pm_trusted or _operations.trusted:
+            sample = _operations.trusted_sample
+            if sample is None:
+                sample = self.pm_trusted_sample
+
+            if not sample or random.random() >= sample:
+                self._init_trusted(data)
+                return
+
+            # Выборочная полная проверка объекта вместе с вложенными
+            previous = _operations.trusted
+            _operations.trusted = False
+            try:
+                self._init_data(data)
+            finally:
+                _operations.trusted = previous
+
+            return
+
+        self._init_data(data)
+
+    def _init_data(self, data):
         if not self.pm_allow_unknown:
             self.validate_keys(data)
 
@@ -61,6 +252,223 @@ class PropertyMapperBase:
         if self.pm_strict_check:
             self.validate_schema()
 
+        if self.pm_fingerprint or self.pm_read_only:
+            self._pm_fingerprint = (self._data_fingerprint(data), self._pm_version)
+
+    def _init_trusted(self, data):
+        previous = _operations.trusted
+        _operations.trusted = True
+        try:
+            self.unknown_params = {}
+
+            for prop_name, prop_value in self.prepare_data(data).items():
+                self._parse_trusted_property(
+                    prop_name=prop_name,
+                    prop_value=prop_value,
+                )
+        finally:
+            _operations.trusted = previous
+
+        if self.pm_fingerprint or self.pm_read_only:
+            self._pm_fingerprint = (self._data_fingerprint(data), self._pm_version)
+
+    def _parse_trusted_property(self, prop_name: str, prop_value: Any):
+        """
+        Преобразует значение проверенных данных.
+        Встроенные типы (в том числе в списках и словарях) разбираются
+        через from_trusted, вложенные объекты в списках и словарях
+        создаются без проверки совместимости, остальное - как в _parse_property
+        """
+        prop_type = self._attrs_dict.get(prop_name)
+
+        if prop_value is None or prop_type is None:
+            pass
+
+        elif inspect.isclass(prop_type):
+            if issubclass(prop_type, PropertyMapperType):
+                self.__set_prop(prop_name, prop_type.from_trusted(prop_value))
+                return
+
+        else:
+            if is_list(prop_type):
+                item_type = get_types(prop_type)[0]
+
+                if inspect.isclass(item_type) and issubclass(item_type, PropertyMapperBase):
+                    self.__set_prop(prop_name, [
+                        self._make_mapper_object(
+                            prop_name=prop_name,
+                            prop_type=item_type,
+                            prop_value=item,
+                        )
+                        for item in prop_value
+                    ])
+                    return
+
+                if isinstance(prop_value, list) and inspect.isclass(item_type) \
+                        and issubclass(item_type, PropertyMapperType):
+                    try:
+                        self.__set_prop(prop_name, item_type.from_trusted_many(prop_value))
+                        return
+                    except (TypeError, ValueError, UnsupportedType):
+                        # Разбираем как обычно (с подробной ошибкой)
+                        pass
+
+            elif is_dict(prop_type):
+                value_type = get_types(prop_type)[1]
+
+                if inspect.isclass(value_type) and issubclass(value_type, PropertyMapperBase):
+                    self.__set_prop(prop_name, {
+                        key: None if item is None else self._make_mapper_object(
+                            prop_name=prop_name,
+                            prop_type=value_type,
+                            prop_value=item,
+                        )
+                        for key, item in prop_value.items()
+                    })
+                    return
+
+                if isinstance(prop_value, dict) and inspect.isclass(value_type) \
+                        and issubclass(value_type, PropertyMapperType):
+                    try:
+                        self.__set_prop(prop_name, {
+                            key: None if item is None else value_type.from_trusted(item)
+                            for key, item in prop_value.items()
+                        })
+                        return
+                    except (TypeError, ValueError, UnsupportedType):
+                        pass
+
+        self._parse_property(
+            prop_name=prop_name,
+            prop_value=prop_value,
+        )
+
+    @classmethod
+    def from_values(cls,
+                    values: dict[str, Any],
+                    parent: 'PropertyMapperBase' = None,
+                    attr_name: str = None) -> Self:
+        """
+        Создаёт объект из уже преобразованных значений полей:
+        мапперов, значений встроенных типов, списков и словарей из них.
+
+        Значения присваиваются как есть, без prepare_data и преобразования,
+        вложенные мапперы помещаются в новый объект (ссылки на родителя
+        и корень перестраиваются). Списки и словари копируются (неглубоко).
+        Значение, не являющееся экземпляром типа поля (для списков и словарей -
+        хотя бы один элемент), преобразуется как обычно
+
+        :param values: {поле: значение}
+        :param parent:
+        :param attr_name:
+        :return:
+        """
+        obj = cls._create_empty(parent=parent, attr_name=attr_name)
+
+        for prop_name, prop_value in values.items():
+            obj._set_value(prop_name, prop_value)
+
+        if cls.pm_strict_check:
+            obj.validate_schema()
+
+        if cls.pm_read_only:
+            obj = obj._share()
+
+        return obj
+
+    @classmethod
+    def _create_empty(cls, parent: 'PropertyMapperBase' = None, attr_name: str = None) -> Self:
+        """
+        Создаёт объект без данных (поля заполняются через _set_value)
+        """
+        obj = cls.__new__(cls)
+        obj.mark_original()
+
+        if parent is not None and not cls.pm_read_only:
+            obj._pm_private_parent = weakref.ref(parent)
+            obj._pm_private_attr_name = attr_name
+
+        obj.unknown_params = {}
+
+        return obj
+
+    @classmethod
+    def construct(cls, **fields) -> Self:
+        """
+        То же, что from_values(fields)
+        """
+        return cls.from_values(fields)
+
+    def _set_value(self, prop_name: str, prop_value: Any):
+        """
+        Устанавливает преобразованное значение поля (см. from_values).
+        Непреобразованное значение разбирается так же, как при создании из данных
+        """
+        prop_type = self._attrs_dict.get(prop_name)
+        if prop_type is None:
+            raise ValidationError(f'{self.__class__} Unknown property "{prop_name}"')
+
+        if prop_value is None or self._is_converted(prop_type, prop_value):
+            if isinstance(prop_value, list):
+                prop_value = list(prop_value)
+            elif isinstance(prop_value, dict):
+                prop_value = dict(prop_value)
+
+            self.__set_prop(prop_name, prop_value)
+        else:
+            self._parse_property(
+                prop_name=prop_name,
+                prop_value=prop_value,
+            )
+            prop_value = self.__get_prop(prop_name)
+
+        if isinstance(prop_value, list):
+            items = prop_value
+        elif isinstance(prop_value, dict):
+            items = prop_value.values()
+        else:
+            items = (prop_value, )
+
+        for item in items:
+            if isinstance(item, PropertyMapperBase):
+                item._attach(parent=self, attr_name=prop_name)
+
+    @staticmethod
+    def _is_converted(prop_type: Any, prop_value: Any) -> bool:
+        """
+        Значение уже имеет тип поля (для списков и словарей - все элементы)
+        """
+        if inspect.isclass(prop_type):
+            return isinstance(prop_value, prop_type)
+
+        if is_list(prop_type):
+            item_types = PropertyMapperBase._variant_types(get_types(prop_type)[0])
+            return isinstance(prop_value, list) and all(isinstance(item, item_types) for item in prop_value)
+
+        if is_dict(prop_type):
+            value_types = PropertyMapperBase._variant_types(get_types(prop_type)[1])
+            return isinstance(prop_value, dict) and all(
+                item is None or isinstance(item, value_types) for item in prop_value.values()
+            )
+
+        if is_union(prop_type):
+            return isinstance(prop_value, get_types(prop_type))
+
+        return False
+
+    @staticmethod
+    def _variant_types(prop_type: Any) -> tuple:
+        if is_union(prop_type):
+            return get_types(prop_type)
+
+        return (prop_type, )
+
+    def _stored_value(self, prop_name: str) -> Any:
+        """
+        Хранимое значение поля в типе поля (без функции _get_<поле>)
+        """
+        return self.__get_prop(prop_name)
+
     def prepare_data(self, data: dict) -> dict:
         """
         Подготавливает данные к обработке.
@@ -154,8 +562,93 @@ class PropertyMapperBase:
         if validate:
             self.validate_keys(data)
 
-        # TODO: проверка на изменения
-        return self._merge_json_data(data=self.prepare_data(data))
+        if self.pm_read_only:
+            return self._merge_read_only(data)
+
+        fingerprint = None
+        if self.pm_fingerprint:
+            fingerprint = self._data_fingerprint(data)
+
+            # Данные не изменились с последнего слияния, а объект и его потомки
+            # с тех пор не менялись (версия та же) - слияние ничего не изменит
+            if self._pm_fingerprint == (fingerprint, self._pm_version):
+                return self
+
+        _begin_operation()
+        try:
+            result = self._merge_json_data(data=self.prepare_data(data))
+        finally:
+            _end_operation()
+
+        if fingerprint is not None:
+            self._pm_fingerprint = (fingerprint, self._pm_version)
+
+        return result
+
+    def _merge_read_only(self, data: dict) -> Self:
+        """
+        Неизменяемый объект не сливается с данными: если данные
+        отличаются, возвращается (общий) объект с результатом слияния.
+        Вызывающий заменяет им старое значение
+        """
+        fingerprint = self._pm_fingerprint
+        if fingerprint is not None and fingerprint[0] == self._data_fingerprint(data):
+            return self
+
+        # unknown_params копируются: merge_dicts изменяет вложенные словари
+        merged_data = thaw(self.unknown_params)
+        merged_data.update(self._build_dict(include_unknown=True))
+
+        return self.get_shared(merge_dicts(src=self.prepare_data(data), dst=merged_data))
+
+    @classmethod
+    def get_shared(cls, data: dict) -> Self:
+        """
+        Возвращает неизменяемый объект с данными data.
+        Пока объект существует, для структурно одинаковых данных возвращается он же
+        """
+        shared = cls._get_shared_objects()
+
+        key = repr(data)
+
+        obj = shared.get(key)
+        if obj is None:
+            obj = shared[key] = cls(data=data)
+
+        return obj
+
+    @classmethod
+    def _get_shared_objects(cls) -> weakref.WeakValueDictionary:
+        shared = cls.__dict__.get('_pm_shared')
+        if shared is None:
+            shared = weakref.WeakValueDictionary()
+            setattr(cls, '_pm_shared', shared)
+
+        return shared
+
+    def _share(self) -> Self:
+        """
+        Регистрирует неизменяемый объект, созданный без исходных данных
+        (from_values, pickle), среди общих объектов класса.
+        Возвращает общий объект с такими же данными, если он уже есть
+        """
+        data = self.as_dict(include_unknown=True)
+        self._pm_fingerprint = (self._data_fingerprint(data), self._pm_version)
+
+        return self._get_shared_objects().setdefault(repr(data), self)
+
+    def _check_writable(self):
+        if self.pm_read_only:
+            raise ReadOnlyMapper(f'{self.__class__} is read-only')
+
+    @staticmethod
+    def _data_fingerprint(data: Any) -> int:
+        """
+        Дешёвый отпечаток исходных данных.
+        repr вычисляется на C и одинаков для одинаковых json-подобных данных
+        (в том числе с учётом порядка ключей)
+        """
+        return hash(repr(data))
 
     def merge_property(self, prop_name: str, prop_value: Any):
         """
@@ -170,7 +663,7 @@ class PropertyMapperBase:
             if prop_value is None:
                 if self.__get_prop(prop_name) is not None:
                     # Поле было обнулено
-                    self.mark_changed(propagate=True)
+                    self._mark_field_changed(prop_name)
 
                 self.__set_prop(prop_name, None)
                 return
@@ -195,14 +688,30 @@ class PropertyMapperBase:
 
                     if self.__get_prop(prop_name) != result:
                         # Булево значение изменилось
-                        self.mark_changed(propagate=True)
+                        self._mark_field_changed(prop_name)
 
             elif is_list(prop_type):
+                old_value = self.__get_prop(prop_name)
                 result = self._merge_list(
                     prop_name=prop_name,
                     prop_value_list=prop_value,
                     list_type=get_types(prop_type)[0],
                 )
+
+                if prop_name in self._pm_changed_fields:
+                    self._record_item_changes(prop_name, old_value, result)
+
+            elif is_dict(prop_type):
+                old_value = self.__get_prop(prop_name)
+                result = self._merge_dict(
+                    prop_name=prop_name,
+                    prop_value_dict=prop_value,
+                    value_type=get_types(prop_type)[1],
+                )
+
+                if prop_name in self._pm_changed_fields:
+                    self._record_item_changes(prop_name, old_value, result)
+
             elif is_union(prop_type):
                 result = self._select_and_merge_type(
                     prop_name=prop_name,
@@ -216,21 +725,111 @@ class PropertyMapperBase:
 
             self.__set_prop(prop_name, result)
 
+    def _record_item_changes(self, prop_name: str, old_value: Optional[list | dict], new_value: list | dict):
+        """
+        Запоминает добавленные и заменённые элементы списка или словаря
+        (для iter_changes). Если элементы удалялись, изменённым считается весь контейнер
+        """
+        changes = self._container_item_changes(old_value, new_value)
+        if changes is not None and not changes:
+            return
+
+        changed_items = self.__dict__.get('_pm_changed_items')
+        if changed_items is None:
+            changed_items = self._pm_changed_items = {}
+
+        if prop_name not in changed_items or changes is None:
+            changed_items[prop_name] = changes
+        elif changed_items[prop_name] is not None:
+            changed_items[prop_name] |= changes
+
+    @staticmethod
+    def _container_item_changes(old_value: Optional[list | dict], new_value: list | dict) -> Optional[set]:
+        """
+        Индексы (ключи) новых и заменённых элементов.
+        None, если часть старых элементов удалена
+        """
+        if isinstance(new_value, dict):
+            old_items = old_value if isinstance(old_value, dict) else {}
+            if old_items.keys() - new_value.keys():
+                return None
+
+            new_items = new_value.items()
+        else:
+            old_items = old_value if isinstance(old_value, list) else []
+            if len(new_value) < len(old_items):
+                return None
+
+            old_items = dict(enumerate(old_items))
+            new_items = enumerate(new_value)
+
+        old_mappers = {id(item) for item in old_items.values() if isinstance(item, PropertyMapperBase)}
+        new_mappers = set()
+
+        changes = set()
+        for key, item in new_items:
+            if isinstance(item, PropertyMapperBase):
+                new_mappers.add(id(item))
+                if id(item) not in old_mappers:
+                    changes.add(key)
+            elif key not in old_items or old_items[key] != item:
+                changes.add(key)
+
+        if old_mappers - new_mappers:
+            return None
+
+        return changes
+
     def replace_data(self, other: 'PropertyMapperBase') -> Self:
         """
-        Заменяет своё содержимое содержимым переданного маппера
+        Заменяет своё содержимое содержимым переданного маппера.
+        Переносятся только значения полей и unknown_params: слушатели,
+        ссылки на родителя и прочее служебное состояние объекта сохраняются,
+        вложенные объекты переходят к этому объекту
         :param other:
         :return:
         """
         assert other.__class__ is self.__class__, (
             'Замена данных возможна только для объектов одного типа!'
         )
+        self._check_writable()
+
+        instance_dict = self.__dict__
+        other_dict = other.__dict__
+
+        _begin_operation()
+        try:
+            for prop_name in self._attrs_dict.keys():
+                # Помечаем все поля как изменённые (до замены - для событий)
+                self._mark_field_changed(prop_name)
+
+                key = f'_{prop_name}'
+                value = other_dict.get(key)
+                if value is None:
+                    instance_dict.pop(key, None)
+                    continue
+
+                instance_dict[key] = value
 
-        self.__dict__ = {}
-        self.__dict__.update(other.__dict__)
+                if isinstance(value, PropertyMapperBase):
+                    items = (value, )
+                elif isinstance(value, list):
+                    items = value
+                elif isinstance(value, dict):
+                    items = value.values()
+                else:
+                    continue
+
+                for item in items:
+                    if isinstance(item, PropertyMapperBase):
+                        item._attach(parent=self, attr_name=prop_name)
 
-        # Помечаем объект как изменённый
-        self.mark_changed()
+            self.unknown_params = dict(other.unknown_params)
+
+            # Отпечаток прежних данных больше не действителен
+            instance_dict.pop('_pm_fingerprint', None)
+        finally:
+            _end_operation()
 
         return self
 
@@ -241,31 +840,43 @@ class PropertyMapperBase:
         if name not in self._attrs_dict:
             raise AttributeError(f'{self.__class__} Unknown property "{name}"')
 
-        prop_type = self._attrs_dict[name]
-        if is_list(prop_type):
-            result = self._parse_list(
-                prop_name=name,
-                prop_value_list=value,
-                list_type=get_types(prop_type)[0]
-            )
-        elif is_union(prop_type):
-            result = self._select_type(
-                prop_name=name,
-                prop_value=value,
-                types_tuple=get_types(prop_type)
-            )
-        else:
-            result = self._try_create_object(
-                prop_name=name,
-                prop_type=prop_type,
-                prop_value=value,
-            )
+        self._check_writable()
+
+        _begin_operation()
+        try:
+            prop_type = self._attrs_dict[name]
+            if is_list(prop_type):
+                result = self._parse_list(
+                    prop_name=name,
+                    prop_value_list=value,
+                    list_type=get_types(prop_type)[0]
+                )
+            elif is_dict(prop_type):
+                result = self._parse_dict(
+                    prop_name=name,
+                    prop_value_dict=value,
+                    value_type=get_types(prop_type)[1]
+                )
+            elif is_union(prop_type):
+                result = self._select_type(
+                    prop_name=name,
+                    prop_value=value,
+                    types_tuple=get_types(prop_type)
+                )
+            else:
+                result = self._try_create_object(
+                    prop_name=name,
+                    prop_type=prop_type,
+                    prop_value=value,
+                )
 
-        old_prop = self.__get_prop(name)
-        if old_prop != result:
-            self.mark_changed()
+            old_prop = self.__get_prop(name)
+            if self._value_changed(old_prop, result):
+                self._mark_field_changed(name)
 
-        self.__set_prop(prop_name=name, prop_value=result)
+            self.__set_prop(prop_name=name, prop_value=result)
+        finally:
+            _end_operation()
 
     @classmethod
     def identify(cls, data: dict) -> bool:
@@ -333,11 +944,38 @@ class PropertyMapperBase:
         else:
             return self.is_compat(data)
 
+    @staticmethod
+    def _value_changed(old_value: Any, new_value: Any) -> bool:
+        """
+        Мапперы сравниваются по ссылке, остальные значения - по содержимому
+        """
+        if old_value is new_value:
+            return False
+
+        if isinstance(old_value, PropertyMapperBase) or isinstance(new_value, PropertyMapperBase):
+            return True
+
+        return old_value != new_value
+
     def __set_prop(self, prop_name, prop_value):
+        codecs = self._pm_field_codecs
+        if codecs and prop_value is not None:
+            codec = codecs.get(prop_name)
+            if codec is not None:
+                prop_value = codec[0](prop_value)
+
         setattr(self, f'_{prop_name}', prop_value)
 
     def __get_prop(self, prop_name):
-        return getattr(self, f'_{prop_name}', None)
+        value = getattr(self, f'_{prop_name}', None)
+
+        codecs = self._pm_field_codecs
+        if codecs and value is not None:
+            codec = codecs.get(prop_name)
+            if codec is not None:
+                return codec[1](value)
+
+        return value
 
     def _merge_unknown(self, prop_name: str, prop_value: Any):
         """
@@ -354,16 +992,17 @@ class PropertyMapperBase:
             if isinstance(old_value, dict):
                 new_value = merge_dicts(prop_value, old_value.copy())
 
-        self.unknown_params[prop_name] = new_value
-
         if old_value != new_value:
             # Словарь изменился
-            self.mark_changed()
+            self._mark_field_changed(prop_name)
+
+        self.unknown_params[prop_name] = new_value
 
     def _find_and_merge_object_in_list(self,
                                        obj_list: list,
                                        prop_type: Type['PropertyMapperBase'],
-                                       data: dict) -> Optional['PropertyMapperBase']:
+                                       data: dict,
+                                       prop_name: str = None) -> Optional['PropertyMapperBase']:
         """
         Ищет в переданном списке объектов подходящие по типу
         И если находит совместимый, сливает данные с ним
@@ -375,14 +1014,19 @@ class PropertyMapperBase:
         :return:
         """
 
-        exist_objects = [obj for obj in obj_list if isinstance(obj, prop_type)]
-
-        for obj in exist_objects:
-            if obj.is_equal_or_compat(data):
+        for index, obj in enumerate(obj_list):
+            if isinstance(obj, prop_type) and obj.is_equal_or_compat(data):
+                version = obj._pm_version
                 result = obj.merge_data(data)
-                obj_list.remove(obj)
-
-                if result.is_changed:
+                # Удаляем по индексу: сравнение мапперов через == здесь неприменимо
+                del obj_list[index]
+
+                if result is not obj:
+                    # Неизменяемый объект заменён другим
+                    self._mark_field_changed(prop_name)
+                elif result._pm_version != version:
+                    # Флаг is_changed остаётся от прежних изменений,
+                    # поэтому изменение при этом слиянии определяется по версии
                     self.mark_changed()
 
                 return result
@@ -392,28 +1036,31 @@ class PropertyMapperBase:
     def _find_and_merge_type_in_list(self,
                                      obj_list: list,
                                      prop_type: Type['PropertyMapperType'],
-                                     value: Any) -> Optional['PropertyMapperType']:
+                                     value: Any,
+                                     prop_name: str = None) -> Optional['PropertyMapperType']:
         """
         Ищет в списке указанный тип
+        :param prop_name: имя поля-списка
         :param obj_list:
         :param prop_type:
         :param value:
         :return:
         """
-        exist_objects = [obj for obj in obj_list if isinstance(obj, prop_type)]
+        for index, obj in enumerate(obj_list):
+            if not isinstance(obj, prop_type):
+                continue
 
-        for obj in exist_objects:
             try:
 
                 result = obj.replace(value)
-                obj_list.remove(obj)
+                del obj_list[index]
 
                 if result.is_changed:
-                    self.mark_changed()
+                    self._mark_field_changed(prop_name)
 
                 return result
 
-            except UnsupportedType:
+            except (TypeError, ValueError, UnsupportedType):
                 continue
 
     def _merge_list(self,
@@ -437,15 +1084,35 @@ class PropertyMapperBase:
         else:
             types_tuple = (list_type,)
 
+            items = self._parse_many(list_type, prop_value_list)
+            if items is not None:
+                existing_items = self.__get_prop(prop_name) or []
+                existing_count = len(existing_items)
+                changed = existing_count != len(items)
+
+                for index, item in enumerate(items):
+                    if index >= existing_count or item != existing_items[index]:
+                        # Как при замене элемента через replace.
+                        # Значения некоторых типов (Any) не оборачиваются
+                        if isinstance(item, PropertyMapperType):
+                            item.mark_changed()
+                        changed = True
+
+                if changed:
+                    self._mark_field_changed(prop_name)
+
+                return items
+
         items = []
-        existing_items = getattr(self, f'_{prop_name}', [])
+        # Копия: найденные элементы удаляются из списка кандидатов
+        existing_items = list(self.__get_prop(prop_name) or [])
 
         for received_item in prop_value_list:
 
             for prop_type in types_tuple:
 
-                if isinstance(prop_value_list, prop_type):
-                    items.append(prop_value_list)
+                if isinstance(received_item, prop_type):
+                    items.append(received_item)
                     break
 
                 elif issubclass(prop_type, PropertyMapperBase):
@@ -453,6 +1120,7 @@ class PropertyMapperBase:
                         obj_list=existing_items,
                         prop_type=prop_type,
                         data=received_item,
+                        prop_name=prop_name,
                     )
 
                     if merged_item is not None:
@@ -468,7 +1136,7 @@ class PropertyMapperBase:
                             ))
 
                             # Создали новый объект, значит, изменились
-                            self.mark_changed(propagate=True)
+                            self._mark_field_changed(prop_name)
                             break
                         else:
                             continue
@@ -477,6 +1145,7 @@ class PropertyMapperBase:
                         obj_list=existing_items,
                         prop_type=prop_type,
                         value=received_item,
+                        prop_name=prop_name,
                     )
 
                     if merged_item is not None:
@@ -484,22 +1153,87 @@ class PropertyMapperBase:
                         break
 
                     else:
-                        try:
-                            items.append(self._try_create_object(
-                                prop_name=prop_name,
-                                prop_type=prop_type,
-                                prop_value=prop_value_list,
-                            ))
+                        new_item = self._try_create_object(
+                            prop_name=prop_name,
+                            prop_type=prop_type,
+                            prop_value=received_item,
+                        )
+
+                        if new_item is not None:
+                            items.append(new_item)
 
                             # Создали новый объект, значит изменились
-                            self.mark_changed(propagate=True)
+                            self._mark_field_changed(prop_name)
                             break
-                        except UnsupportedType:
-                            continue
             else:
                 raise WrongType(
                     f'{self.__class__} Can not select property type for item: {prop_name} = {received_item}!')
 
+        if existing_items:
+            # Часть старых элементов не нашлась в новых данных
+            self._mark_field_changed(prop_name)
+
+        return items
+
+    def _merge_dict(self,
+                    prop_name: str,
+                    prop_value_dict: dict,
+                    value_type: type) -> dict:
+        """
+        Сливает словари значений по ключам.
+        Ключи, отсутствующие в новых данных, удаляются
+
+        :param prop_name:
+        :param prop_value_dict:
+        :param value_type:
+        :return:
+        """
+        if not isinstance(prop_value_dict, dict):
+            raise WrongType(f'{self.__class__} Wrong item type ({type(prop_value_dict)}) for property: {prop_name}.'
+                            f' Please check interface definition.')
+
+        if is_union(value_type):
+            types_tuple = get_types(value_type)
+        else:
+            types_tuple = (value_type,)
+
+        items = {}
+        existing_items = self.__get_prop(prop_name) or {}
+        changed = existing_items.keys() != prop_value_dict.keys()
+
+        for key, received_item in prop_value_dict.items():
+            old_item = existing_items.get(key, None)
+            result = None
+
+            if received_item is None:
+                pass
+
+            elif isinstance(old_item, PropertyMapperBase) and isinstance(received_item, dict):
+                if old_item.is_equal_or_compat(received_item):
+                    # Изменения вложенного маппера отмечаются им самим
+                    result = old_item.merge_data(received_item)
+
+            elif isinstance(old_item, PropertyMapperType):
+                try:
+                    result = old_item.replace(received_item)
+                except (TypeError, ValueError):
+                    pass
+
+            if result is None and received_item is not None:
+                result = self._select_type(
+                    prop_name=prop_name,
+                    prop_value=received_item,
+                    types_tuple=types_tuple,
+                )
+
+            if self._value_changed(old_item, result):
+                changed = True
+
+            items[key] = result
+
+        if changed:
+            self._mark_field_changed(prop_name)
+
         return items
 
     def _select_and_merge_type(self, prop_name: str, prop_value: Any, types_tuple: tuple):
@@ -530,23 +1264,132 @@ class PropertyMapperBase:
                             prop_type: type['PropertyMapperBase'],
                             prop_value: Any,
                             ):
+        if prop_type.pm_read_only:
+            return prop_type.get_shared(data=prop_value)
+
+        if prop_type.pm_identity_map:
+            return prop_type.get_or_create(
+                data=prop_value,
+                parent=self,
+                attr_name=prop_name,
+            )
+
         return prop_type(
             data=prop_value,
             parent=self,
             attr_name=prop_name,
         )
 
-    def _make_mapper_type(self,
-                          prop_name: str,
-                          prop_type: type[PropertyMapperType],
-                          prop_value: Any,
-                          raise_exception: bool = True
-                          ) -> Optional:
+    @classmethod
+    def get_or_create(cls, data: dict, parent: 'PropertyMapperBase' = None, attr_name: str = None) -> Self:
         """
-        Пробует создать инстанс для встроенного в property_maker типа
+        Возвращает объект с ключом из data из карты объектов класса,
+        слив его с data, либо создаёт новый и добавляет его в карту.
 
-        :param prop_type:
-        :param prop_value:
+        Общий объект может находиться в нескольких местах одного или разных деревьев.
+        Его изменения (в том числе от слияния с data) отмечаются во всех этих местах:
+        статус, версии, изменённые поля и события слушателей.
+        get_parent, get_root и get_path возвращают последнее место размещения.
+        Создаваемый сейчас новый родитель изменённым не считается
+
+        :param data:
+        :param parent:
+        :param attr_name:
+        :return:
+        """
+        identity_map = cls._get_identity_map()
+        key = None
+        if identity_map is not None and cls.pm_key_field and isinstance(data, dict):
+            key = data.get(cls.pm_key_field)
+
+        if key is None:
+            return cls(data=data, parent=parent, attr_name=attr_name)
+
+        obj = identity_map.get(key)
+        if obj is None:
+            obj = cls(data=data, parent=parent, attr_name=attr_name)
+            identity_map.put(key, obj)
+            return obj
+
+        obj = obj.merge_data(data)
+        obj._add_owner(parent=parent, attr_name=attr_name)
+
+        return obj
+
+    def _add_owner(self, parent: Optional['PropertyMapperBase'], attr_name: Optional[str]):
+        """
+        Помещает общий объект в поле attr_name родителя parent,
+        сохраняя прежнее место размещения среди остальных
+        """
+        old_parent = self._parent()
+        if old_parent is not None and (old_parent is not parent or self._pm_private_attr_name != attr_name):
+            owners = [
+                (owner_ref, owner_attr)
+                for owner_ref, owner_attr in self._pm_private_owners
+                if owner_ref() is not parent or owner_attr != attr_name
+            ]
+            owners.append((self._pm_private_parent, self._pm_private_attr_name))
+            self._pm_private_owners = owners
+
+        self._attach(parent=parent, attr_name=attr_name)
+
+    def _extra_owners(self) -> list[tuple['PropertyMapperBase', str]]:
+        """
+        Прочие места размещения общего объекта: [(родитель, поле), ...].
+        Удалённые родители и поля, в которых объекта больше нет, забываются
+        """
+        owners = []
+        owner_refs = []
+        for owner_ref, attr_name in self._pm_private_owners:
+            owner = owner_ref()
+            if owner is not None and owner._holds(attr_name, self):
+                owners.append((owner, attr_name))
+                owner_refs.append((owner_ref, attr_name))
+
+        if len(owner_refs) != len(self._pm_private_owners):
+            self._pm_private_owners = owner_refs
+
+        return owners
+
+    def _holds(self, prop_name: str, item: 'PropertyMapperBase') -> bool:
+        value = getattr(self, f'_{prop_name}', None)
+
+        if isinstance(value, list):
+            return any(element is item for element in value)
+        elif isinstance(value, dict):
+            return any(element is item for element in value.values())
+
+        return value is item
+
+    @classmethod
+    def _get_identity_map(cls) -> Optional[IdentityMap]:
+        if not cls.pm_identity_map:
+            return None
+
+        identity_map = cls.__dict__.get('_pm_identity_map')
+        if identity_map is None:
+            identity_map = IdentityMap(cls.pm_identity_map)
+            setattr(cls, '_pm_identity_map', identity_map)
+
+        return identity_map
+
+    @classmethod
+    def clear_identity_map(cls):
+        identity_map = cls.__dict__.get('_pm_identity_map')
+        if identity_map is not None:
+            identity_map.clear()
+
+    def _make_mapper_type(self,
+                          prop_name: str,
+                          prop_type: type[PropertyMapperType],
+                          prop_value: Any,
+                          raise_exception: bool = True
+                          ) -> Optional:
+        """
+        Пробует создать инстанс для встроенного в property_maker типа
+
+        :param prop_type:
+        :param prop_value:
         :return:
         """
 
@@ -576,7 +1419,7 @@ class PropertyMapperBase:
             Пока только bool
             """
             if old_value != prop_value:
-                self.mark_changed(propagate=True)
+                self._mark_field_changed(prop_name)
 
             return prop_value
 
@@ -589,14 +1432,19 @@ class PropertyMapperBase:
             if isinstance(old_value, PropertyMapperBase):
 
                 if old_value.is_equal_or_compat(prop_value):
+                    version = old_value._pm_version
                     result = old_value.merge_data(prop_value)
-                    if result.is_changed:
+                    if result is not old_value:
+                        # Неизменяемый объект заменён другим
+                        self._mark_field_changed(prop_name)
+                    elif result._pm_version != version:
+                        # Вложенный объект изменился при этом слиянии
                         self.mark_changed(propagate=True)
 
                     return result
 
             elif prop_type.is_compat(prop_value):
-                self.mark_changed(propagate=True)
+                self._mark_field_changed(prop_name)
 
                 return self._make_mapper_object(
                     prop_name=prop_name,
@@ -612,24 +1460,29 @@ class PropertyMapperBase:
 
             old_value = self.__get_prop(prop_name)
 
-            if isinstance(old_value, PropertyMapperType):
+            if isinstance(old_value, prop_type):
                 try:
                     result = old_value.replace(prop_value)
-                    if result.is_changed:
-                        self.mark_changed(propagate=True)
+                    if result is not None:
+                        if result.is_changed:
+                            self._mark_field_changed(prop_name)
 
-                    return result
-                except UnsupportedType:
+                        return result
+                except (TypeError, ValueError, UnsupportedType):
                     pass
 
-            self.mark_changed(propagate=True)
-            return self._make_mapper_type(
+            result = self._make_mapper_type(
                 prop_name=prop_name,
                 prop_type=prop_type,
                 prop_value=prop_value,
                 raise_exception=False,
             )
 
+            if result is not None:
+                self._mark_field_changed(prop_name)
+
+            return result
+
     def _try_merge_type(self, prop_name: str, prop_type: type[PropertyMapperType],
                         prop_value: Any) -> PropertyMapperType:
         result = None
@@ -661,10 +1514,10 @@ class PropertyMapperBase:
                 """
                 Вложенный тип изменился
                 """
-                self.mark_changed(propagate=True)
+                self._mark_field_changed(prop_name)
 
-        if result != old_value:
-            self.mark_changed(propagate=True)
+        elif result != old_value:
+            self._mark_field_changed(prop_name)
 
         return result
 
@@ -736,6 +1589,10 @@ class PropertyMapperBase:
         else:
             types_tuple = (list_type,)
 
+            items = self._parse_many(list_type, prop_value_list)
+            if items is not None:
+                return items
+
         items = []
         for item in prop_value_list:
             result = self._select_type(
@@ -753,56 +1610,114 @@ class PropertyMapperBase:
 
         return items
 
+    @staticmethod
+    def _parse_many(list_type: type, prop_value_list: Union[list, tuple]) -> Optional[list]:
+        """
+        Пакетное преобразование списка значений одного встроенного типа.
+        Возвращает None, если тип не подходит хотя бы для одного значения:
+        тогда список разбирается поэлементно (с подробной ошибкой)
+        """
+        if not inspect.isclass(list_type) or not issubclass(list_type, PropertyMapperType):
+            return None
+
+        try:
+            return list_type.parse_many(prop_value_list)
+        except (TypeError, ValueError, UnsupportedType):
+            return None
+
+    def _parse_dict(self,
+                    prop_name: str,
+                    prop_value_dict: dict,
+                    value_type: type) -> dict:
+
+        if not isinstance(prop_value_dict, dict):
+            raise WrongType(f'{self.__class__} Wrong item type ({type(prop_value_dict)}) for property: {prop_name}.'
+                            f' Please check interface definition.')
+
+        if is_union(value_type):
+            types_tuple = get_types(value_type)
+        else:
+            types_tuple = (value_type,)
+
+        items = {}
+        for key, item in prop_value_dict.items():
+            if item is None:
+                items[key] = None
+                continue
+
+            items[key] = self._select_type(
+                prop_name=prop_name,
+                prop_value=item,
+                types_tuple=types_tuple,
+            )
+
+        return items
+
     def _parse_json_data(self, data: dict):
         for prop_name, prop_value in data.items():
-            if prop_name not in self._attrs_dict:
-                self.unknown_params[prop_name] = prop_value
+            self._parse_property(
+                prop_name=prop_name,
+                prop_value=prop_value,
+            )
 
-            else:
-                if prop_value is None:
-                    self.__set_prop(prop_name, None)
-                    continue
+    def _parse_property(self, prop_name: str, prop_value: Any):
+        """
+        Преобразует и устанавливает значение одного атрибута
+        """
+        if prop_name not in self._attrs_dict:
+            self.unknown_params[prop_name] = prop_value
+            return
 
-                prop_type = self._attrs_dict[prop_name]
-                result = None
+        if prop_value is None:
+            self.__set_prop(prop_name, None)
+            return
 
-                if inspect.isclass(prop_type):
-                    if issubclass(prop_type, PropertyMapperType):
-                        result = self._make_mapper_type(
-                            prop_name=prop_name,
-                            prop_type=prop_type,
-                            prop_value=prop_value,
-                        )
+        prop_type = self._attrs_dict[prop_name]
+        result = None
 
-                    elif issubclass(prop_type, PropertyMapperBase):
-                        result = self._make_mapper_object(
-                            prop_name=prop_name,
-                            prop_type=prop_type,
-                            prop_value=prop_value,
-                        )
-                    elif prop_type is bool:
-                        result = bool(prop_value)
+        if inspect.isclass(prop_type):
+            if issubclass(prop_type, PropertyMapperType):
+                result = self._make_mapper_type(
+                    prop_name=prop_name,
+                    prop_type=prop_type,
+                    prop_value=prop_value,
+                )
 
-                else:
-                    if is_list(prop_type):
-                        result = self._parse_list(
-                            prop_name=prop_name,
-                            prop_value_list=prop_value,
-                            list_type=get_types(prop_type)[0],
-                        )
-                    elif is_union(prop_type):
+            elif issubclass(prop_type, PropertyMapperBase):
+                result = self._make_mapper_object(
+                    prop_name=prop_name,
+                    prop_type=prop_type,
+                    prop_value=prop_value,
+                )
+            elif prop_type is bool:
+                result = bool(prop_value)
 
-                        result = self._select_type(
-                            prop_name=prop_name,
-                            prop_value=prop_value,
-                            types_tuple=get_types(prop_type),
-                        )
+        else:
+            if is_list(prop_type):
+                result = self._parse_list(
+                    prop_name=prop_name,
+                    prop_value_list=prop_value,
+                    list_type=get_types(prop_type)[0],
+                )
+            elif is_dict(prop_type):
+                result = self._parse_dict(
+                    prop_name=prop_name,
+                    prop_value_dict=prop_value,
+                    value_type=get_types(prop_type)[1],
+                )
+            elif is_union(prop_type):
+
+                result = self._select_type(
+                    prop_name=prop_name,
+                    prop_value=prop_value,
+                    types_tuple=get_types(prop_type),
+                )
 
-                if result is None:
-                    raise ValueError(f'{self.__class__} Unexpected result value'
-                                     f' for item: {prop_name} = {prop_value}.')
+        if result is None:
+            raise ValueError(f'{self.__class__} Unexpected result value'
+                             f' for item: {prop_name} = {prop_value}.')
 
-                self.__set_prop(prop_name, result)
+        self.__set_prop(prop_name, result)
 
     def add_property(self,
                      prop_name: str,
@@ -819,50 +1734,48 @@ class PropertyMapperBase:
                        prop_data: dict[str, tuple[type[Union['PropertyMapper', PropertyMapperType, bool]], Any]],
                        initial: bool = False,
                        ) -> 'PropertyMapperBase':
+        """
+        Добавляет объекту новые свойства.
+        Возвращает сам объект, класс которого заменён на динамический наследник
 
+        :param prop_data: словарь {имя свойства: (тип, значение)}
+        :param initial: True только при создании объекта (объект не метится, как изменённый)
+        :return:
+        """
         # Если передан пустой словарь, ничего не делаем
         if not prop_data:
             return self
 
+        if not initial:
+            self._check_writable()
+
         for prop_name in prop_data.keys():
             if prop_name in self._attrs_dict:
                 raise KeyError(f'Property "{prop_name}" already exists!')
 
-        attrs_dict = self._attrs_dict.copy()
-        data = self.as_dict()
-
-        self.__class__._subclass_counter += 1
-        new_class: type[PropertyMapperBase] = type(
-            f'{self.__class__.__name__}',
-            (self.__class__,),
-            {},
-        )
-
-        for prop_name, (prop_type, prop_value) in prop_data.items():
-            attrs_dict[prop_name] = prop_type
-            data[prop_name] = prop_value
-
-            setattr(new_class, prop_name, property(make_property(prop_name)))
-
-        new_class._attrs_dict = attrs_dict
-
-        parent: PropertyMapperBase = getattr(self, '_pm_private_parent', None)
-        attr_name: str = getattr(self, '_pm_private_attr_name', None)
-
-        result = new_class(
-            data=data,
-            parent=parent,
-            attr_name=attr_name,
-        )
+        _begin_operation()
+        try:
+            # Класс заменяется на месте: уже преобразованные значения,
+            # ссылки на родителя и вложенные объекты остаются как есть
+            self.__class__ = get_dynamic_class(
+                base=self.__class__,
+                props={prop_name: prop_type for prop_name, (prop_type, _) in prop_data.items()},
+            )
 
-        # Заменяем объект в иерархии
-        if parent and attr_name:
-            parent.__set_prop(attr_name, result)
+            # Преобразуем только новые поля
+            for prop_name, (_, prop_value) in prop_data.items():
+                if not initial:
+                    self._mark_field_changed(prop_name)
 
-        if not initial:
-            result.mark_changed(propagate=True)
+                self.unknown_params.pop(prop_name, None)
+                self._parse_property(
+                    prop_name=prop_name,
+                    prop_value=prop_value,
+                )
+        finally:
+            _end_operation()
 
-        return result
+        return self
 
     def remove_property(self, prop_name: str):
         if prop_name not in self._attrs_dict:
@@ -878,66 +1791,235 @@ class PropertyMapperBase:
         :param new_parent:
         :return:
         """
-        self._pm_private_parent = new_parent
-        self._pm_private_root = new_parent.get_root()
+        self._pm_private_parent = weakref.ref(new_parent)
+        self._pm_private_root = weakref.ref(new_parent.get_root())
+
+    def _parent(self) -> Optional['PropertyMapperBase']:
+        """
+        Родитель или None, если его нет (или он уже удалён)
+        """
+        parent_ref = self._pm_private_parent
+        if parent_ref is None:
+            return None
+
+        return parent_ref()
 
     def get_parent(self) -> 'PropertyMapperBase':
-        if hasattr(self, '_pm_private_parent'):
-            return self._pm_private_parent
-        else:
-            # Если у нас нет родителя, то корнем тоже являемся мы сами
-            self._pm_private_root = self
+        """
+        Возвращает ссылку на родителя.
+        Если родителя нет, объект является корнем, - возвращает ссылку на самого себя.
+        Родитель не удерживается потомком: после удаления всех ссылок
+        на дерево выше объекта объект становится корнем
+        :return:
+        """
+        parent = self._parent()
+        if parent is None:
             return self
 
+        return parent
+
     def get_root(self) -> 'PropertyMapperBase':
         """
         Возвращает ссылку на высший объект в иерархии.
         Если ссылка пустая, значит это и есть корень, - возвращает ссылку на самого себя
         :return:
         """
-        if not hasattr(self, '_pm_private_root'):
-            self._pm_private_root = self.get_parent().get_root()
+        root_ref = self._pm_private_root
+        root = root_ref() if root_ref is not None else None
 
-        return self._pm_private_root
+        if root is None:
+            parent = self._parent()
+            if parent is None:
+                return self
 
-    def as_dict(self, include_unknown=False, keys: list[str] = None) -> dict:
+            root = parent.get_root()
+            self._pm_private_root = weakref.ref(root)
+
+        return root
+
+    def _attach(self, parent: Optional['PropertyMapperBase'], attr_name: Optional[str]):
+        """
+        Помещает объект в поле attr_name родителя parent
+        (в том числе из другого места или другого дерева)
+        """
+        if self.pm_read_only:
+            return
+
+        if self._parent() is not parent or self._pm_private_attr_name != attr_name:
+            self._reset_root()
+            self._pm_private_parent = weakref.ref(parent) if parent is not None else None
+            self._pm_private_attr_name = attr_name
+
+    def _reset_root(self):
+        """
+        Сбрасывает закэшированную ссылку на корень у объекта и его потомков
+        (после перемещения объекта в другое дерево)
+        """
+        if self.__dict__.pop('_pm_private_root', None) is None and self._pm_private_parent is not None:
+            # Кэш не заполнялся, значит, и у потомков его нет
+            return
+
+        for prop_name in self._attrs_dict.keys():
+            value = self.__get_prop(prop_name)
+
+            if isinstance(value, PropertyMapperBase):
+                items = (value, )
+            elif isinstance(value, list):
+                items = value
+            elif isinstance(value, dict):
+                items = value.values()
+            else:
+                continue
+
+            for item in items:
+                if isinstance(item, PropertyMapperBase) and item._parent() is self:
+                    item._reset_root()
+
+    def as_dict(self, include_unknown=False, keys: list[str] = None, changed_only: bool = False) -> dict:
         """
         Преобразует объект обратно в словарь
         :param include_unknown: включить в словарь неопознанные поля
         :param keys: включить в словарь только указанные поля
+        :param changed_only: включить в словарь только изменённые поля.
+            Изменённые вложенные мапперы также содержат только изменённые поля,
+            обнулённые поля передаются как None
         :return:
         """
+        if self.pm_cache_dict and not keys and not changed_only:
+            return self._cached_dict(include_unknown=include_unknown)
+
+        return self._build_dict(include_unknown=include_unknown, keys=keys, changed_only=changed_only)
 
+    def _build_dict(self,
+                    include_unknown: bool,
+                    keys: list[str] = None,
+                    changed_only: bool = False,
+                    frozen: bool = False) -> dict:
+        """
+        :param frozen: результат кэшируется - кэшированные словари
+            вложенных объектов используются как есть, без копирования
+        """
         result = dict()
         for attr in self._attrs_dict.keys():
             if keys and attr not in keys:
                 continue
 
+            if changed_only and attr not in self._pm_changed_fields:
+                continue
+
             value = getattr(self, attr, None)
             if value is None:
+                if changed_only:
+                    result[attr] = None
                 continue
 
-            if isinstance(value, PropertyMapperBase):
-                value = value.as_dict(include_unknown=include_unknown)
-
-            elif isinstance(value, PropertyMapperType):
-                value = value.reverse()
+            if changed_only and isinstance(value, PropertyMapperBase) and value._pm_changed_fields:
+                value = value.as_dict(include_unknown=include_unknown, changed_only=True)
 
             elif isinstance(value, list):
-                items = []
-                for item in value:
-                    if isinstance(item, PropertyMapperBase):
-                        item = item.as_dict(include_unknown=include_unknown)
-                    elif isinstance(item, PropertyMapperType):
-                        item = item.reverse()
+                value = [self._reverse_value(item, include_unknown=include_unknown, frozen=frozen) for item in value]
 
-                    items.append(item)
-                value = items
+            elif isinstance(value, dict):
+                value = {
+                    key: self._reverse_value(item, include_unknown=include_unknown, frozen=frozen)
+                    for key, item in value.items()
+                }
+
+            else:
+                value = self._reverse_value(value, include_unknown=include_unknown, frozen=frozen)
 
             result[attr] = value
 
         return result
 
+    def _cached_dict(self, include_unknown: bool) -> FrozenDict:
+        """
+        Полный as_dict() из кэша.
+
+        Любое изменение объекта или его потомков обновляет версию всех
+        предков (mark_changed), поэтому кэш проверяется по версии,
+        а после небольшого изменения заново строится только путь от
+        изменённого поля до корня - вложенные кэшированные словари
+        используются повторно. Результат неизменяем
+        """
+        cache = self._pm_dict_cache
+        if cache is not None and cache[0] == self._pm_version and cache[1] == include_unknown:
+            return cache[2]
+
+        result = FrozenDict(
+            (attr, self._freeze_value(value, include_unknown=include_unknown))
+            for attr, value in self._build_dict(include_unknown=include_unknown, frozen=True).items()
+        )
+
+        # Внутри операции версия предков уже могла быть обновлена
+        # этой же эпохой, поэтому промежуточный результат не кэшируем
+        if not _operations.level:
+            self._pm_dict_cache = (self._pm_version, include_unknown, result)
+
+        return result
+
+    @staticmethod
+    def _freeze_value(value: Any, include_unknown: bool) -> Any:
+        if isinstance(value, FrozenDict | FrozenList):
+            return value
+        elif isinstance(value, dict):
+            return FrozenDict(
+                (key, PropertyMapperBase._freeze_value(item, include_unknown=include_unknown))
+                for key, item in value.items()
+            )
+        elif isinstance(value, list):
+            return FrozenList(
+                PropertyMapperBase._freeze_value(item, include_unknown=include_unknown)
+                for item in value
+            )
+
+        return value
+
+    @staticmethod
+    def _reverse_value(value: Any, include_unknown: bool = False, frozen: bool = False) -> Any:
+        """
+        Преобразует одно значение обратно в исходный вид.
+        Кэшированный результат вложенного объекта копируется, если frozen не задан
+        """
+        if isinstance(value, PropertyMapperBase):
+            result = value.as_dict(include_unknown=include_unknown)
+            if not frozen and isinstance(result, FrozenDict):
+                result = thaw(result)
+
+            return result
+
+        elif isinstance(value, PropertyMapperType):
+            return value.reverse()
+
+        return value
+
+    def memory_report(self) -> dict:
+        """
+        Отчёт о памяти, удерживаемой деревом с корнем в этом объекте.
+        Формат описан в property_mapper.memory.memory_report
+        """
+        from .memory import memory_report
+
+        return memory_report(self)
+
+    def to_bytes(self) -> bytes:
+        """
+        Дерево с корнем в этом объекте в двоичном формате.
+        Формат описан в property_mapper.binary
+        """
+        from .binary import to_bytes
+
+        return to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes | bytearray | memoryview) -> Self:
+        """
+        Восстанавливает объект из результата to_bytes()
+        """
+        from .binary import from_bytes
+
+        return from_bytes(cls, buf)
+
     def get_path(self) -> str:
         path = [self._pm_private_attr_name or self.__class__.__name__]
         last_parent = self
@@ -949,6 +2031,89 @@ class PropertyMapperBase:
 
         return '->'.join(path)
 
+    def changed_fields(self) -> set[str]:
+        """
+        Имена полей, изменённых с момента создания или последнего сброса (mark_original)
+        """
+        return set(self._pm_changed_fields)
+
+    def iter_changes(self) -> Iterator[str]:
+        """
+        Перебирает пути (через точку) изменённых листьев дерева.
+
+        Для изменённых вложенных мапперов возвращаются пути их изменённых полей,
+        для элементов списков и словарей - путь с индексом или ключом элемента.
+        Если вложенные объекты не менялись (например, объект был заменён новым),
+        возвращается путь самого поля
+        """
+        changed_fields = self._pm_changed_fields
+        if not changed_fields:
+            return
+
+        changed_items = self._pm_changed_items
+
+        for prop_name in self._attrs_dict.keys():
+            if prop_name in changed_fields:
+                yield from self._iter_value_changes(
+                    prop_name,
+                    self.__get_prop(prop_name),
+                    changed_items.get(prop_name, ()),
+                )
+
+        for prop_name in changed_fields:
+            if prop_name not in self._attrs_dict:
+                # Неизвестные поля
+                yield prop_name
+
+    @staticmethod
+    def _iter_value_changes(path: str, value: Any, changed_items: Optional[set] = ()) -> Iterator[str]:
+        """
+        :param changed_items: добавленные или заменённые элементы контейнера,
+            None - изменён весь контейнер (см. _record_item_changes)
+        """
+        if isinstance(value, PropertyMapperBase):
+            items = ((None, value),)
+        elif isinstance(value, list):
+            items = enumerate(value)
+        elif isinstance(value, dict):
+            items = value.items()
+        else:
+            items = ()
+
+        has_nested = False
+        new_paths = []
+        for key, item in items:
+            if changed_items and key in changed_items:
+                new_paths.append(f'{path}.{key}')
+
+            elif isinstance(item, PropertyMapperBase) and item._pm_changed_fields:
+                item_path = path if key is None else f'{path}.{key}'
+
+                for sub_path in item.iter_changes():
+                    has_nested = True
+                    yield f'{item_path}.{sub_path}'
+
+        if not has_nested or changed_items is None:
+            # Изменения только в самом контейнере (или элементы удалялись)
+            yield path
+        else:
+            yield from new_paths
+
+    @property
+    def version(self) -> int:
+        """
+        Версия объекта.
+        Монотонно растёт при изменении объекта или любого из его потомков
+        (merge_data, replace_property, add_properties) и не сбрасывается mark_original
+        """
+        return self._pm_version
+
+    def changed_since(self, version: int) -> bool:
+        """
+        Изменялся ли объект или его потомки после получения версии version
+        """
+        return self._pm_version > version
+
     @property
     def is_changed(self) -> bool:
         """
@@ -960,23 +2125,292 @@ class PropertyMapperBase:
         """
         Принудительно помечает объект изменённым
         """
+        if not _operations.level:
+            # Изменение вне операции - отдельная эпоха
+            PropertyMapperBase._pm_epoch += 1
+
+        epoch = PropertyMapperBase._pm_epoch
+
         self._pm_status_changed = True
+        self._pm_version = epoch
 
         if propagate:
-            """
-            При необходимости помечаем всё древо, как изменённое
-            """
+            self._propagate_change(epoch)
+
+    def _propagate_change(self, epoch: int):
+        """
+        Помечает всё древо, как изменённое.
+
+        Подъём останавливается на первом объекте, от которого изменения
+        уже распространялись в текущей эпохе: все его предки уже помечены.
+        Поэтому k изменений на глубине d стоят O(k + d), а не O(k * d)
+        """
+        node = self
+        while node._pm_private_propagated != epoch:
+            node._pm_status_changed = True
+            node._pm_private_propagated = epoch
+            node._pm_version = epoch
+
+            if node._pm_private_owners:
+                # Общий объект изменился во всех местах размещения
+                for owner, attr_name in node._extra_owners():
+                    owner._child_changed(attr_name, epoch)
+
+            parent_ref = node._pm_private_parent
+            if parent_ref is None:
+                break
+
+            parent = parent_ref()
+            if parent is None:
+                break
+
+            # Поле родителя, в котором находится объект, тоже изменилось
+            if not parent._child_changed(node._pm_private_attr_name, epoch, propagate=False):
+                break
+
+            node = parent
+
+    def _child_changed(self, attr_name: Optional[str], epoch: int, propagate: bool = True) -> bool:
+        """
+        Отмечает изменение вложенного объекта в поле attr_name.
+        Создаваемый объект изменённым не считается (возвращается False)
+        """
+        if self._pm_private_building:
+            return False
+
+        if attr_name is not None:
+            changed_fields = self._pm_changed_fields
+            if not changed_fields:
+                changed_fields = self._pm_changed_fields = set()
+
+            changed_fields.add(attr_name)
+
+        if propagate:
+            self._propagate_change(epoch)
+
+        return True
+
+    def _mark_field_changed(self, prop_name: str):
+        """
+        Помечает поле изменённым и распространяет изменение по дереву
+        """
+        changed_fields = self._pm_changed_fields
+        if not changed_fields:
+            changed_fields = self._pm_changed_fields = set()
+
+        changed_fields.add(prop_name)
+
+        self.mark_changed(propagate=True)
+
+        if PropertyMapperBase._pm_listeners_count:
+            self._add_pending_change(prop_name)
+
+    def _add_pending_change(self, prop_name: str):
+        """
+        Запоминает старое значение поля до конца операции.
+        Новое значение берётся из объекта при рассылке событий
+        """
+        pending = _operations.pending
+        if pending is None:
+            pending = _operations.pending = {}
+
+        key = (id(self), prop_name)
+        if key not in pending:
+            if prop_name in self._attrs_dict:
+                old_value = self.__get_prop(prop_name)
+            else:
+                old_value = self.unknown_params.get(prop_name, None)
+
+            pending[key] = (self, prop_name, old_value)
+
+        if not _operations.level:
+            # Изменение вне операции рассылается сразу
+            _operations.pending = None
+            PropertyMapperBase._dispatch_changes(pending.values())
+
+    def add_listener(self, callback: Callable[[list[ChangeEvent]], Any], path: str = None):
+        """
+        Подписывает callback на изменения объекта и его потомков.
+
+        callback вызывается один раз по завершении операции изменения
+        (merge_data, replace_property, add_properties) со списком событий ChangeEvent(path, old, new).
+        Пути указываются относительно этого объекта
+
+        :param callback:
+        :param path: получать только изменения по указанному пути (через точку) и вложенным в него
+        :return:
+        """
+        listeners = self.__dict__.get('_pm_listeners')
+        if listeners is None:
+            listeners = self._pm_listeners = []
+
+            # Слушатели удалённого объекта больше не учитываются
+            weakref.finalize(self, _release_listeners, listeners).atexit = False
+
+        listeners.append((callback, path))
+        PropertyMapperBase._pm_listeners_count += 1
+
+    def remove_listener(self, callback: Callable[[list[ChangeEvent]], Any], path: str = None):
+        if (callback, path) not in self._pm_listeners:
+            raise ValueError(f'{self.__class__} Listener {callback} is not registered')
 
-            parent = self.get_parent()
-            if parent is not self:
-                parent.mark_changed(propagate=propagate)
+        self._pm_listeners.remove((callback, path))
+        PropertyMapperBase._pm_listeners_count -= 1
+
+    @classmethod
+    def add_class_listener(cls, callback: Callable[[list[ChangeEvent]], Any]):
+        """
+        Подписывает callback на изменения всех объектов класса (и наследников) и их потомков.
+        Пути указываются относительно объекта класса
+        """
+        listeners = cls.__dict__.get('_pm_class_listeners')
+        if listeners is None:
+            listeners = cls._pm_class_listeners = []
+
+        listeners.append(callback)
+        PropertyMapperBase._pm_listeners_count += 1
+
+    @classmethod
+    def remove_class_listener(cls, callback: Callable[[list[ChangeEvent]], Any]):
+        cls.__dict__.get('_pm_class_listeners', []).remove(callback)
+        PropertyMapperBase._pm_listeners_count -= 1
+
+    @staticmethod
+    def _dispatch_changes(changes):
+        """
+        Рассылает накопленные за операцию изменения слушателям
+        """
+        batches = {}
+
+        for node, prop_name, old_value in changes:
+            if prop_name in node._attrs_dict:
+                new_value = node.__get_prop(prop_name)
+            else:
+                new_value = node.unknown_params.get(prop_name, None)
+
+            # Общий объект (pm_identity_map) может находиться в нескольких местах,
+            # поэтому обходятся все пути до корней, каждый предок - один раз
+            stack = [(node, [prop_name])]
+            seen = set()
+
+            while stack:
+                node, path = stack.pop()
+                if id(node) in seen:
+                    continue
+
+                seen.add(id(node))
+                relative_path = '.'.join(reversed(path))
+
+                for callback, listener_path in node._pm_listeners:
+                    if listener_path is None or listener_path == relative_path \
+                            or relative_path.startswith(f'{listener_path}.'):
+                        batches.setdefault(callback, []).append(ChangeEvent(relative_path, old_value, new_value))
+
+                for klass in node.__class__.__mro__:
+                    for callback in klass.__dict__.get('_pm_class_listeners', ()):
+                        batches.setdefault(callback, []).append(ChangeEvent(relative_path, old_value, new_value))
+
+                owners = node._extra_owners() if node._pm_private_owners else []
+
+                parent = node._parent()
+                if parent is not None:
+                    owners.append((parent, node._pm_private_attr_name))
+
+                for parent, attr_name in owners:
+                    container = parent.__get_prop(attr_name)
+                    parent_path = path.copy()
+
+                    # Элементы списков и словарей адресуются индексом или ключом
+                    if isinstance(container, list):
+                        for index, item in enumerate(container):
+                            if item is node:
+                                parent_path.append(str(index))
+                                break
+                    elif isinstance(container, dict):
+                        for key, item in container.items():
+                            if item is node:
+                                parent_path.append(str(key))
+                                break
+
+                    parent_path.append(attr_name)
+                    stack.append((parent, parent_path))
+
+        for callback, events in batches.items():
+            callback(events)
 
     def mark_original(self):
         """
-        Сбрасывает статус изменённого
+        Сбрасывает статус изменённого.
+        Статус вложенных объектов в изменённых полях также сбрасывается
         """
+        if self._pm_status_changed:
+            # Предки могли остаться помеченными через этот объект,
+            # поэтому все отметки о распространении становятся недействительными
+            PropertyMapperBase._pm_epoch += 1
+
         self._pm_status_changed = False
 
+        changed_fields = self._pm_changed_fields
+        if changed_fields:
+            self._pm_changed_fields = frozenset()
+            self.__dict__.pop('_pm_changed_items', None)
+
+            for prop_name in changed_fields:
+                value = self.__get_prop(prop_name)
+
+                if isinstance(value, PropertyMapperBase):
+                    value.mark_original()
+                    continue
+                elif isinstance(value, list):
+                    items = value
+                elif isinstance(value, dict):
+                    items = value.values()
+                else:
+                    continue
+
+                for item in items:
+                    if isinstance(item, PropertyMapperBase):
+                        item.mark_original()
+
+    def __reduce__(self) -> tuple:
+        """
+        Сериализуются только значения полей в порядке объявления
+        и unknown_params. Ссылки на родителя восстанавливаются при загрузке,
+        статус изменения и слушатели не переносятся.
+        Динамические классы (add_properties) описываются базовым классом
+        и набором добавленных свойств
+        """
+        instance_dict = self.__dict__
+        values = tuple(instance_dict.get(f'_{prop_name}') for prop_name in self._attrs_dict.keys())
+
+        codecs = self._pm_field_codecs
+        if codecs:
+            # Номера таймзон в compact зависят от процесса, поэтому такие поля
+            # сериализуются переносимым видом (dump) и восстанавливаются через load.
+            # Остальные хранимые значения сериализуются как есть
+            values = tuple(
+                codecs[prop_name][2](value)
+                if value is not None and prop_name in codecs and codecs[prop_name][2] is not None
+                else value
+                for prop_name, value in zip(self._attrs_dict.keys(), values)
+            )
+
+        dynamic_props = None
+        mapper_class = self.__class__
+        if mapper_class._pm_dynamic_base is not None:
+            dynamic_props = tuple(sorted(mapper_class._pm_dynamic_props, key=lambda prop: prop[0]))
+            mapper_class = mapper_class._pm_dynamic_base
+
+        return _unpickle_mapper, (mapper_class, dynamic_props, values, self.unknown_params)
+
+    def __copy__(self) -> Self:
+        # Поверхностная копия со всеми служебными атрибутами, кроме слушателей
+        # (без перепривязки потомков)
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        obj.__dict__.pop('_pm_listeners', None)
+        return obj
+
     def __repr__(self) -> str:
         info_dict = dict()
         for attr in self._attrs_dict.keys():
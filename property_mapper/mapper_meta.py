@@ -2,6 +2,7 @@ import inspect
 
 from typing import get_type_hints, ForwardRef
 
+from .compact import install_field_codecs
 from .hints import (
     check_hint_type,
     expand_forward_refs,
@@ -79,6 +80,8 @@ class PropertyMapperMeta(type):
 
         new_class = super().__new__(cls, name, bases, attrs)
 
+        install_field_codecs(new_class)
+
         # Проверяем на наличие ForwardRef
         for base in new_class.mro():
             mapper_attrs_dict = getattr(base, '_attrs_dict', {})
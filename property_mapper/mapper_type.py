@@ -31,6 +31,57 @@ class PropertyMapperType:
     def from_data(cls, value: Union[allow_types]) -> Optional['PropertyMapperType']:
         return cls._parse(value)
 
+    @classmethod
+    def from_trusted(cls, value: Any) -> Optional['PropertyMapperType']:
+        """
+        Преобразует значение, полученное ранее из reverse()
+        (см. trusted при создании маппера).
+        Наследники могут переопределить метод, если формат reverse()
+        разбирается быстрее, чем произвольные входные данные
+        :param value:
+        :return:
+        """
+        return cls.from_data(value)
+
+    @classmethod
+    def from_trusted_many(cls, values: list) -> list:
+        """
+        Преобразует список значений, полученных ранее из reverse().
+        Наследники с собственным from_trusted переопределяют и этот метод
+        :param values:
+        :return:
+        """
+        return cls.parse_many(values)
+
+    @classmethod
+    def parse_many(cls, values: list) -> list:
+        """
+        Преобразует список значений целиком.
+        Если хотя бы одно значение не подходит (в том числе None),
+        вызывает TypeError или ValueError.
+
+        Наследники могут переопределить метод для пакетного преобразования
+        :param values:
+        :return:
+        """
+        result = [cls.from_data(value) for value in values]
+
+        for item in result:
+            if item is None:
+                raise TypeError(f'{cls} Can not parse None item')
+
+        return result
+
+    @classmethod
+    def _check_many(cls, values: list):
+        """
+        Проверяет, что все значения имеют допустимые типы
+        """
+        allow_types = cls.allow_types
+        for value in values:
+            if not isinstance(value, allow_types):
+                raise TypeError(f'Value: "{value}" has unsupported type "{type(value)}"!')
+
     def replace(self, value: Union[allow_types]) -> 'PropertyMapperType':
         result = self._parse(value=value)
         if result is not None:
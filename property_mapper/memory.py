@@ -0,0 +1,175 @@
+"""
+Оценка памяти, удерживаемой деревом мапперов.
+
+Размеры считаются через sys.getsizeof, каждый объект учитывается один раз,
+даже если на него ссылаются из нескольких мест дерева.
+"""
+import gc
+import sys
+
+from typing import Any
+
+from .mapper_base import PropertyMapperBase
+from .mapper_type import PropertyMapperType
+
+__all__ = ['memory_report']
+
+# Служебные ссылки, которые не принадлежат объекту
+_skip_attrs = frozenset((
+    '_pm_private_parent',
+    '_pm_private_root',
+    '_pm_private_attr_name',
+    '_pm_private_owners',
+    '_pm_listeners',
+))
+
+
+class _MemoryWalker:
+
+    def __init__(self):
+        self.seen = set()
+        self.classes = {}
+
+    def class_stats(self, cls: type) -> dict:
+        key = str(cls)
+
+        stats = self.classes.get(key)
+        if stats is None:
+            stats = self.classes[key] = {
+                'instances': 0,
+                'bytes': 0,
+                'unknown_params': 0,
+                'fields': {},
+            }
+
+        return stats
+
+    def is_new(self, obj: Any) -> bool:
+        # Синглтоны и малые целые не удерживаются деревом
+        if obj is None or obj is True or obj is False:
+            return False
+        if type(obj) is int and -5 <= obj <= 256:
+            return False
+
+        obj_id = id(obj)
+        if obj_id in self.seen:
+            return False
+
+        self.seen.add(obj_id)
+        return True
+
+    def walk_mapper(self, mapper: PropertyMapperBase) -> int:
+        """
+        Возвращает размер ещё не учтённой части поддерева
+        """
+        if not self.is_new(mapper):
+            return 0
+
+        stats = self.class_stats(mapper.__class__)
+        stats['instances'] += 1
+
+        own = sys.getsizeof(mapper)
+        nested = 0
+
+        instance_dict = mapper.__dict__
+        if self.is_new(instance_dict):
+            own += sys.getsizeof(instance_dict)
+
+        field_keys = set()
+        for prop_name in mapper._attrs_dict.keys():
+            key = f'_{prop_name}'
+            field_keys.add(key)
+
+            if key not in instance_dict:
+                continue
+
+            field_own, field_nested = self.walk_value(instance_dict[key])
+
+            field_stats = stats['fields'].setdefault(prop_name, {'bytes': 0, 'deep': 0})
+            field_stats['bytes'] += field_own
+            field_stats['deep'] += field_own + field_nested
+
+            own += field_own
+            nested += field_nested
+
+        for key, value in instance_dict.items():
+            if key in field_keys or key in _skip_attrs:
+                continue
+
+            value_own, value_nested = self.walk_value(value)
+            if key == 'unknown_params':
+                stats['unknown_params'] += value_own
+
+            own += value_own
+            nested += value_nested
+
+        stats['bytes'] += own
+
+        return own + nested
+
+    def walk_value(self, value: Any) -> tuple[int, int]:
+        """
+        Возвращает (собственный размер значения, размер вложенных мапперов)
+        """
+        if isinstance(value, PropertyMapperBase):
+            return 0, self.walk_mapper(value)
+
+        if not self.is_new(value):
+            return 0, 0
+
+        own = sys.getsizeof(value)
+        nested = 0
+
+        if isinstance(value, dict):
+            items = [item for pair in value.items() for item in pair]
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            items = value
+        else:
+            items = ()
+
+            if isinstance(value, PropertyMapperType):
+                # Словарь экземпляра (флаг изменения и т.п.), если он был создан.
+                # Обращение к __dict__ создало бы его, поэтому ищем среди ссылок
+                for ref in gc.get_referents(value):
+                    if type(ref) is dict and self.is_new(ref):
+                        own += sys.getsizeof(ref)
+
+        for item in items:
+            item_own, item_nested = self.walk_value(item)
+            own += item_own
+            nested += item_nested
+
+        return own, nested
+
+
+def memory_report(mapper: PropertyMapperBase) -> dict:
+    """
+    Отчёт о памяти, удерживаемой деревом мапперов:
+
+    {
+        'total': int,  # байт во всём дереве
+        'classes': {
+            'module.Class': {
+                'instances': int,
+                'bytes': int,  # объекты класса, их __dict__, unknown_params и значения полей без вложенных мапперов
+                'unknown_params': int,
+                'fields': {
+                    'field': {
+                        'bytes': int,  # значения поля без вложенных мапперов
+                        'deep': int,  # вместе с вложенными мапперами
+                    },
+                },
+            },
+        },
+    }
+
+    :param mapper: корень (или любой узел) дерева
+    :return:
+    """
+    walker = _MemoryWalker()
+    total = walker.walk_mapper(mapper)
+
+    return {
+        'total': total,
+        'classes': walker.classes,
+    }
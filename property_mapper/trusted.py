@@ -0,0 +1,33 @@
+"""
+Создание мапперов из уже проверенных данных (кэш, собственная база и т.п.).
+
+    with trusted_input():
+        items = [Mapper(data) for data in cached]
+
+    with trusted_input(sample=0.01):  # каждый сотый объект проверяется полностью
+        ...
+
+Действует в текущем потоке так же, как Mapper(data, trusted=True)
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from .mapper_base import _operations
+
+__all__ = ['trusted_input']
+
+
+@contextmanager
+def trusted_input(sample: float = None) -> Iterator[None]:
+    """
+    :param sample: доля объектов, проверяемых полностью.
+        По умолчанию используется pm_trusted_sample класса
+    """
+    previous = _operations.trusted, _operations.trusted_sample
+
+    _operations.trusted = True
+    _operations.trusted_sample = sample
+    try:
+        yield
+    finally:
+        _operations.trusted, _operations.trusted_sample = previous
@@ -1,4 +1,5 @@
 from .any import Any
+from .arrays import DatetimeArray, FloatArray, IntArray, TimestampArray
 from .date import Date
 from .datetime import Datetime
 from .drop import Drop
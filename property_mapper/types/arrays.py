@@ -0,0 +1,262 @@
+import math
+
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+
+from property_mapper.exceptions import UnsupportedType
+from property_mapper.mapper_type import PropertyMapperType
+
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from .datetime import Datetime
+from .float import Float
+from .integer import Int
+from .timestamp import Timestamp
+
+__all__ = [
+    'DatetimeArray',
+    'FloatArray',
+    'IntArray',
+    'TimestampArray',
+    'from_microseconds',
+    'to_microseconds',
+    'wall_microseconds',
+]
+
+_naive_epoch = datetime(1970, 1, 1)
+
+
+class NumberArray(PropertyMapperType, array):
+    """
+    Компактный список чисел на базе array.array.
+
+    Используется вместо list[Int] / list[Float], когда элементы
+    не нужны в виде отдельных объектов: список преобразуется
+    целиком и занимает 8 байт на элемент
+    """
+    allow_types: tuple = (list, tuple, array)
+
+    typecode: str = None
+    # Тип элемента, если список не удалось преобразовать целиком.
+    # Элементы проверяются так же, как в list[item_type]
+    item_type: type[PropertyMapperType] = None
+
+    def __new__(cls, values: Iterable = ()):
+        return super().__new__(cls, cls.typecode, values)
+
+    @classmethod
+    def parse(cls, value: Union[allow_types]) -> 'NumberArray':
+        # Типы элементов проверяются так же, как в list[item_type]
+        # (array('d') принял бы и целые числа)
+        cls.item_type._check_many(value)
+
+        try:
+            try:
+                return cls(value)
+            except TypeError:
+                # Например, числа в виде строк
+                return cls(cls.item_type.parse_many(value))
+        except OverflowError:
+            raise UnsupportedType(f'{cls.__name__} Value does not fit into array of type "{cls.typecode}"')
+
+    def reverse(self) -> list:
+        return self.tolist()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.tolist()})'
+
+
+class IntArray(NumberArray):
+    typecode = 'q'
+    item_type = Int
+
+
+class FloatArray(NumberArray):
+    typecode = 'd'
+    item_type = Float
+
+
+def to_microseconds(value: Union[int, float]) -> int:
+    """
+    Метка времени в секундах -> целое число микросекунд
+    """
+    if type(value) is int:
+        return value * 1_000_000
+    elif not isinstance(value, Timestamp.allow_types):
+        raise TypeError(f'Value: "{value}" has unsupported type "{type(value)}"!')
+
+    # Так же, как datetime.fromtimestamp (Timestamp): дробная часть
+    # округляется отдельно, иначе значения расходятся на 1 микросекунду
+    fraction, seconds = math.modf(value)
+    return int(seconds) * 1_000_000 + round(fraction * 1_000_000)
+
+
+def wall_microseconds(value: datetime) -> int:
+    """
+    Дата -> время по часам её таймзоны в микросекундах от 1970-01-01
+    (обратное преобразование - from_microseconds с той же таймзоной)
+    """
+    # replace переопределён в PropertyMapperType
+    delta = datetime.replace(value, tzinfo=None) - _naive_epoch
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_microseconds(value_type: type[datetime], microseconds: int, tzinfo=timezone.utc) -> datetime:
+    """
+    Время в микросекундах от 1970-01-01 (по часам tzinfo) -> объект value_type
+    """
+    return value_type(1970, 1, 1, tzinfo=tzinfo) + timedelta(microseconds=microseconds)
+
+
+class _MicrosecondsArray(PropertyMapperType, Sequence):
+    """
+    Список моментов времени, хранящихся в array.array как целые микросекунды.
+    Объекты элементов создаются только при обращении к ним
+    """
+    allow_types: tuple = (list, tuple)
+
+    item_type: type = None
+
+    def __init__(self, microseconds: array):
+        self.microseconds = microseconds
+
+    def __len__(self) -> int:
+        return len(self.microseconds)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return self._slice(index)
+
+        return self._make_item(index)
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self.microseconds)):
+            yield self._make_item(index)
+
+    def _make_item(self, index: int) -> datetime:
+        raise NotImplementedError
+
+    def _slice(self, index: slice) -> '_MicrosecondsArray':
+        raise NotImplementedError
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is type(self):
+            return self._state() == other._state()
+        elif isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def _state(self) -> tuple:
+        return (self.microseconds, )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)})'
+
+
+class TimestampArray(_MicrosecondsArray):
+    """
+    Компактный список меток времени (аналог list[Timestamp])
+    """
+    item_type: type = Timestamp
+
+    @classmethod
+    def parse(cls, value: Union[list, tuple]) -> 'TimestampArray':
+        return cls(array('q', map(to_microseconds, value)))
+
+    def _make_item(self, index: int) -> Timestamp:
+        return from_microseconds(self.item_type, self.microseconds[index])
+
+    def _slice(self, index: slice) -> 'TimestampArray':
+        return self.__class__(self.microseconds[index])
+
+    def reverse(self) -> list[float]:
+        return [value / 1_000_000 for value in self.microseconds]
+
+
+class DatetimeArray(_MicrosecondsArray):
+    """
+    Компактный список дат со временем (аналог list[Datetime]).
+
+    Хранится время по часам исходной таймзоны и сама таймзона:
+    одна на весь список, если она у всех элементов одинакова
+    """
+    item_type: type = Datetime
+
+    def __init__(self, microseconds: array, tzinfos: Optional[list] = None, tzinfo=None):
+        super().__init__(microseconds)
+
+        # Таймзоны элементов, если они различаются
+        self.tzinfos = tzinfos
+        self.tzinfo = tzinfo
+
+    @classmethod
+    def _parse_item(cls, value: Union[datetime, str]) -> datetime:
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                # Не ISO формат, разбираем так же, как Datetime
+                return cls.item_type._parse_date_string(value)
+
+        elif isinstance(value, datetime):
+            return value
+
+        raise TypeError(f'Value: "{value}" has unsupported type "{type(value)}"!')
+
+    @classmethod
+    def parse(cls, value: Union[list, tuple]) -> 'DatetimeArray':
+        default_timezone = cls.item_type.default_timezone
+
+        microseconds = array('q')
+        tzinfos = []
+        common_tzinfo = None
+
+        for item in value:
+            item = cls._parse_item(item)
+            tzinfo = item.tzinfo or default_timezone
+
+            if tzinfos:
+                last = tzinfos[-1]
+                if tzinfo is not last and tzinfo == last:
+                    # Одинаковые таймзоны хранятся одним объектом
+                    tzinfo = last
+                elif tzinfo != last:
+                    common_tzinfo = False
+            else:
+                common_tzinfo = tzinfo
+
+            tzinfos.append(tzinfo)
+            microseconds.append(wall_microseconds(item))
+
+        if common_tzinfo is False:
+            return cls(microseconds, tzinfos=tzinfos)
+
+        return cls(microseconds, tzinfo=common_tzinfo)
+
+    def _tzinfo(self, index: int):
+        if self.tzinfos is not None:
+            return self.tzinfos[index]
+
+        return self.tzinfo
+
+    def _make_item(self, index: int) -> Datetime:
+        return from_microseconds(self.item_type, self.microseconds[index], tzinfo=self._tzinfo(index))
+
+    def _slice(self, index: slice) -> 'DatetimeArray':
+        if self.tzinfos is not None:
+            return self.__class__(self.microseconds[index], tzinfos=self.tzinfos[index])
+
+        return self.__class__(self.microseconds[index], tzinfo=self.tzinfo)
+
+    def _state(self) -> tuple:
+        return tuple(self)
+
+    def reverse(self) -> list[str]:
+        return [
+            from_microseconds(datetime, value, tzinfo=self._tzinfo(index)).isoformat()
+            for index, value in enumerate(self.microseconds)
+        ]
@@ -41,6 +41,26 @@ class Date(PropertyMapperType, date):
             day=value.day,
         )
 
+    @classmethod
+    def from_trusted(cls, value: Union[allow_types]) -> Optional['Date']:
+        if isinstance(value, str):
+            # reverse() возвращает ISO 8601
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                pass
+
+        return cls.from_data(value)
+
+    @classmethod
+    def from_trusted_many(cls, values: list) -> list['Date']:
+        result = [cls.from_trusted(value) for value in values]
+
+        if None in result:
+            raise TypeError(f'{cls} Can not parse None item')
+
+        return result
+
     def reverse(self) -> str:
         return self.isoformat()
 
@@ -42,6 +42,26 @@ class Datetime(PropertyMapperType, datetime):
             fold=value.fold,
         )
 
+    @classmethod
+    def from_trusted(cls, value: Union[allow_types]) -> Optional['Datetime']:
+        if isinstance(value, str):
+            # reverse() возвращает ISO 8601
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                pass
+
+        return cls.from_data(value)
+
+    @classmethod
+    def from_trusted_many(cls, values: list) -> list['Datetime']:
+        result = [cls.from_trusted(value) for value in values]
+
+        if None in result:
+            raise TypeError(f'{cls} Can not parse None item')
+
+        return result
+
     def reverse(self) -> str:
         return self.isoformat()
 
@@ -12,5 +12,10 @@ class Float(PropertyMapperType, float):
     def parse(cls, value: Union[allow_types]) -> 'Float':
         return cls(value)
 
+    @classmethod
+    def parse_many(cls, values: list) -> list['Float']:
+        cls._check_many(values)
+        return list(map(cls, values))
+
     def reverse(self) -> float:
         return float(self)
@@ -12,5 +12,10 @@ class Int(PropertyMapperType, int):
     def parse(cls, value: Union[allow_types]) -> 'Int':
         return cls(value)
 
+    @classmethod
+    def parse_many(cls, values: list) -> list['Int']:
+        cls._check_many(values)
+        return list(map(cls, values))
+
     def reverse(self) -> int:
         return int(self)
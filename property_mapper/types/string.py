@@ -12,5 +12,10 @@ class Str(PropertyMapperType, str):
     def parse(cls, value: Union[allow_types]) -> 'Str':
         return cls(value)
 
+    @classmethod
+    def parse_many(cls, values: list) -> list['Str']:
+        cls._check_many(values)
+        return list(map(cls, values))
+
     def reverse(self) -> str:
         return str(self)
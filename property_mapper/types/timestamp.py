@@ -14,5 +14,13 @@ class Timestamp(PropertyMapperType, datetime):
     def parse(cls, value: Union[allow_types]) -> 'Timestamp':
         return cls.fromtimestamp(value, timezone.utc)
 
+    @classmethod
+    def parse_many(cls, values: list) -> list['Timestamp']:
+        cls._check_many(values)
+
+        fromtimestamp = cls.fromtimestamp
+        utc = timezone.utc
+        return [fromtimestamp(value, utc) for value in values]
+
     def reverse(self) -> Union[int, float]:
         return self.timestamp()
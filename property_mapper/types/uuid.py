@@ -15,5 +15,13 @@ class UUID(PropertyMapperType, OrigUUID):
 
         return cls(value)
 
+    @classmethod
+    def parse_many(cls, values: list) -> list['UUID']:
+        if all(type(value) is str for value in values):
+            return list(map(cls, values))
+
+        cls._check_many(values)
+        return [cls.parse(value) for value in values]
+
     def reverse(self) -> str:
         return str(self)
@@ -3,6 +3,7 @@ from typing import Dict, List, Union
 
 __all__ = [
     'get_types',
+    'is_dict',
     'is_list',
     'is_union',
     'make_property',
@@ -20,6 +21,10 @@ def is_list(hint_type) -> bool:
     return isinstance(hint_type, (GenericAlias, ListAlias)) and hint_type.__origin__ is list
 
 
+def is_dict(hint_type) -> bool:
+    return isinstance(hint_type, (GenericAlias, ListAlias)) and hint_type.__origin__ is dict
+
+
 def is_union(hint_type) -> bool:
     return isinstance(hint_type, (UnionAlias, UnionType))
 
@@ -0,0 +1,154 @@
+import uuid
+
+from typing import Union
+
+import pytest
+
+from property_mapper import MagicMapper, MapperInterface, PropertyMapper
+from property_mapper.types import Datetime, Float, Int, Str, Timestamp, UUID
+
+
+class ItemInterface(MapperInterface):
+    id: Int
+    name: Str
+    price: Float
+    active: bool
+    created: Timestamp
+    updated: Datetime
+    uid: UUID
+
+
+class Item(PropertyMapper, ItemInterface):
+    pm_allow_unknown = True
+
+
+class StoreInterface(MapperInterface):
+    main: Item
+    items: list[Item]
+    by_name: dict[str, Item]
+    codes: list[Int]
+    value: Union[Int, Str]
+    note: Str
+
+
+class Store(PropertyMapper, StoreInterface):
+    pass
+
+
+def item_data(i: int) -> dict:
+    return {
+        'id': i,
+        'name': f'item-{i}',
+        'price': i * 1.5,
+        'active': bool(i % 2),
+        'created': 1700000000.25 + i,
+        'updated': f'2024-02-20T06:38:{i:02d}.250000+03:00',
+        'uid': str(uuid.UUID(int=i)),
+    }
+
+
+store_data = {
+    'main': item_data(0),
+    'items': [item_data(1), {**item_data(2), 'updated': '2024-02-20T06:38:00'}],
+    'by_name': {'third': item_data(3)},
+    'codes': [1, 2 ** 70, -5],
+    'value': 10,
+    'note': 'заметка',
+}
+
+
+def test_round_trip():
+    store = Store(store_data)
+    buf = store.to_bytes()
+
+    restored = Store.from_bytes(buf)
+    assert restored.as_dict() == store.as_dict()
+
+    item = restored.items[0]
+    assert type(item.updated) is Datetime
+    assert item.updated.utcoffset() == store.items[0].updated.utcoffset()
+    assert restored.items[1].updated.tzinfo is None
+    assert type(item.uid) is UUID
+
+    assert item.get_parent() is restored
+    assert restored.by_name['third'].get_root() is restored
+    assert not restored.is_changed
+
+    # Чтение без промежуточных копий
+    assert Store.from_bytes(memoryview(bytearray(buf))).as_dict() == store.as_dict()
+
+
+def test_unknown_params():
+    store = Store({**store_data, 'main': {**item_data(0), 'extra': {'a': [1, None, True]}}})
+
+    restored = Store.from_bytes(store.to_bytes())
+    assert restored.main.unknown_params == {'extra': {'a': [1, None, True]}}
+
+
+class IntMagicMapper(MagicMapper):
+    pm_magic_type = Int
+
+
+def test_dynamic_properties():
+    mapper = IntMagicMapper({'a': 1, 'b': '2'})
+
+    restored = IntMagicMapper.from_bytes(mapper.to_bytes())
+    assert restored.__class__ is mapper.__class__
+    assert restored.as_dict() == {'a': 1, 'b': 2}
+
+
+class VersionInterface(MapperInterface):
+    id: Int
+    name: Str
+
+
+class Version(PropertyMapper, VersionInterface):
+    pass
+
+
+class VersionNextInterface(MapperInterface):
+    name: Str
+    title: Str
+    id: Int
+
+
+class VersionNext(PropertyMapper, VersionNextInterface):
+    pm_schema_version = 1
+    pm_schema_history = {0: ('id', 'name')}
+
+
+def test_schema_version():
+    buf = Version({'id': 1, 'name': 'first'}).to_bytes()
+
+    restored = VersionNext.from_bytes(buf)
+    assert restored.as_dict() == {'id': 1, 'name': 'first'}
+
+    with pytest.raises(ValueError):
+        Version.from_bytes(VersionNext({'id': 1}).to_bytes())
+
+
+def test_wrong_data():
+    with pytest.raises(ValueError):
+        Store.from_bytes(b'{"main": {}}')
+
+
+def test_truncated_data():
+    buf = Store(store_data).to_bytes()
+
+    for size in (2, 3, 8, 40, len(buf) // 2, len(buf) - 3, len(buf) - 1):
+        with pytest.raises(ValueError):
+            Store.from_bytes(buf[:size])
+
+
+def test_corrupted_data():
+    buf = Store(store_data).to_bytes()
+
+    # Повреждённые данные либо читаются, либо вызывают ValueError
+    for pos in range(3, len(buf)):
+        corrupted = bytearray(buf)
+        corrupted[pos] ^= 0xff
+
+        try:
+            Store.from_bytes(corrupted)
+        except ValueError:
+            pass
@@ -0,0 +1,403 @@
+import copy
+import pickle
+
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.mapper_base import _begin_operation, _end_operation
+from property_mapper.types import Int, Str
+
+
+class LeafInterface(MapperInterface):
+    value: Int
+    name: Str
+
+
+class Leaf(PropertyMapper, LeafInterface):
+    pass
+
+
+class MiddleInterface(MapperInterface):
+    first: Leaf
+    second: Leaf
+
+
+class Middle(PropertyMapper, MiddleInterface):
+    pass
+
+
+class RootInterface(MapperInterface):
+    middle: Middle
+    other: Int
+
+
+class Root(PropertyMapper, RootInterface):
+    pass
+
+
+root_data = {
+    'middle': {
+        'first': {'value': 1, 'name': 'first'},
+        'second': {'value': 2, 'name': 'second'},
+    },
+    'other': 3,
+}
+
+
+def test_parent_and_root():
+    root = Root(root_data)
+
+    assert root.get_parent() is root
+    assert root.get_root() is root
+
+    assert root.middle.first.get_parent() is root.middle
+    assert root.middle.first.get_root() is root
+
+    assert '_pm_private_root' not in root.__dict__
+
+
+def test_propagation():
+    root = Root(root_data)
+
+    assert not root.is_changed
+
+    root.merge_data({'middle': {'first': {'value': 10}}})
+
+    assert root.middle.first.is_changed
+    assert root.middle.is_changed
+    assert root.is_changed
+    assert not root.middle.second.is_changed
+
+
+def test_propagation_stops_at_marked_ancestor():
+    root = Root(root_data)
+
+    _begin_operation()
+    try:
+        root.middle.first.mark_changed(propagate=True)
+        assert root.is_changed
+
+        # Подменяем статус напрямую, без mark_original:
+        # повторное распространение в рамках операции не должно дойти до корня
+        root._pm_status_changed = False
+        root.middle.second.mark_changed(propagate=True)
+    finally:
+        _end_operation()
+
+    assert root.middle.second.is_changed
+    assert not root.is_changed
+
+
+def test_propagation_after_reset():
+    root = Root(root_data)
+
+    root.middle.first.mark_changed(propagate=True)
+    root.mark_original()
+    assert not root.is_changed
+
+    root.middle.first.mark_changed(propagate=True)
+    assert root.is_changed
+
+    root.mark_original()
+    root.middle.second.mark_changed(propagate=True)
+    assert root.is_changed
+
+
+class ListRootInterface(MapperInterface):
+    leaves: list[Leaf]
+    values: dict[str, Int]
+
+
+class ListRoot(PropertyMapper, ListRootInterface):
+    pass
+
+
+def test_changed_fields():
+    root = Root(root_data)
+
+    assert root.changed_fields() == set()
+
+    root.merge_data({'middle': {'first': {'value': 10}}, 'other': 3})
+
+    assert root.changed_fields() == {'middle'}
+    assert root.middle.changed_fields() == {'first'}
+    assert root.middle.first.changed_fields() == {'value'}
+
+    assert list(root.iter_changes()) == ['middle.first.value']
+
+
+def test_changed_only_serialization():
+    root = Root(root_data)
+    root.merge_data({
+        'middle': {
+            'first': {'value': 10, 'name': 'first'},
+            'second': None,
+        },
+        'other': 4,
+    })
+
+    assert sorted(root.iter_changes()) == ['middle.first.value', 'middle.second', 'other']
+    assert root.as_dict(changed_only=True) == {
+        'middle': {
+            'first': {'value': 10},
+            'second': None,
+        },
+        'other': 4,
+    }
+
+
+def test_changes_reset():
+    root = Root(root_data)
+    root.merge_data({'middle': {'first': {'value': 10}}})
+
+    root.mark_original()
+
+    assert root.changed_fields() == set()
+    assert root.middle.changed_fields() == set()
+    assert not root.middle.first.is_changed
+
+    root.merge_data({'middle': {'second': {'name': 'changed'}}})
+
+    assert list(root.iter_changes()) == ['middle.second.name']
+
+
+def test_changes_in_containers():
+    root = ListRoot({
+        'leaves': [{'value': 1, 'name': 'a'}, {'value': 2, 'name': 'b'}],
+        'values': {'a': 1, 'b': 2},
+    })
+
+    root.merge_data({
+        'leaves': [{'value': 1, 'name': 'a'}, {'value': 2, 'name': 'c'}],
+        'values': {'a': 1, 'b': 3},
+    })
+
+    assert sorted(root.iter_changes()) == ['leaves.1.name', 'values']
+    assert root.as_dict(changed_only=True) == {
+        'leaves': [{'value': 1, 'name': 'a'}, {'value': 2, 'name': 'c'}],
+        'values': {'a': 1, 'b': 3},
+    }
+
+
+def test_list_item_removed():
+    root = ListRoot({'leaves': [{'value': 1, 'name': 'a'}, {'value': 2, 'name': 'b'}]})
+
+    root.merge_data({'leaves': [{'value': 1, 'name': 'a'}]})
+
+    assert root.is_changed
+    assert list(root.iter_changes()) == ['leaves']
+
+
+def test_versions():
+    root = Root(root_data)
+    version = root.version
+
+    assert not root.changed_since(version)
+
+    root.merge_data({'other': 3})
+    assert not root.changed_since(version)
+
+    root.merge_data({'middle': {'first': {'value': 10}}})
+    assert root.changed_since(version)
+    assert root.middle.changed_since(version)
+    assert not root.middle.second.changed_since(version)
+
+    # Версия не зависит от сброса статуса
+    root.mark_original()
+    second_version = root.version
+    assert root.changed_since(version)
+
+    # Повторное изменение того же листа увеличивает версии предков
+    root.merge_data({'middle': {'first': {'value': 11}}})
+    assert root.changed_since(second_version)
+    assert root.middle.first.changed_since(second_version)
+
+
+def test_versions_replace_property():
+    root = Root(root_data)
+    version = root.version
+
+    root.middle.first.replace_property('name', 'new')
+
+    assert root.changed_since(version)
+    assert root.middle.changed_since(version)
+    assert not root.middle.second.changed_since(version)
+
+
+def test_versions_unchanged_nested_merge():
+    root = Root(root_data)
+    root.merge_data({'middle': {'first': {'value': 10}}})
+    version = root.version
+
+    # Вложенный объект уже помечен изменённым, но это слияние ничего не меняет
+    root.merge_data({'middle': {'first': {'value': 10}}})
+    assert not root.changed_since(version)
+
+    list_root = ListRoot({'leaves': [{'value': 1, 'name': 'a'}]})
+    list_root.merge_data({'leaves': [{'value': 1, 'name': 'b'}]})
+    version = list_root.version
+
+    list_root.merge_data({'leaves': [{'value': 1, 'name': 'b'}]})
+    assert not list_root.changed_since(version)
+
+
+class CachedLeaf(Leaf):
+    pm_cache_dict = True
+
+
+class CachedTreeInterface(MapperInterface):
+    title: Str
+    leaves: list[CachedLeaf]
+
+
+class CachedTree(PropertyMapper, CachedTreeInterface):
+    pm_cache_dict = True
+
+
+cached_tree_data = {
+    'title': 'tree',
+    'leaves': [
+        {'value': 1, 'name': 'one'},
+        {'value': 2, 'name': 'two'},
+    ],
+}
+
+
+def test_cached_as_dict():
+    tree = CachedTree(cached_tree_data)
+
+    result = tree.as_dict()
+    assert result == cached_tree_data
+    assert tree.as_dict() is result
+
+    # Кэшированный результат неизменяем
+    with pytest.raises(TypeError):
+        result['title'] = 'other'
+    with pytest.raises(TypeError):
+        result['leaves'].append({})
+
+    copied = result.copy()
+    copied['title'] = 'other'
+    assert tree.as_dict()['title'] == 'tree'
+
+
+def test_cached_as_dict_copies():
+    tree = CachedTree(cached_tree_data)
+    result = tree.as_dict()
+
+    # Копии и результат pickle - обычные изменяемые контейнеры
+    for copied in (copy.deepcopy(result), pickle.loads(pickle.dumps(result))):
+        assert copied == cached_tree_data
+        assert type(copied) is dict
+        assert type(copied['leaves']) is list
+
+        copied['leaves'][0]['name'] = 'other'
+
+    assert tree.as_dict()['leaves'][0]['name'] == 'one'
+
+
+class PlainTreeInterface(MapperInterface):
+    leaf: CachedLeaf
+    leaves: list[CachedLeaf]
+
+
+class PlainTree(PropertyMapper, PlainTreeInterface):
+    pass
+
+
+def test_cached_child_in_uncached_parent():
+    tree = PlainTree({'leaf': {'value': 1, 'name': 'a'}, 'leaves': [{'value': 2, 'name': 'b'}]})
+    cached = tree.leaf.as_dict()
+
+    # Родитель без кэша возвращает изменяемые словари, как обычно
+    result = tree.as_dict()
+    result['leaf']['name'] = 'c'
+    result['leaves'][0]['name'] = 'd'
+
+    assert cached['name'] == 'a'
+    assert tree.as_dict() == {'leaf': {'value': 1, 'name': 'a'}, 'leaves': [{'value': 2, 'name': 'b'}]}
+
+
+def test_cached_as_dict_invalidation():
+    tree = CachedTree(cached_tree_data)
+
+    result = tree.as_dict()
+    first, second = result['leaves']
+
+    tree.merge_data({
+        'leaves': [
+            {'value': 1, 'name': 'one'},
+            {'value': 2, 'name': 'changed'},
+        ],
+    })
+
+    new_result = tree.as_dict()
+    assert new_result is not result
+    assert new_result['leaves'][1]['name'] == 'changed'
+
+    # Неизменённый лист не перестраивается
+    assert new_result['leaves'][0] is first
+    assert new_result['leaves'][1] is not second
+
+    tree.replace_property('title', 'new')
+    assert tree.as_dict()['title'] == 'new'
+
+
+class FingerprintLeaf(Leaf):
+    pm_fingerprint = True
+
+
+class FingerprintTreeInterface(MapperInterface):
+    title: Str
+    leaf: FingerprintLeaf
+
+
+class FingerprintTree(PropertyMapper, FingerprintTreeInterface):
+    pm_fingerprint = True
+
+
+def test_fingerprint_skips_same_payload(monkeypatch):
+    data = {'title': 'tree', 'leaf': {'value': 1, 'name': 'one'}}
+    tree = FingerprintTree(data)
+
+    calls = []
+    original = PropertyMapper.merge_property
+
+    def merge_property(self, prop_name, prop_value):
+        calls.append(prop_name)
+        return original(self, prop_name=prop_name, prop_value=prop_value)
+
+    monkeypatch.setattr(PropertyMapper, 'merge_property', merge_property)
+
+    assert tree.merge_data(data) is tree
+    assert calls == []
+
+    # Изменилось только вложенное поле: корень сливается, лист - тоже
+    changed = {'title': 'tree', 'leaf': {'value': 2, 'name': 'one'}}
+    tree.merge_data(changed)
+    assert calls == ['title', 'leaf', 'value', 'name']
+    assert tree.leaf.value == 2
+
+    calls.clear()
+    tree.merge_data(changed)
+    assert calls == []
+
+    # Изменение в обход merge_data сбрасывает отпечаток
+    tree.leaf.replace_property('value', 5)
+    tree.merge_data(changed)
+    assert calls == ['title', 'leaf', 'value', 'name']
+    assert tree.leaf.value == 2
+
+
+def test_list_item_added_with_nested_changes():
+    root = ListRoot({'leaves': [{'value': 1, 'name': 'a'}]})
+
+    root.merge_data({'leaves': [{'value': 1, 'name': 'changed'}, {'value': 2, 'name': 'b'}]})
+
+    assert sorted(root.iter_changes()) == ['leaves.0.name', 'leaves.1']
+
+    root.mark_original()
+    root.merge_data({'leaves': [{'value': 1, 'name': 'again'}]})
+
+    # Элемент удалён: изменён весь список
+    assert sorted(root.iter_changes()) == ['leaves', 'leaves.0.name']
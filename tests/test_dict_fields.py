@@ -0,0 +1,112 @@
+import pytest
+
+from typing import Dict, Union
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import UnsupportedType
+from property_mapper.types import Float, Int, Str
+
+
+class PriceInterface(MapperInterface):
+    id: Int
+    value: Float
+
+
+class Price(PropertyMapper, PriceInterface):
+    pm_key_field = 'id'
+
+
+class ProductInterface(MapperInterface):
+    prices: dict[str, Price]
+    titles: Dict[str, Str]
+    values: dict[str, Int | Str]
+
+
+class Product(PropertyMapper, ProductInterface):
+    pass
+
+
+data1 = {
+    'prices': {
+        'sku1': {'id': 1, 'value': 10.5},
+        'sku2': {'id': 2, 'value': 3.0},
+    },
+    'titles': {
+        'ru': 'Товар',
+        'en': 'Product',
+    },
+    'values': {
+        'a': 1,
+        'b': 'two',
+    },
+}
+
+
+def test_dict_parsing():
+    product = Product(data1)
+
+    assert isinstance(product.prices['sku1'], Price)
+    assert product.prices['sku1'].get_parent() is product
+    assert isinstance(product.titles['en'], Str)
+    assert isinstance(product.values['a'], Int)
+    assert isinstance(product.values['b'], Str)
+
+    assert product.as_dict() == data1
+
+
+def test_dict_merge():
+    product = Product(data1)
+    sku1 = product.prices['sku1']
+    sku2 = product.prices['sku2']
+
+    product.merge_data({
+        'prices': {
+            'sku1': {'id': 1, 'value': 10.5},
+            'sku2': {'id': 2, 'value': 4.0},
+        },
+    })
+
+    assert product.prices['sku1'] is sku1
+    assert product.prices['sku2'] is sku2
+    assert not sku1.is_changed
+    assert sku2.is_changed
+    assert product.is_changed
+
+
+def test_dict_merge_unchanged():
+    product = Product(data1)
+    product.merge_data({'titles': {'ru': 'Товар', 'en': 'Product'}})
+
+    assert not product.is_changed
+
+
+def test_dict_merge_removed_key():
+    product = Product(data1)
+    product.merge_data({'titles': {'ru': 'Товар'}})
+
+    assert product.is_changed
+    assert product.titles == {'ru': 'Товар'}
+
+
+def test_dict_wrong_value():
+    with pytest.raises(UnsupportedType):
+        Product({'prices': {'sku1': 5}})
+
+
+@pytest.mark.parametrize(
+    'hint',
+    [
+        dict,
+        dict[int, Int],
+        dict[str, list[Int]],
+        list[dict[str, Int]],
+        Union[Int, dict[str, Int]],
+    ],
+)
+def test_dict_wrong_hints(hint):
+    with pytest.raises((TypeError, RecursionError)):
+        class WrongInterface(MapperInterface):
+            values: hint
+
+        class WrongMapper(PropertyMapper, WrongInterface):
+            pass
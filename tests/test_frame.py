@@ -0,0 +1,86 @@
+from array import array
+
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.frame import MapperFrame
+from property_mapper.types import Float, Int, Str, Timestamp, UUID
+
+
+class RecordInterface(MapperInterface):
+    id: Int
+    name: Str
+    price: Float
+    active: bool
+    created: Timestamp
+    uid: UUID
+
+
+class Record(PropertyMapper, RecordInterface):
+    pass
+
+
+class ParentInterface(MapperInterface):
+    record: Record
+
+
+class Parent(PropertyMapper, ParentInterface):
+    pass
+
+
+def record_data(i: int) -> dict:
+    return {
+        'id': i,
+        'name': f'name-{i % 3}',
+        'price': i * 1.5,
+        'active': bool(i % 2),
+        'created': 1700000000.25 + i,
+        'uid': f'00000000-0000-0000-0000-{i:012d}',
+    }
+
+
+def test_from_records():
+    records = [record_data(i) for i in range(10)]
+    records[3]['price'] = None
+
+    frame = MapperFrame.from_records(Record, records)
+    assert len(frame) == 10
+
+    # Записи совпадают с результатом as_dict() мапперов
+    assert frame.to_records() == [Record(record).as_dict() for record in records]
+
+    row = frame[4]
+    mapper = Record(records[4])
+    for prop_name in Record._attrs_dict.keys():
+        value = getattr(row, prop_name)
+        assert value == getattr(mapper, prop_name)
+        assert type(value) is type(getattr(mapper, prop_name))
+
+    assert frame[3].price is None
+    assert frame[-1].id == 9
+    assert row.to_mapper().as_dict() == mapper.as_dict()
+
+    with pytest.raises(AttributeError):
+        row.unknown
+
+    with pytest.raises(IndexError):
+        frame[10]
+
+    # Одинаковые строки хранятся один раз
+    assert frame.columns['name'].values[0] is frame.columns['name'].values[3]
+
+
+def test_to_columns():
+    frame = MapperFrame.from_records(Record, [record_data(i) for i in range(3)])
+    columns = frame.to_columns()
+
+    assert columns['id'] == array('q', [0, 1, 2])
+    assert columns['price'] == array('d', [0.0, 1.5, 3.0])
+    assert columns['created'] == array('d', [1700000000.25, 1700000001.25, 1700000002.25])
+    assert columns['name'] == ['name-0', 'name-1', 'name-2']
+    assert columns['active'] == [False, True, False]
+
+
+def test_flat_schema_only():
+    with pytest.raises(TypeError):
+        MapperFrame.from_records(Parent, [{'record': record_data(1)}])
@@ -0,0 +1,99 @@
+from typing import Union
+
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import ValidationError
+from property_mapper.types import Int, Str
+
+
+class TagInterface(MapperInterface):
+    id: Int
+    name: Str
+
+
+class Tag(PropertyMapper, TagInterface):
+    pass
+
+
+class PostInterface(MapperInterface):
+    title: Str
+    cover: Tag
+    tags: list[Tag]
+    by_lang: dict[str, Tag]
+    rating: Union[Int, Str]
+    scores: list[Int]
+
+
+class Post(PropertyMapper, PostInterface):
+    pass
+
+
+def test_construct():
+    tag = Tag.construct(id=Int(1), name=Str('first'))
+
+    assert tag.as_dict() == {'id': 1, 'name': 'first'}
+    assert not tag.is_changed
+
+    # Непреобразованные значения разбираются как обычно
+    tag = Tag.construct(id='2', name='second')
+    assert type(tag.id) is Int
+    assert tag.id == 2
+
+
+def test_construct_unconverted_containers():
+    data = {'rating': 5, 'scores': [1, '2'], 'tags': [Tag.construct(id=1), {'id': 2}]}
+    post = Post.construct(**data)
+
+    # Значения объединений и списков разбираются так же, как при создании из данных
+    assert type(post.rating) is Int
+    assert [type(score) for score in post.scores] == [Int, Int]
+    assert [type(tag) for tag in post.tags] == [Tag, Tag]
+    assert all(tag.get_parent() is post for tag in post.tags)
+
+    post.merge_data({'rating': 5, 'scores': [1, 2], 'tags': [{'id': 1}, {'id': 2}]})
+    assert not post.is_changed
+
+
+def test_from_values_links():
+    source = Post({
+        'cover': {'id': 1, 'name': 'cover'},
+        'tags': [{'id': 2, 'name': 'a'}, {'id': 3, 'name': 'b'}],
+        'by_lang': {'ru': {'id': 4, 'name': 'c'}},
+    })
+    assert source.tags[0].get_root() is source
+
+    tags = source.tags
+    post = Post.from_values({
+        'cover': source.cover,
+        'tags': tags,
+        'by_lang': source.by_lang,
+        'title': Str('copy'),
+    })
+
+    assert post.as_dict() == {**source.as_dict(), 'title': 'copy'}
+
+    assert post.tags is not tags
+    assert post.tags[0] is tags[0]
+
+    for tag in (post.cover, post.tags[1], post.by_lang['ru']):
+        assert tag.get_parent() is post
+        assert tag.get_root() is post
+
+    post.tags[1].replace_property('name', 'changed')
+    assert post.is_changed
+    assert post.changed_fields() == {'tags'}
+
+
+def test_from_values_nested():
+    tag = Tag.construct(id=Int(1), name=Str('tag'))
+    inner = Post.construct(cover=tag)
+    outer = Post.construct(tags=[inner.cover])
+
+    assert tag.get_parent() is outer
+    assert tag.get_root() is outer
+
+
+def test_from_values_unknown():
+    with pytest.raises(ValidationError):
+        Tag.from_values({'id': Int(1), 'other': 1})
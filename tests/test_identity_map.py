@@ -0,0 +1,166 @@
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.events import ChangeEvent
+from property_mapper.types import Int, Str
+
+
+class UserInterface(MapperInterface):
+    id: Int
+    name: Str
+
+
+class User(PropertyMapper, UserInterface):
+    pm_key_field = 'id'
+    pm_identity_map = 2
+
+
+class PostInterface(MapperInterface):
+    title: Str
+    author: User
+    readers: list[User]
+
+
+class Post(PropertyMapper, PostInterface):
+    pass
+
+
+class CachedPost(Post):
+    pm_cache_dict = True
+    pm_fingerprint = True
+
+
+def test_shared_instances():
+    User.clear_identity_map()
+
+    post = Post({
+        'title': 'post',
+        'author': {'id': 1, 'name': 'alice'},
+        'readers': [
+            {'id': 2, 'name': 'bob'},
+            {'id': 1, 'name': 'alice'},
+        ],
+    })
+
+    assert post.readers[1] is post.author
+    assert post.readers[0] is not post.author
+
+    other = Post({
+        'title': 'other',
+        'author': {'id': 2, 'name': 'robert'},
+        'readers': [],
+    })
+
+    # Объект общий и получил новые данные
+    assert other.author is post.readers[0]
+    assert post.readers[0].name == 'robert'
+
+    # Родитель - последнее место размещения
+    assert other.author.get_parent() is other
+    assert other.author.get_root() is other
+
+
+def test_lru_eviction():
+    User.clear_identity_map()
+
+    first = User.get_or_create({'id': 1, 'name': 'first'})
+    assert User.get_or_create({'id': 1, 'name': 'first'}) is first
+
+    User.get_or_create({'id': 2, 'name': 'second'})
+    User.get_or_create({'id': 3, 'name': 'third'})
+
+    # Размер карты - 2, первый объект вытеснен
+    assert len(User._pm_identity_map) == 2
+    assert User.get_or_create({'id': 1, 'name': 'first'}) is not first
+
+    # Без ключа объект не попадает в карту
+    assert User.get_or_create({'name': 'anonymous'}) is not User.get_or_create({'name': 'anonymous'})
+
+
+def test_shared_instance_merge_on_creation():
+    User.clear_identity_map()
+
+    post = Post({'title': 'post', 'author': {'id': 1, 'name': 'alice'}, 'readers': []})
+    version = post.version
+
+    other = Post({
+        'title': 'other',
+        'author': {'id': 1, 'name': 'alicia'},
+        'readers': [{'id': 1, 'name': 'alice'}],
+    })
+
+    # Новый объект не считается изменённым
+    assert not other.is_changed
+    assert other.changed_fields() == set()
+    assert other.version == 0
+
+    # Изменение общего объекта отмечено в прежнем дереве
+    assert post.is_changed
+    assert post.changed_since(version)
+    assert list(post.iter_changes()) == ['author.name']
+
+
+def test_shared_instance_owners():
+    User.clear_identity_map()
+
+    post = Post({'title': 'post', 'author': {'id': 1, 'name': 'alice'}, 'readers': []})
+    other = Post({'title': 'other', 'author': {'id': 1, 'name': 'alice'}, 'readers': []})
+
+    author = post.author
+    assert author is other.author
+
+    # get_parent - последнее место размещения
+    assert author.get_parent() is other
+
+    # Изменение отмечается во всех местах размещения
+    author.replace_property('name', 'changed')
+    assert other.changed_fields() == {'author'}
+    assert post.changed_fields() == {'author'}
+
+
+def test_shared_instance_across_trees():
+    User.clear_identity_map()
+
+    first = CachedPost({'title': 'first', 'author': {'id': 1, 'name': 'bob'}, 'readers': []})
+    second = CachedPost({'title': 'second', 'author': {'id': 1, 'name': 'bob'}, 'readers': []})
+
+    assert first.as_dict()['author']['name'] == 'bob'
+    version = first.version
+
+    batches = []
+    first.add_listener(batches.append)
+
+    second.merge_data({'author': {'id': 1, 'name': 'carol'}})
+
+    assert first.author.name == 'carol'
+    assert first.as_dict()['author']['name'] == 'carol'
+    assert first.changed_since(version)
+    assert list(first.iter_changes()) == ['author.name']
+    assert batches == [[ChangeEvent('author.name', 'bob', 'carol')]]
+
+    first.remove_listener(batches.append)
+
+    # Объект убран из первого дерева - его изменения туда больше не попадают
+    first.replace_property('author', {'id': 2, 'name': 'dave'})
+    version = first.version
+
+    second.merge_data({'author': {'id': 1, 'name': 'eve'}})
+    assert not first.changed_since(version)
+    assert first.author.name == 'dave'
+
+
+def test_shared_instance_in_one_tree():
+    User.clear_identity_map()
+
+    post = Post({
+        'title': 'post',
+        'author': {'id': 1, 'name': 'alice'},
+        'readers': [{'id': 1, 'name': 'alice'}],
+    })
+    assert post.readers[0] is post.author
+    assert not post.is_changed
+
+    version = post.version
+    post.merge_data({'readers': [{'id': 1, 'name': 'alicia'}]})
+
+    assert post.author.name == 'alicia'
+    assert post.changed_since(version)
+    assert post.changed_fields() == {'author', 'readers'}
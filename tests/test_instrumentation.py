@@ -0,0 +1,74 @@
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper, instrumentation
+from property_mapper.mapper_base import PropertyMapperBase
+from property_mapper.types import Int, Str
+
+
+class ItemInterface(MapperInterface):
+    value: Int | Str
+    values: list[Int]
+
+
+class Item(PropertyMapper, ItemInterface):
+    pass
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert PropertyMapperBase.__init__.__module__ == 'property_mapper.mapper_base'
+
+
+def test_collect_stats(enabled):
+    item = Item({'value': 'text', 'values': [1, 2, 3]})
+    item.merge_data({'value': 5})
+
+    stats = instrumentation.snapshot()[str(Item)]
+
+    assert stats['init']['calls'] == 1
+    assert stats['merge']['calls'] == 1
+    assert stats['propagations'] >= 1
+
+    value_stats = stats['fields']['value']
+    assert value_stats['parse']['calls'] == 1
+    assert value_stats['merge']['calls'] == 1
+    # Int не подошёл при создании, Int подошёл при слиянии
+    assert value_stats['probes'] == 3
+    assert value_stats['misses'] == 1
+
+    values_stats = stats['fields']['values']
+    assert values_stats['lists'] == 1
+    assert values_stats['list_items'] == 3
+    assert values_stats['list_max'] == 3
+
+
+def test_disable_restores_methods(enabled):
+    original = instrumentation._originals['__init__']
+    instrumentation.disable()
+
+    assert PropertyMapperBase.__dict__['__init__'] is original
+
+    Item({'value': 1, 'values': []})
+    assert instrumentation.snapshot() == {}
+
+
+def test_exporter(enabled):
+    received = []
+    instrumentation.add_exporter(received.append)
+    try:
+        Item({'value': 1, 'values': []})
+        data = instrumentation.export()
+    finally:
+        instrumentation.remove_exporter(received.append)
+
+    assert received == [data]
+    assert str(Item) in data
@@ -0,0 +1,149 @@
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.events import ChangeEvent
+from property_mapper.types import Int, Str
+
+
+class ItemInterface(MapperInterface):
+    id: Int
+    name: Str
+
+
+class Item(PropertyMapper, ItemInterface):
+    pass
+
+
+class BoxInterface(MapperInterface):
+    title: Str
+    item: Item
+    items: list[Item]
+
+
+class Box(PropertyMapper, BoxInterface):
+    pass
+
+
+box_data = {
+    'title': 'box',
+    'item': {'id': 1, 'name': 'one'},
+    'items': [
+        {'id': 2, 'name': 'two'},
+        {'id': 3, 'name': 'three'},
+    ],
+}
+
+
+def test_instance_listener_batch():
+    box = Box(box_data)
+    batches = []
+    box.add_listener(batches.append)
+
+    box.merge_data({
+        'title': 'new box',
+        'item': {'id': 1, 'name': 'first'},
+    })
+
+    assert len(batches) == 1
+    assert sorted(batches[0]) == [
+        ChangeEvent('item.name', 'one', 'first'),
+        ChangeEvent('title', 'box', 'new box'),
+    ]
+
+    # Без изменений событий нет
+    box.merge_data({'title': 'new box'})
+    assert len(batches) == 1
+
+    box.remove_listener(batches.append)
+    box.merge_data({'title': 'box'})
+    assert len(batches) == 1
+
+
+def test_list_item_path():
+    box = Box(box_data)
+    batches = []
+    box.add_listener(batches.append)
+
+    box.merge_data({
+        'items': [
+            {'id': 2, 'name': 'two'},
+            {'id': 3, 'name': 'drei'},
+        ],
+    })
+
+    assert batches == [[ChangeEvent('items.1.name', 'three', 'drei')]]
+    box.remove_listener(batches.append)
+
+
+def test_path_listener():
+    box = Box(box_data)
+    batches = []
+    box.add_listener(batches.append, path='item')
+
+    box.merge_data({'title': 'other'})
+    assert batches == []
+
+    box.replace_property('item', {'id': 5, 'name': 'five'})
+    assert len(batches) == 1
+
+    event, = batches[0]
+    assert event.path == 'item'
+    assert event.old.id == 1
+    assert event.new.id == 5
+
+    box.remove_listener(batches.append, path='item')
+
+
+def test_class_listener():
+    box = Box(box_data)
+    batches = []
+    Item.add_class_listener(batches.append)
+
+    try:
+        box.merge_data({'title': 'other', 'item': {'id': 1, 'name': 'uno'}})
+    finally:
+        Item.remove_class_listener(batches.append)
+
+    # Путь относительно объекта класса Item, изменение title его не касается
+    assert batches == [[ChangeEvent('name', 'one', 'uno')]]
+
+
+def test_no_listeners():
+    assert PropertyMapper._pm_listeners_count == 0
+
+
+def test_listener_after_replace_data():
+    box = Box(box_data)
+    other = Box({**box_data, 'title': 'other'})
+    other_item = other.item
+
+    count = PropertyMapper._pm_listeners_count
+    batches = []
+    box.add_listener(batches.append)
+
+    box.replace_data(other)
+
+    assert box.title == 'other'
+    assert box.item is other_item
+    assert other_item.get_parent() is box
+    assert other._pm_listeners == ()
+
+    assert len(batches) == 1
+    assert ChangeEvent('title', 'box', 'other') in batches[0]
+
+    box.merge_data({'title': 'again'})
+    assert len(batches) == 2
+
+    box.remove_listener(batches.append)
+    assert PropertyMapper._pm_listeners_count == count
+
+
+def test_listeners_of_deleted_object():
+    count = PropertyMapper._pm_listeners_count
+
+    box = Box(box_data)
+    box.add_listener(lambda events: None)
+    box.add_listener(lambda events: None, path='title')
+    assert PropertyMapper._pm_listeners_count == count + 2
+
+    # Слушатели удалённого объекта не держат включённой рассылку событий
+    del box
+    assert PropertyMapper._pm_listeners_count == count
@@ -0,0 +1,98 @@
+import gc
+
+from property_mapper import MagicMapper
+from property_mapper.dynamic import dynamic_classes_count
+from property_mapper.types import Int
+
+
+class IntMagicMapper(MagicMapper):
+    pm_magic_type = Int
+
+
+def test_magic_mapper_creation():
+    mapper = IntMagicMapper({'a': 1, 'b': '2'})
+
+    assert isinstance(mapper, IntMagicMapper)
+    assert mapper.a == 1
+    assert mapper.b == 2
+
+    assert mapper.as_dict() == {'a': 1, 'b': 2}
+
+
+def test_dynamic_class_reuse():
+    mapper1 = IntMagicMapper({'a': 1, 'b': 2})
+    mapper2 = IntMagicMapper({'b': 3, 'a': 4})
+
+    assert mapper1.__class__ is mapper2.__class__
+
+    # Порядок добавления полей не влияет на класс
+    mapper3 = IntMagicMapper({'a': 1}).apply_data({'a': 1, 'b': 2})
+    assert mapper3.__class__ is mapper1.__class__
+
+
+def test_dynamic_classes_collected():
+    gc.collect()
+    before = dynamic_classes_count()
+
+    mapper = IntMagicMapper({'unique_key': 1})
+    assert dynamic_classes_count() == before + 1
+
+    del mapper
+    gc.collect()
+
+    assert dynamic_classes_count() == before
+
+
+def test_apply_data_in_place():
+    mapper = IntMagicMapper({'a': 1})
+    old_class = mapper.__class__
+
+    data = {'a': 2, 'b': 3}
+    result = mapper.apply_data(data)
+
+    assert result is mapper
+    assert mapper.__class__ is not old_class
+    assert mapper.as_dict() == {'a': 2, 'b': 3}
+    assert mapper.is_changed
+
+    # Входной словарь не изменяется
+    assert data == {'a': 2, 'b': 3}
+
+
+def test_add_property_keeps_values():
+    mapper = IntMagicMapper({'a': 1})
+    old_value = mapper.a
+
+    result = mapper.add_property('b', Int, '2')
+
+    assert result is mapper
+    assert mapper.a is old_value
+    assert mapper.b == 2
+
+
+def test_apply_data_obsolete_keys():
+    mapper = IntMagicMapper({'a': 1, 'b': 2})
+
+    data = {'a': 1}
+    mapper.apply_data(data)
+
+    assert mapper.b is None
+    assert data == {'a': 1}
+
+
+class CompactMagicMapper(MagicMapper):
+    pm_magic_type = Int
+    pm_raw_scalars = True
+
+
+def test_dynamic_properties_raw_scalars():
+    mapper = CompactMagicMapper({'a': 1})
+
+    # Добавленные поля хранятся так же, как объявленные
+    assert type(mapper.__dict__['_a']) is int
+    assert mapper.__class__._pm_field_codecs['a'] == (int, Int, None, None)
+
+    mapper.merge_data({'a': 2})
+    assert mapper.a == 2
+    assert mapper.changed_fields() == {'a'}
+    assert mapper.as_dict() == {'a': 2}
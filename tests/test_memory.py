@@ -0,0 +1,223 @@
+import gc
+import sys
+import tracemalloc
+import weakref
+
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.types import Datetime, Float, Int, Str, Timestamp
+
+
+class FlatInterface(MapperInterface):
+    id: Int
+    name: Str
+    price: Float
+    active: bool
+    created: Timestamp
+
+
+class Flat(PropertyMapper, FlatInterface):
+    pm_key_field = 'id'
+
+
+class NestedInterface(MapperInterface):
+    item: Flat
+    tags: list[Str]
+    values: dict[str, Int]
+
+
+class Nested(PropertyMapper, NestedInterface):
+    pass
+
+
+def flat_data(i: int) -> dict:
+    return {
+        'id': i,
+        'name': f'name-{i}',
+        'price': i * 1.5,
+        'active': bool(i % 2),
+        'created': 1700000000.0 + i,
+    }
+
+
+def nested_data(i: int) -> dict:
+    return {
+        'item': flat_data(i),
+        'tags': [f'tag-{i}', f'tag-{i + 1}'],
+        'values': {'a': i, 'b': i + 1000},
+    }
+
+
+def allocated_per_object(mapper_class: type, make_data, count: int = 200) -> float:
+    """
+    Память, удерживаемая одним объектом (без учёта входных данных)
+    """
+    payloads = [make_data(i) for i in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects = [mapper_class(payload) for payload in payloads]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(objects) == count
+
+    return (after - before) / count
+
+
+# Пороги с запасом относительно текущих значений.
+# При снижении потребления памяти их стоит уменьшать.
+@pytest.mark.parametrize(
+    'mapper_class,make_data,max_bytes',
+    [
+        (Flat, flat_data, 700),
+        (Nested, nested_data, 2000),
+    ],
+)
+def test_memory_per_object(mapper_class, make_data, max_bytes):
+    size = allocated_per_object(mapper_class, make_data)
+    assert size <= max_bytes
+
+
+def test_memory_report():
+    mapper = Nested(nested_data(1))
+
+    report = mapper.memory_report()
+
+    assert report['total'] > 0
+    assert report['total'] == sum(stats['bytes'] for stats in report['classes'].values())
+
+    nested_stats = report['classes'][str(Nested)]
+    flat_stats = report['classes'][str(Flat)]
+
+    assert nested_stats['instances'] == 1
+    assert flat_stats['instances'] == 1
+
+    item_stats = nested_stats['fields']['item']
+    assert item_stats['bytes'] == 0
+    assert item_stats['deep'] == flat_stats['bytes']
+
+    assert set(flat_stats['fields']) == {'id', 'name', 'price', 'active', 'created'}
+
+
+def test_memory_report_shared_objects():
+    mapper = Nested(nested_data(1))
+
+    report = mapper.memory_report()
+    unknown_size = sys.getsizeof(mapper.unknown_params)
+
+    # Один и тот же объект в двух местах учитывается один раз
+    mapper.unknown_params['copy'] = mapper.tags
+    shared_report = mapper.memory_report()
+
+    added = sys.getsizeof(mapper.unknown_params) - unknown_size + sys.getsizeof('copy')
+    assert shared_report['total'] - report['total'] == added
+
+
+def test_tree_freed_without_gc():
+    nested = Nested({'item': flat_data(1), 'tags': ['a'], 'values': {'a': 1}})
+    item = nested.item
+    assert item.get_parent() is nested
+    assert item.get_root() is nested
+
+    nested_ref = weakref.ref(nested)
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Дерево без циклических ссылок освобождается подсчётом ссылок
+        del nested
+        assert nested_ref() is None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # Родитель удалён, объект стал корнем
+    assert item.get_parent() is item
+    assert item.get_root() is item
+
+
+class EventInterface(MapperInterface):
+    created: Timestamp
+    updated: Timestamp
+    started: Datetime
+    finished: Datetime
+
+
+class Event(PropertyMapper, EventInterface):
+    pass
+
+
+class CompactEvent(Event):
+    pm_compact_datetimes = True
+
+
+def event_data(i: int) -> dict:
+    return {
+        'created': 1700000000.5 + i,
+        'updated': 1700000100 + i,
+        'started': f'2024-02-20T06:38:{i % 60:02d}.25+03:00',
+        'finished': f'2024-02-20T06:39:{i % 60:02d}',
+    }
+
+
+def test_compact_datetimes():
+    data = event_data(5)
+    event = Event(data)
+    compact = CompactEvent(data)
+
+    for prop_name in Event._attrs_dict.keys():
+        value = getattr(compact, prop_name)
+        assert value == getattr(event, prop_name)
+        assert type(value) is type(getattr(event, prop_name))
+        assert value.tzinfo == getattr(event, prop_name).tzinfo
+
+    assert compact.as_dict() == event.as_dict()
+
+    compact.mark_original()
+    compact.merge_data(data)
+    assert not compact.is_changed
+
+    compact.merge_data({'updated': 1700000200})
+    assert compact.changed_fields() == {'updated'}
+    assert compact.updated.reverse() == 1700000200
+
+    assert allocated_per_object(CompactEvent, event_data) < allocated_per_object(Event, event_data) * 0.75
+
+
+class RawFlat(Flat):
+    pm_raw_scalars = True
+
+
+def test_raw_scalars():
+    data = flat_data(7)
+    flat = Flat(data)
+    raw = RawFlat(data)
+
+    for prop_name in ('id', 'name', 'price'):
+        value = getattr(raw, prop_name)
+        assert value == getattr(flat, prop_name)
+        assert type(value) in (int, float, str)
+
+    # Остальные поля хранятся как обычно
+    assert type(raw.created) is Timestamp
+
+    assert raw.as_dict() == flat.as_dict()
+
+    raw.mark_original()
+    raw.merge_data(data)
+    assert not raw.is_changed
+
+    raw.merge_data({'name': 'other', 'price': data['price']})
+    assert raw.changed_fields() == {'name'}
+    assert type(raw.name) is str
+
+    raw.replace_property('id', '8')
+    assert raw.id == 8
+    assert type(raw.id) is int
+
+    assert allocated_per_object(RawFlat, flat_data) < allocated_per_object(Flat, flat_data)
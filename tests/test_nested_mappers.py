@@ -90,3 +90,34 @@ def test_mapper_linking():
     assert mapper2.base.child.get_parent() is mapper2.base
 
     assert mapper2.base.child.get_parent().get_parent() is mapper2
+
+
+class KeyedMapperInterface(MapperInterface):
+    id: Int
+    string: Str
+
+
+class KeyedMapper(PropertyMapper, KeyedMapperInterface):
+    pm_key_field = 'id'
+
+
+class ListMapperInterface(MapperInterface):
+    items: list[KeyedMapper]
+
+
+class ListMapper(PropertyMapper, ListMapperInterface):
+    pass
+
+
+def test_keyed_list_merge():
+    mapper = ListMapper({'items': [{'id': 1, 'string': 'a'}, {'id': 2, 'string': 'b'}]})
+    first, second = mapper.items
+
+    # Найденные элементы удаляются из кандидатов по индексу, а не через ==
+    mapper.merge_data({'items': [{'id': 2, 'string': 'c'}, {'id': 1, 'string': 'a'}, {'id': 3, 'string': 'd'}]})
+
+    assert mapper.items[0] is second
+    assert mapper.items[1] is first
+    assert mapper.as_dict() == {
+        'items': [{'id': 2, 'string': 'c'}, {'id': 1, 'string': 'a'}, {'id': 3, 'string': 'd'}],
+    }
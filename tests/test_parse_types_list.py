@@ -1,8 +1,9 @@
 import pytest
 import uuid
 
-from property_mapper import PropertyMapper
-from property_mapper.types import Int, Str, UUID as UuidType
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import UnsupportedType
+from property_mapper.types import Any, Int, Str, UUID as UuidType
 
 uuid1 = uuid.uuid4()
 
@@ -21,3 +22,55 @@ def test_types_list_parsing(inputs, types, expectation):
     result = obj._parse_list('', inputs, types)
 
     assert result == expectation
+
+
+class NumbersInterface(MapperInterface):
+    numbers: list[Int]
+    values: list[Any]
+
+
+class Numbers(PropertyMapper, NumbersInterface):
+    pass
+
+
+def test_parse_many():
+    assert Int.parse_many([1, '2']) == [1, 2]
+    assert all(type(item) is Int for item in Int.parse_many([1, '2']))
+
+    assert UuidType.parse_many([str(uuid1), uuid1]) == [uuid1, uuid1]
+
+    with pytest.raises(TypeError):
+        Int.parse_many([1, None])
+
+    with pytest.raises(TypeError):
+        Int.parse_many([1, 1.5])
+
+
+def test_list_parse_many():
+    numbers = Numbers({'numbers': [1, '2', 3]})
+    assert numbers.numbers == [1, 2, 3]
+    assert all(type(item) is Int for item in numbers.numbers)
+
+    numbers.mark_original()
+    numbers.merge_data({'numbers': [1, 2, 3]})
+    assert not numbers.is_changed
+
+    numbers.merge_data({'numbers': [1, 5, 3]})
+    assert numbers.changed_fields() == {'numbers'}
+    assert [item.is_changed for item in numbers.numbers] == [False, True, False]
+
+    # Неподходящий элемент - поэлементный разбор с подробной ошибкой
+    with pytest.raises(UnsupportedType):
+        Numbers({'numbers': [1, 1.5]})
+
+
+def test_merge_list_of_any():
+    numbers = Numbers({'values': [1, 'two', {'three': 3}]})
+
+    numbers.merge_data({'values': [1, 'two', {'three': 3}]})
+    assert not numbers.is_changed
+
+    # Значения Any не оборачиваются в типы
+    numbers.merge_data({'values': [1, 2]})
+    assert numbers.changed_fields() == {'values'}
+    assert numbers.values == [1, 2]
@@ -0,0 +1,138 @@
+import copy
+import os
+import pickle
+import subprocess
+import sys
+
+from datetime import datetime, timedelta, timezone
+
+from property_mapper import MagicMapper, MapperInterface, PropertyMapper
+from property_mapper.types import Datetime, Int, Str
+
+
+class ReadingInterface(MapperInterface):
+    value: Int
+    taken: Datetime
+
+
+class Reading(PropertyMapper, ReadingInterface):
+    pm_allow_unknown = True
+
+
+class CompactReading(Reading):
+    pm_compact_datetimes = True
+    pm_raw_scalars = True
+
+
+class StationInterface(MapperInterface):
+    name: Str
+    last: Reading
+    history: list[Reading]
+    by_sensor: dict[str, CompactReading]
+
+
+class Station(PropertyMapper, StationInterface):
+    pass
+
+
+station_data = {
+    'name': 'station',
+    'last': {'value': 0, 'taken': '2024-02-20T06:38:00+03:00', 'extra': [1, 2]},
+    'history': [
+        {'value': 1, 'taken': '2024-02-20T06:38:01+03:00'},
+        {'value': 2, 'taken': '2024-02-20T06:38:02+03:00'},
+    ],
+    'by_sensor': {'third': {'value': 3, 'taken': '2024-02-20T06:38:03+03:00'}},
+}
+
+
+def test_pickle_round_trip():
+    station = Station(station_data)
+    station.history[0].replace_property('value', 10)
+
+    restored = pickle.loads(pickle.dumps(station))
+
+    assert restored.as_dict(include_unknown=True) == station.as_dict(include_unknown=True)
+    assert restored.last.unknown_params == {'extra': [1, 2]}
+
+    for reading in (restored.last, restored.history[1], restored.by_sensor['third']):
+        assert reading.get_parent() is restored
+        assert reading.get_root() is restored
+
+    assert type(restored.by_sensor['third'].value) is int
+    assert type(restored.by_sensor['third'].taken) is Datetime
+
+    # Статус изменения не переносится
+    assert not restored.is_changed
+
+    restored.history[1].replace_property('value', 20)
+    assert restored.changed_fields() == {'history'}
+
+
+def test_pickle_compact():
+    data = pickle.dumps(Station(station_data))
+
+    # Только значения полей, без служебных атрибутов и их имён
+    assert b'_pm_' not in data
+    assert b'_history' not in data
+
+
+def test_pickle_stored_values():
+    reading = CompactReading(station_data['last'])
+    data = pickle.dumps(reading)
+
+    # Хранимые значения не оборачиваются в типы полей
+    assert b'Datetime' not in data
+    assert b'Int' not in data
+    assert len(data) < len(pickle.dumps(Reading(station_data['last'])))
+
+    restored = pickle.loads(data)
+    assert restored.as_dict(include_unknown=True) == reading.as_dict(include_unknown=True)
+    assert restored.taken.isoformat() == reading.taken.isoformat()
+    assert type(restored.taken) is Datetime
+
+
+class IntMagicMapper(MagicMapper):
+    pm_magic_type = Int
+
+
+def test_pickle_dynamic_class():
+    mapper = IntMagicMapper({'a': 1, 'b': '2'})
+
+    restored = pickle.loads(pickle.dumps(mapper))
+    assert restored.__class__ is mapper.__class__
+    assert restored.as_dict() == {'a': 1, 'b': 2}
+
+
+def test_copy():
+    station = Station(station_data)
+
+    shallow = copy.copy(station)
+    assert shallow.history is station.history
+    assert station.history[0].get_parent() is station
+
+    deep = copy.deepcopy(station)
+    assert deep.as_dict() == station.as_dict()
+    assert deep.history[0] is not station.history[0]
+    assert deep.history[0].get_parent() is deep
+
+
+def test_pickle_compact_datetimes_in_other_process():
+    # Таймзона, которой нет в таблице нового процесса
+    created = datetime(2024, 2, 20, 6, 38, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    reading = CompactReading({'value': 1, 'taken': created.isoformat()})
+
+    script = (
+        'import pickle, sys\n'
+        'reading = pickle.loads(sys.stdin.buffer.read())\n'
+        'print(reading.taken.isoformat())\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        input=pickle.dumps(reading),
+        capture_output=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert result.stdout.decode().strip() == created.isoformat()
@@ -0,0 +1,89 @@
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import ReadOnlyMapper
+from property_mapper.types import Int, Str
+
+
+class CurrencyInterface(MapperInterface):
+    code: Str
+    precision: Int
+
+
+class Currency(PropertyMapper, CurrencyInterface):
+    pm_read_only = True
+
+
+class PriceInterface(MapperInterface):
+    amount: Int
+    currency: Currency
+
+
+class Price(PropertyMapper, PriceInterface):
+    pass
+
+
+class PriceListInterface(MapperInterface):
+    prices: list[Price]
+
+
+class PriceList(PropertyMapper, PriceListInterface):
+    pass
+
+
+def price_data(amount: int, code: str = 'USD') -> dict:
+    return {'amount': amount, 'currency': {'code': code, 'precision': 2}}
+
+
+def test_shared_subtrees():
+    price_list = PriceList({
+        'prices': [price_data(1), price_data(2), price_data(3, 'EUR')],
+    })
+
+    first, second, third = price_list.prices
+    assert first.currency is second.currency
+    assert first.currency is not third.currency
+    assert third.currency.code == 'EUR'
+
+    # У общего объекта нет родителя
+    assert first.currency.get_parent() is first.currency
+
+
+def test_read_only():
+    price = Price(price_data(1))
+
+    with pytest.raises(ReadOnlyMapper):
+        price.currency.replace_property('code', 'EUR')
+
+    shared = price.currency
+    price.mark_original()
+
+    # Слияние с теми же данными ничего не меняет
+    price.merge_data(price_data(1))
+    assert price.currency is shared
+    assert not price.is_changed
+
+    # Слияние с другими данными заменяет общий объект, а не изменяет его
+    price.merge_data({'currency': {'code': 'EUR'}})
+    assert shared.code == 'USD'
+    assert price.currency.code == 'EUR'
+    assert price.currency.precision == 2
+    assert price.changed_fields() == {'currency'}
+    assert price.currency is Price(price_data(5, 'EUR')).currency
+
+
+def test_construct_read_only():
+    currency = Currency.construct(code=Str('GBP'), precision=Int(2))
+
+    assert Currency.construct(code=Str('GBP'), precision=Int(2)) is currency
+    assert currency.merge_data({'code': 'GBP', 'precision': 2}) is currency
+
+    merged = currency.merge_data({'precision': 3})
+    assert merged is not currency
+    assert merged.as_dict() == {'code': 'GBP', 'precision': 3}
+    assert currency.precision == 2
+
+    price = Price.construct(amount=Int(1), currency=currency)
+    price.merge_data({'currency': {'code': 'GBP', 'precision': 4}})
+    assert price.currency.precision == 4
+    assert price.changed_fields() == {'currency'}
@@ -0,0 +1,115 @@
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import UnsupportedType
+from property_mapper.trusted import trusted_input
+from property_mapper.types import Date, Datetime, Int
+
+
+class EventInterface(MapperInterface):
+    id: Int
+    created: Datetime
+    day: Date
+
+
+class Event(PropertyMapper, EventInterface):
+    pass
+
+
+class CalendarInterface(MapperInterface):
+    events: list[Event]
+    by_name: dict[str, Event]
+    holidays: list[Date]
+    deadlines: dict[str, Datetime]
+
+
+class Calendar(PropertyMapper, CalendarInterface):
+    pass
+
+
+class TrustedCalendar(Calendar):
+    pm_trusted = True
+
+
+class SampledCalendar(Calendar):
+    pm_trusted = True
+    pm_trusted_sample = 1.0
+
+
+calendar_data = {
+    'events': [
+        {'id': 1, 'created': '2024-02-20T06:38:01.250000+03:00', 'day': '2024-02-20'},
+        {'id': 2, 'created': '2024-02-20T06:38:02.250000+03:00', 'day': '2024-02-21'},
+    ],
+    'by_name': {
+        'third': {'id': 3, 'created': '2024-02-20T06:38:03+00:00', 'day': '2024-02-22'},
+    },
+    'holidays': ['2024-01-01', '2024-05-09'],
+    'deadlines': {'report': '2024-02-20T06:38:00+03:00', 'review': None},
+}
+
+unknown_data = {**calendar_data, 'events': [{'id': 1, 'unknown': 1}]}
+
+
+def test_trusted_construction():
+    calendar = Calendar(calendar_data)
+    trusted = Calendar(calendar_data, trusted=True)
+
+    assert trusted.as_dict() == calendar.as_dict()
+
+    event = trusted.events[1]
+    assert isinstance(event, Event)
+    assert type(event.created) is Datetime
+    assert type(event.day) is Date
+    assert event.created == calendar.events[1].created
+
+    assert event.get_parent() is trusted
+    assert trusted.by_name['third'].get_root() is trusted
+
+
+def test_trusted_containers_of_types(monkeypatch):
+    calendar = Calendar(calendar_data)
+
+    def fail(value):
+        raise AssertionError(f'{value} is parsed in full')
+
+    # Значения списков и словарей из reverse() разбираются через from_trusted
+    monkeypatch.setattr(Datetime, '_parse_date_string', staticmethod(fail))
+    monkeypatch.setattr(Date, '_parse_date_string', staticmethod(fail))
+
+    trusted = Calendar(calendar.as_dict(), trusted=True)
+
+    assert trusted.as_dict() == calendar.as_dict()
+    assert type(trusted.holidays[0]) is Date
+    assert type(trusted.deadlines['report']) is Datetime
+    assert trusted.deadlines['review'] is None
+
+
+def test_trusted_skips_validation():
+    with pytest.raises(UnsupportedType):
+        Calendar(unknown_data)
+
+    calendar = Calendar(unknown_data, trusted=True)
+    assert calendar.events[0].unknown_params == {'unknown': 1}
+
+
+def test_trusted_class_option():
+    assert TrustedCalendar(unknown_data).events[0].id == 1
+
+    # Выборочная проверка всех объектов
+    with pytest.raises(UnsupportedType):
+        SampledCalendar(unknown_data)
+
+
+def test_trusted_context():
+    with trusted_input():
+        calendar = Calendar(unknown_data)
+
+        with pytest.raises(UnsupportedType):
+            with trusted_input(sample=1.0):
+                Calendar(unknown_data)
+
+    assert calendar.events[0].unknown_params == {'unknown': 1}
+
+    with pytest.raises(UnsupportedType):
+        Calendar(unknown_data)
@@ -1,6 +1,12 @@
+import sys
+
 from datetime import datetime, timezone
 
-from property_mapper.types import Timestamp
+import pytest
+
+from property_mapper import MapperInterface, PropertyMapper
+from property_mapper.exceptions import UnsupportedType
+from property_mapper.types import Datetime, DatetimeArray, FloatArray, Int, IntArray, Timestamp, TimestampArray
 
 
 def test_timestamp():
@@ -10,3 +16,106 @@ def test_timestamp():
     ts = Timestamp.from_data(current_timestamp)
 
     assert ts == current_time
+
+
+class SeriesInterface(MapperInterface):
+    counts: IntArray
+    values: FloatArray
+    boxed: list[Int]
+
+
+class Series(PropertyMapper, SeriesInterface):
+    pass
+
+
+def test_number_arrays():
+    data = {
+        'counts': [1, 2, '3'],
+        'values': [0.5, 1.5],
+        'boxed': list(range(1000)),
+    }
+    series = Series(data)
+
+    assert isinstance(series.counts, IntArray)
+    assert series.counts == IntArray([1, 2, 3])
+    assert series.as_dict() == {**data, 'counts': [1, 2, 3]}
+
+    series.mark_original()
+    series.merge_data({'counts': [1, 2, 3]})
+    assert not series.is_changed
+
+    series.merge_data({'values': [0.5, 2.5]})
+    assert series.changed_fields() == {'values'}
+    assert series.values.reverse() == [0.5, 2.5]
+
+    # Массив значительно компактнее списка объектов
+    compact = IntArray(range(1000))
+    boxed_size = sys.getsizeof(series.boxed) + sum(sys.getsizeof(item) for item in series.boxed)
+    assert sys.getsizeof(compact) * 4 < boxed_size
+
+
+@pytest.mark.parametrize(
+    'prop_name,value',
+    [
+        ('counts', [1.5, 2.9]),
+        ('counts', [1, 'x']),
+        ('values', [0.5, None]),
+        ('values', [1, 2]),
+        ('counts', [2 ** 70]),
+        ('counts', ['1180591620717411303424']),
+    ],
+)
+def test_number_arrays_wrong_items(prop_name, value):
+    # Как и list[Int] / list[Float], значения не отбрасываются и не усекаются
+    with pytest.raises(UnsupportedType):
+        Series({prop_name: value})
+
+
+class HistoryInterface(MapperInterface):
+    times: TimestampArray
+    dates: DatetimeArray
+
+
+class History(PropertyMapper, HistoryInterface):
+    pass
+
+
+def test_datetime_arrays():
+    times = [1700000000.25, 1700000001, 1.000001]
+    dates = [
+        '2024-02-20T06:38:22+00:00',
+        '2024-02-20T06:38:22.5+03:00',
+        '2024-02-20 06:38:22',
+        'Feb 20 2024 10:00',
+    ]
+
+    history = History({'times': times, 'dates': dates})
+
+    # Элементы создаются при обращении и совпадают с обычным преобразованием
+    assert list(history.times) == [Timestamp.from_data(value) for value in times]
+    assert list(history.dates) == [Datetime.from_data(value) for value in dates]
+    assert type(history.times[0]) is Timestamp
+    assert type(history.dates[1]) is Datetime
+    assert history.dates[1:3] == [Datetime.from_data(value) for value in dates[1:3]]
+
+    assert history.as_dict() == {
+        'times': [Timestamp.from_data(value).reverse() for value in times],
+        'dates': [Datetime.from_data(value).reverse() for value in dates],
+    }
+
+    history.mark_original()
+    history.merge_data({'times': times, 'dates': dates})
+    assert not history.is_changed
+
+    history.merge_data({'times': times[:2]})
+    assert history.changed_fields() == {'times'}
+
+
+def test_timestamp_array_rounding():
+    # Половина микросекунды округляется так же, как в datetime.fromtimestamp
+    times = [1694867473.8744655, -1.0000005, 0.0000005]
+
+    array = TimestampArray.from_data(times)
+
+    assert list(array) == [Timestamp.from_data(value) for value in times]
+    assert array.reverse() == [Timestamp.from_data(value).reverse() for value in times]